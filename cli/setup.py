@@ -47,7 +47,7 @@ setup(
     },
     entry_points={
         "console_scripts": [
-            "version-finder-cli=version_finder_cli.cli:main",
+            "version-finder-cli=version_finder_cli.launcher:main",
         ],
     },
     author="Matan Levy",
@@ -0,0 +1,223 @@
+"""
+batch.py
+====================================
+Non-interactive batch mode of the version finder CLI.
+Reads one query per line from stdin or a file and streams one JSON object per
+line to stdout as results become available. The repository is prepared once for
+all inputs. Commit lookups are resolved in chunks with a single git call per
+chunk and answered from the materialized changelog; the remaining queries run on
+a bounded thread pool.
+"""
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import argparse
+import json
+import sys
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+from version_finder.common import report_data_age
+from version_finder.daemon import to_jsonable
+from version_finder.logger import get_logger, log_to_stderr
+from version_finder.version_finder import GitConfig, SubmoduleUpdateOptions, VersionFinder, VersionPattern
+
+logger = get_logger()
+
+BATCH_TASK_VERSION = "version"
+BATCH_TASK_BETWEEN = "between"
+BATCH_TASK_TEXT = "text"
+
+# Values of --task selecting each batch task (task index, task name or batch task name)
+BATCH_TASK_ALIASES = {
+    None: BATCH_TASK_VERSION,
+    "0": BATCH_TASK_VERSION,
+    "Find first version containing commit": BATCH_TASK_VERSION,
+    BATCH_TASK_VERSION: BATCH_TASK_VERSION,
+    "1": BATCH_TASK_BETWEEN,
+    "Find all commits between two versions": BATCH_TASK_BETWEEN,
+    BATCH_TASK_BETWEEN: BATCH_TASK_BETWEEN,
+    "2": BATCH_TASK_TEXT,
+    "Find commit by text": BATCH_TASK_TEXT,
+    BATCH_TASK_TEXT: BATCH_TASK_TEXT,
+}
+
+# Commits resolved by a single git call
+BATCH_CHUNK_SIZE = 1000
+
+
+def iter_inputs(source: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """
+    Get the queries of a batch input.
+
+    Args:
+        source: Lines of the input
+
+    Yields:
+        Tuple[int, str]: (line number, query), skipping empty lines and # comments
+    """
+    for line_number, line in enumerate(source, start=1):
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line_number, line
+
+
+class BatchRunner:
+    """Answer batch queries on a prepared VersionFinder and stream JSON lines."""
+
+    def __init__(self, finder: VersionFinder, task: str, jobs: int = 4, submodule: Optional[str] = None,
+                 output: Optional[IO[str]] = None):
+        """
+        Initialize the runner.
+
+        Args:
+            finder: VersionFinder updated to the branch to query
+            task: One of BATCH_TASK_VERSION, BATCH_TASK_BETWEEN and BATCH_TASK_TEXT
+            jobs: Number of queries run in parallel
+            submodule: Optional submodule the queries refer to
+            output: Stream the results are written to. Defaults to stdout.
+        """
+        if jobs < 1:
+            raise ValueError("jobs must be positive")
+        self.finder = finder
+        self.task = task
+        self.jobs = jobs
+        self.submodule = submodule
+        self.output = output or sys.stdout
+        self.errors = 0
+        self._pending: Dict[Future, Dict[str, Any]] = {}
+
+    def __emit(self, record: Dict[str, Any]) -> None:
+        if "error" in record:
+            self.errors += 1
+        self.output.write(json.dumps(record) + "\n")
+        self.output.flush()
+
+    def __submit(self, executor: ThreadPoolExecutor, record: Dict[str, Any], function: Callable, *args) -> None:
+        """Run a query on the pool, emitting finished queries while too many are in flight."""
+        self._pending[executor.submit(function, *args)] = record
+        while len(self._pending) >= self.jobs * 4:
+            self.__drain(FIRST_COMPLETED)
+
+    def __drain(self, return_when: str) -> None:
+        done, _ = wait(list(self._pending), return_when=return_when)
+        for future in done:
+            record = self._pending.pop(future)
+            try:
+                record.update(future.result())
+            except Exception as e:
+                record["error"] = f"{type(e).__name__}: {e}"
+            self.__emit(record)
+
+    def __find_version(self, commit: str) -> Dict[str, Any]:
+        return {"version": self.finder.find_version(commit, self.submodule)}
+
+    def __find_between(self, start_version: str, end_version: str) -> Dict[str, Any]:
+        commits = self.finder.find_commits_between_versions(start_version, end_version, self.submodule)
+        return {"commits": to_jsonable(commits)}
+
+    def __find_text(self, text: str) -> Dict[str, Any]:
+        return {"commits": to_jsonable(self.finder.find_commits_by_text(text, self.submodule or ''))}
+
+    def __run_versions(self, executor: ThreadPoolExecutor, chunk: List[Tuple[int, str]]) -> None:
+        """Resolve a chunk of commits with one git call and answer them from the changelog."""
+        resolved = self.finder.resolve_many([query for _, query in chunk], submodule=self.submodule or '')
+        changelog = None if self.submodule else self.finder.materialize_changelog()
+        for line_number, query in chunk:
+            record: Dict[str, Any] = {"line": line_number, "input": query}
+            sha = resolved.get(query)
+            if sha is None:
+                record["error"] = f"InvalidCommitError: Commit {query} does not exist"
+                self.__emit(record)
+                continue
+            record["commit"] = sha
+            try:
+                record["version"] = changelog.version_of(sha)
+                self.__emit(record)
+            except (AttributeError, KeyError):
+                # Submodule commits and commits outside the branch history take the full query
+                self.__submit(executor, record, self.__find_version, sha)
+
+    def run(self, source: Iterable[str]) -> int:
+        """
+        Answer every query of a batch input.
+
+        Args:
+            source: Lines of the input. Commit SHAs for BATCH_TASK_VERSION, "<start> <end>"
+                version pairs for BATCH_TASK_BETWEEN and search terms for BATCH_TASK_TEXT.
+
+        Returns:
+            int: Number of queries that failed
+        """
+        if self.task == BATCH_TASK_BETWEEN:
+            # Built once before the parallel queries look versions up in it
+            self.finder.get_version_table()
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            chunk: List[Tuple[int, str]] = []
+            for line_number, query in iter_inputs(source):
+                if self.task == BATCH_TASK_VERSION:
+                    chunk.append((line_number, query))
+                    if len(chunk) >= BATCH_CHUNK_SIZE:
+                        self.__run_versions(executor, chunk)
+                        chunk = []
+                elif self.task == BATCH_TASK_BETWEEN:
+                    versions = query.split()
+                    record = {"line": line_number, "input": query}
+                    if len(versions) != 2:
+                        record["error"] = "ValueError: Expected '<start_version> <end_version>'"
+                        self.__emit(record)
+                        continue
+                    self.__submit(executor, record, self.__find_between, *versions)
+                else:
+                    self.__submit(executor, {"line": line_number, "input": query}, self.__find_text, query)
+            if chunk:
+                self.__run_versions(executor, chunk)
+            if self._pending:
+                self.__drain(ALL_COMPLETED)
+        return self.errors
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    """
+    Run the batch mode selected by --batch.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        int: 0 if every query succeeded, 1 otherwise
+    """
+    # Keep stdout for the JSON lines
+    log_to_stderr()
+    task = BATCH_TASK_ALIASES.get(args.task)
+    if task is None:
+        logger.error(f"Task {args.task} is not supported in batch mode")
+        return 1
+
+    try:
+        config = GitConfig(background_fetch=args.background_fetch)
+        if args.fetch_ttl:
+            config.fetch_ttl = int(args.fetch_ttl * 60)
+        finder = VersionFinder(path=args.path or None, config=config, force=True, use_worktree=args.worktree,
+                               version_pattern=VersionPattern(args.version_prefix) if args.version_prefix else None,
+                               first_parent=args.first_parent)
+        branch = args.branch or finder.get_current_branch()
+        if not branch:
+            logger.error("Please provide a branch with --branch")
+            return 1
+        finder.update_repository(branch, submodule_options=SubmoduleUpdateOptions.from_args(args))
+        report_data_age(finder)
+    except Exception as e:
+        logger.error(f"Failed to prepare the repository: {e}")
+        return 1
+
+    runner = BatchRunner(finder, task, jobs=args.jobs, submodule=args.submodule)
+    try:
+        if args.batch == "-":
+            errors = runner.run(sys.stdin)
+        else:
+            with open(args.batch, "r", encoding="utf-8") as source:
+                errors = runner.run(source)
+    except OSError as e:
+        logger.error(f"Failed to read batch input: {e}")
+        return 1
+    finally:
+        if args.restore_state and not args.worktree:
+            finder.restore_repository_state()
+    return 1 if errors else 0
@@ -3,15 +3,10 @@ import argparse
 import sys
 import os
 import re
-from typing import List, Any
-from prompt_toolkit import prompt
-from prompt_toolkit.styles import Style
-from prompt_toolkit.completion import WordCompleter, PathCompleter
-from prompt_toolkit.validation import Validator, ValidationError
-from version_finder.logger import get_logger
-from version_finder.version_finder import VersionFinder, GitError
-from version_finder.version_finder import VersionFinderTask, VersionFinderTaskRegistry
-from version_finder.common import parse_arguments
+from typing import Callable, Dict, Iterable, List, Any, Optional
+from version_finder.logger import get_logger, log_to_stderr
+from version_finder.common import DEFAULT_COMMIT_FIELDS, parse_arguments, report_data_age
+from version_finder.daemon import DaemonClient, DaemonError, DaemonUnavailableError
 import threading
 import time
 
@@ -19,34 +14,6 @@ import time
 logger = get_logger()
 
 
-class TaskNumberValidator(Validator):
-    def __init__(self, min_index: int, max_index: int):
-        self.min_index = min_index
-        self.max_index = max_index
-
-    def validate(self, document):
-        text = document.text.strip()
-        if not text:
-            raise ValidationError(message="Task number cannot be empty")
-        try:
-            task_idx = int(text)
-            if not (self.min_index <= task_idx <= self.max_index):
-                raise ValidationError(
-                    message=f"Please select a task number between {self.min_index} and {self.max_index}")
-        except ValueError:
-            raise ValidationError(message="Please enter a valid number")
-
-
-class CommitSHAValidator(Validator):
-    def validate(self, document):
-        text = document.text.strip()
-        if not text:
-            raise ValidationError(message="Commit SHA cannot be empty")
-        # Allow full SHA (40 chars), short SHA (min 7 chars), or HEAD~n format
-        if not (len(text) >= 7 and len(text) <= 40) and not text.startswith("HEAD~"):
-            raise ValidationError(message="Invalid commit SHA format. Use 7-40 hex chars or HEAD~n format")
-
-
 class ProgressIndicator:
     """A simple progress indicator for CLI operations"""
 
@@ -106,21 +73,33 @@ class VersionFinderCLI:
         """
         Initialize the VersionFinderCLI with a logger.
         """
+        from version_finder.version_finder import VersionFinderTaskRegistry
         self.registry = VersionFinderTaskRegistry()
-        self.prompt_style = Style.from_dict({
-            # User input (default text).
-            # '':          '#ff0066',
-
-            # Prompt.
-            'current_status': '#00aa00',
-        })
-
-    def get_task_functions(self) -> List[VersionFinderTask]:
+        self._prompt_style = None
+        # Commits found by tasks are listed for humans unless a machine-readable format is selected
+        self.output_format: Optional[str] = None
+        self.fields = DEFAULT_COMMIT_FIELDS
+
+    @property
+    def prompt_style(self):
+        """Style of the interactive prompts, created on first use."""
+        if self._prompt_style is None:
+            from version_finder_cli.prompts import Style
+            self._prompt_style = Style.from_dict({
+                # User input (default text).
+                # '':          '#ff0066',
+
+                # Prompt.
+                'current_status': '#00aa00',
+            })
+        return self._prompt_style
+
+    def get_task_functions(self) -> Dict[int, Callable]:
         """
         Get the list of available task functions.
 
         Returns:
-            List[VersionFinderTask]: List of available task functions.
+            Dict[int, Callable]: Task functions by task index.
         """
         tasks_actions = {}
         for task in self.registry._tasks_by_index.values():
@@ -145,11 +124,24 @@ class VersionFinderCLI:
         Returns:
             int: 0 on success, 1 on error
         """
+        from version_finder.version_finder import GitConfig, SubmoduleUpdateOptions, VersionFinder, VersionPattern
+
         try:
+            self.output_format = args.output_format
+            if self.output_format:
+                # Keep stdout for the records
+                log_to_stderr()
+            self.fields = args.fields
             self.path = self.handle_path_input(args.path)
 
+            config = GitConfig(background_fetch=args.background_fetch)
+            if args.fetch_ttl:
+                config.fetch_ttl = int(args.fetch_ttl * 60)
+
             # Initialize VersionFinder with force=True to allow uncommitted changes
-            self.finder = VersionFinder(path=self.path, force=True)
+            version_pattern = VersionPattern(args.version_prefix) if args.version_prefix else None
+            self.finder = VersionFinder(path=self.path, config=config, force=True, use_worktree=args.worktree,
+                                        version_pattern=version_pattern, first_parent=args.first_parent)
 
             # Check for uncommitted changes
             state = self.finder.get_saved_state()
@@ -182,7 +174,9 @@ class VersionFinderCLI:
 
             self.branch = self.handle_branch_input(args.branch)
 
-            self.finder.update_repository(self.branch)
+            self.finder.update_repository(self.branch,
+                                          submodule_options=SubmoduleUpdateOptions.from_args(args))
+            report_data_age(self.finder)
 
             self.task_name = self.handle_task_input(args.task)
 
@@ -262,6 +256,7 @@ class VersionFinderCLI:
             min_index = self.registry.get_tasks_by_index()[0].index
             max_index = self.registry.get_tasks_by_index()[-1].index
 
+            from version_finder_cli.prompts import TaskNumberValidator, prompt
             task_validator = TaskNumberValidator(min_index, max_index)
             task_idx = int(prompt(
                 "Enter task number: ",
@@ -290,6 +285,7 @@ class VersionFinderCLI:
         if branch_name is not None:
             return branch_name
 
+        from version_finder_cli.prompts import WordCompleter, prompt
         branches = self.finder.list_branches()
         # When creating the branch_completer, modify it to:
         branch_completer = WordCompleter(
@@ -323,6 +319,7 @@ class VersionFinderCLI:
         Handle branch input from user.
         """
         if submodule_name is None:
+            from version_finder_cli.prompts import WordCompleter, prompt
             submodule_list = self.finder.list_submodules()
             submodule_completer = WordCompleter(submodule_list, ignore_case=True, match_middle=True)
             # Take input from user
@@ -344,6 +341,7 @@ class VersionFinderCLI:
             str: Path entered by user
         """
         if path is None:
+            from version_finder_cli.prompts import PathCompleter, prompt
             prompt_msg = [
                 ('', 'Current directory: '),
                 ('class:current_status', f'{os.getcwd()}'),
@@ -378,6 +376,7 @@ class VersionFinderCLI:
         Returns:
             Selected branch name
         """
+        from version_finder_cli.prompts import WordCompleter, prompt
         branches = self.finder.list_branches()
         branch_completer = WordCompleter(branches, ignore_case=True, match_middle=True)
 
@@ -437,7 +436,6 @@ class VersionFinderCLI:
         except Exception as e:
             print(f"\nError: {str(e)}")
 
-    @with_progress("Finding commits between versions")
     def find_all_commits_between_versions(self, from_version: str, to_version: str, submodule: str = None):
         """
         Find all commits between two versions.
@@ -448,17 +446,17 @@ class VersionFinderCLI:
             submodule: Optional submodule path
         """
         try:
-            commits = self.finder.find_commits_between_versions(from_version, to_version, submodule)
-            if commits:
-                print(f"\nFound {len(commits)} commits between {from_version} and {to_version}:")
-                for commit in commits:
-                    print(f"{commit.sha[:8]} - {commit.subject}")
-            else:
-                print(f"\nNo commits found between {from_version} and {to_version}")
+            commits = self.finder.iter_commits_between_versions(from_version, to_version, submodule,
+                                                                fields=self.__listed_fields())
+            count = self.write_commits(commits, "Finding commits between versions")
+            if not self.output_format:
+                if count:
+                    print(f"\nFound {count} commits between {from_version} and {to_version}")
+                else:
+                    print(f"\nNo commits found between {from_version} and {to_version}")
         except Exception as e:
-            print(f"\nError: {str(e)}")
+            self.print_error(e)
 
-    @with_progress("Searching for commits")
     def find_commits_by_text(self, text: str, submodule: str = None):
         """
         Find commits containing specific text.
@@ -468,15 +466,129 @@ class VersionFinderCLI:
             submodule: Optional submodule path
         """
         try:
-            commits = self.finder.find_commits_by_text(text, submodule)
-            if commits:
-                print(f"\nFound {len(commits)} commits containing '{text}':")
-                for commit in commits:
-                    print(f"{commit.sha[:8]} - {commit.subject}")
-            else:
-                print(f"\nNo commits found containing '{text}'")
+            commits = self.finder.iter_commits_by_text(text, submodule or '', fields=self.__listed_fields())
+            count = self.write_commits(commits, "Searching for commits")
+            if not self.output_format:
+                if count:
+                    print(f"\nFound {count} commits containing '{text}'")
+                else:
+                    print(f"\nNo commits found containing '{text}'")
         except Exception as e:
-            print(f"\nError: {str(e)}")
+            self.print_error(e)
+
+    def __listed_fields(self):
+        """Get the commit fields read from git, only the listed ones when no format is selected."""
+        return self.fields if self.output_format else ("sha", "subject")
+
+    def write_commits(self, commits: Iterable[Dict[str, Any]], message: str) -> int:
+        """
+        Write commits as they are found, in the selected format or one line per commit.
+
+        Args:
+            commits: Commit rows, e.g. from VersionFinder.iter_commits_between_versions()
+            message: Progress message shown until the first commit is found
+
+        Returns:
+            int: Number of commits written
+        """
+        if self.output_format:
+            # The progress indicator would corrupt machine-readable output
+            from version_finder.writers import write_records
+            return write_records(commits, self.output_format, self.fields)
+
+        progress = ProgressIndicator(message)
+        progress.start()
+        count = 0
+        try:
+            for commit in commits:
+                if count == 0:
+                    progress.stop()
+                print(f"{commit['sha'][:8]} - {commit['subject']}", flush=True)
+                count += 1
+        finally:
+            if count == 0:
+                progress.stop()
+        return count
+
+    def print_error(self, error: Exception) -> None:
+        """Report a task error, on stderr when stdout carries machine-readable output."""
+        if self.output_format:
+            print(f"Error: {str(error)}", file=sys.stderr)
+        else:
+            print(f"\nError: {str(error)}")
+
+
+def run_with_daemon(args: argparse.Namespace) -> Optional[int]:
+    """
+    Answer a fully specified find-version query through a running daemon.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        Optional[int]: Exit code, or None if the query has to run locally
+    """
+    if args.no_daemon or not (args.branch and args.commit):
+        return None
+    if args.task not in (None, "0", "Find first version containing commit"):
+        return None
+    client = DaemonClient(args.socket)
+    if not client.is_running():
+        return None
+
+    try:
+        version = client.call("find_version", path=os.path.abspath(args.path or os.getcwd()), branch=args.branch,
+                              commit=args.commit, submodule=args.submodule, first_parent=args.first_parent,
+                              version_prefixes=args.version_prefix)
+    except DaemonUnavailableError as e:
+        logger.warning(f"Daemon unavailable, running the query locally: {e}")
+        return None
+    except DaemonError as e:
+        print(f"\nError: {str(e)}")
+        return 1
+
+    if version:
+        print(f"\nVersion for commit {args.commit}: {version}")
+    else:
+        print(f"\nNo version found for commit {args.commit}")
+    return 0
+
+
+def run_watch(args: argparse.Namespace) -> int:
+    """
+    Print the commits landing on a branch, and the versions they land in, until interrupted.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        int: 0 when interrupted, 1 on error
+    """
+    from version_finder.version_finder import GitConfig, SubmoduleUpdateOptions, VersionFinder, VersionPattern
+
+    try:
+        config = GitConfig(background_fetch=args.background_fetch)
+        if args.fetch_ttl:
+            config.fetch_ttl = int(args.fetch_ttl * 60)
+        # Watching moves the query tree with the branch, which must not move the user's checkout
+        finder = VersionFinder(path=args.path or None, config=config, force=True, use_worktree=True,
+                               version_pattern=VersionPattern(args.version_prefix) if args.version_prefix else None,
+                               first_parent=args.first_parent)
+        branch = args.branch or finder.get_current_branch()
+        if not branch:
+            logger.error("Please provide a branch with --branch")
+            return 1
+        finder.update_repository(branch, submodule_options=SubmoduleUpdateOptions.from_args(args))
+        report_data_age(finder)
+        fetch_interval = args.fetch_interval * 60 if args.fetch_interval else None
+        for event in finder.watch(branch, fetch_interval=fetch_interval):
+            print(event, flush=True)
+    except KeyboardInterrupt:
+        logger.info("\nStopped watching")
+    except Exception as e:
+        logger.error(f"Watch failed: {e}")
+        return 1
+    return 0
 
 
 def cli_main(args: argparse.Namespace) -> int:
@@ -487,6 +599,24 @@ def cli_main(args: argparse.Namespace) -> int:
         print(f"version_finder cli-v{__version__}")
         return 0
 
+    if args.complete:
+        from version_finder.completion import run_completion
+        return run_completion(["--complete", *args.complete, "--path", args.path or ""])
+
+    if args.watch:
+        return run_watch(args)
+
+    if args.batch is not None:
+        from version_finder_cli.batch import run_batch
+        return run_batch(args)
+
+    # Warm queries are answered by the daemon when one is running
+    exit_code = run_with_daemon(args)
+    if exit_code is not None:
+        return exit_code
+
+    from version_finder.version_finder import GitError
+
     # Initialize CLI
     cli = VersionFinderCLI()
     # Run CLI
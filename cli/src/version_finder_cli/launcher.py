@@ -0,0 +1,27 @@
+"""
+launcher.py
+====================================
+Console entry point of the version finder CLI.
+Shell completion requests are answered before the CLI and its dependencies are
+imported, so completion scripts stay fast enough to run on every keypress.
+"""
+import sys
+
+
+def main() -> int:
+    if "--complete" in sys.argv[1:]:
+        from version_finder.completion import run_completion
+        return run_completion(sys.argv[1:])
+
+    # Machine-readable output owns stdout. The logger is created when the CLI is imported,
+    # so its console output is moved to stderr before that.
+    if any(arg in ("--format", "--batch") or arg.startswith(("--format=", "--batch=")) for arg in sys.argv[1:]):
+        from version_finder.logger import log_to_stderr
+        log_to_stderr()
+
+    from version_finder_cli.cli import main as cli_main
+    return cli_main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
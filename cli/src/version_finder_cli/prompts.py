@@ -0,0 +1,49 @@
+"""
+prompts.py
+====================================
+Interactive prompt helpers of the version finder CLI.
+prompt_toolkit is only imported through this module, and this module is only
+imported once the CLI actually has to ask the user for input, so fully specified
+and scripted runs start without it.
+"""
+from prompt_toolkit import prompt
+from prompt_toolkit.styles import Style
+from prompt_toolkit.completion import WordCompleter, PathCompleter
+from prompt_toolkit.validation import Validator, ValidationError
+
+__all__ = [
+    "CommitSHAValidator",
+    "PathCompleter",
+    "Style",
+    "TaskNumberValidator",
+    "WordCompleter",
+    "prompt",
+]
+
+
+class TaskNumberValidator(Validator):
+    def __init__(self, min_index: int, max_index: int):
+        self.min_index = min_index
+        self.max_index = max_index
+
+    def validate(self, document):
+        text = document.text.strip()
+        if not text:
+            raise ValidationError(message="Task number cannot be empty")
+        try:
+            task_idx = int(text)
+            if not (self.min_index <= task_idx <= self.max_index):
+                raise ValidationError(
+                    message=f"Please select a task number between {self.min_index} and {self.max_index}")
+        except ValueError:
+            raise ValidationError(message="Please enter a valid number")
+
+
+class CommitSHAValidator(Validator):
+    def validate(self, document):
+        text = document.text.strip()
+        if not text:
+            raise ValidationError(message="Commit SHA cannot be empty")
+        # Allow full SHA (40 chars), short SHA (min 7 chars), or HEAD~n format
+        if not (len(text) >= 7 and len(text) <= 40) and not text.startswith("HEAD~"):
+            raise ValidationError(message="Invalid commit SHA format. Use 7-40 hex chars or HEAD~n format")
@@ -0,0 +1,63 @@
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import pytest
+from version_finder.version_finder import VersionFinder
+from version_finder_cli.batch import BATCH_TASK_BETWEEN, BATCH_TASK_TEXT, BatchRunner
+from version_finder_cli.cli import main
+
+
+class TestBatch:
+    @pytest.fixture
+    def test_repo(self):
+        """Creates a repository with two versions"""
+        temp_dir = tempfile.mkdtemp()
+        os.chdir(temp_dir)
+        os.system('git init')
+        os.system('git config user.email "test@example.com"')
+        os.system('git config user.name "Test User"')
+        os.system('git commit -m "Initial commit" --allow-empty')
+        os.system('git commit -m "Fix bug" --allow-empty')
+        fix = os.popen('git rev-parse HEAD').read().strip()
+        os.system('git commit -m "Version: 1.0" --allow-empty')
+        os.system('git commit -m "Add feature" --allow-empty')
+        feature = os.popen('git rev-parse HEAD').read().strip()
+        os.system('git commit -m "Version: 1.1" --allow-empty')
+        os.system('git commit -m "Unreleased change" --allow-empty')
+        unreleased = os.popen('git rev-parse HEAD').read().strip()
+        branch = os.popen("git branch --show-current").read().strip()
+        yield temp_dir, branch, fix, feature, unreleased
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def run_batch(self, test_repo, task, lines):
+        finder = VersionFinder(path=test_repo[0], use_worktree=True)
+        finder.update_repository(test_repo[1])
+        output = io.StringIO()
+        runner = BatchRunner(finder, task, jobs=2, output=output)
+        errors = runner.run(lines)
+        return errors, [json.loads(line) for line in output.getvalue().splitlines()]
+
+    def test_versions(self, test_repo, capsys, monkeypatch):
+        repo, branch, fix, feature, unreleased = test_repo
+        monkeypatch.setattr(sys, "stdin", io.StringIO(f"{fix}\n# comment\n\n{feature[:10]}\n{unreleased}\nbad\n"))
+        sys.argv = ['version_finder', '--path', repo, '--branch', branch, '--worktree', '--batch']
+        assert main() == 1
+
+        records = {record["line"]: record for record in map(json.loads, capsys.readouterr().out.splitlines())}
+        assert records[1]["version"] == "1.0"
+        assert records[4] == {"line": 4, "input": feature[:10], "commit": feature, "version": "1.1"}
+        assert records[5]["version"] is None
+        assert "error" in records[6]
+
+    def test_between_and_text(self, test_repo):
+        errors, records = self.run_batch(test_repo, BATCH_TASK_BETWEEN, ["1.0 1.1", "1.0"])
+        assert errors == 1
+        between = next(record for record in records if record["line"] == 1)
+        assert "Add feature" in [commit["subject"] for commit in between["commits"]]
+
+        errors, records = self.run_batch(test_repo, BATCH_TASK_TEXT, ["fix bug"])
+        assert errors == 0
+        assert [commit["sha"] for commit in records[0]["commits"]] == [test_repo[2]]
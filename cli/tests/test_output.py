@@ -0,0 +1,127 @@
+import csv
+import gc
+import io
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import pytest
+import version_finder.logger
+import version_finder.version_finder
+from version_finder.version_finder import GitConfig, VersionFinder
+from version_finder.common import report_data_age
+from version_finder_cli.cli import VersionFinderCLI, main
+
+
+class TestOutputFormats:
+    @pytest.fixture
+    def cli(self):
+        """Creates a CLI on a repository with two versions"""
+        temp_dir = tempfile.mkdtemp()
+        os.chdir(temp_dir)
+        os.system('git init')
+        os.system('git config user.email "test@example.com"')
+        os.system('git config user.name "Test User"')
+        os.system('git commit -m "Initial commit" --allow-empty')
+        os.system('git commit -m "Version: 1.0" --allow-empty')
+        os.system('git commit -m "Add feature" --allow-empty')
+        os.system('git commit -m "Version: 1.1" --allow-empty')
+        branch = os.popen("git branch --show-current").read().strip()
+        cli = VersionFinderCLI()
+        cli.finder = VersionFinder(path=temp_dir)
+        cli.finder.update_repository(branch)
+        yield cli
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_text(self, cli, capsys):
+        cli.find_all_commits_between_versions("1.0", "1.1")
+        # The progress indicator is erased with carriage returns before the first commit is printed
+        lines = [line.split("\r")[-1] for line in capsys.readouterr().out.strip().split("\n")]
+        assert [line.split(" - ")[1] for line in lines[:3]] == ["Version: 1.1", "Add feature", "Version: 1.0"]
+        assert lines[-1] == "Found 3 commits between 1.0 and 1.1"
+
+    def test_jsonl(self, cli, capsys):
+        cli.output_format = "jsonl"
+        cli.fields = ("subject", "version")
+        cli.find_all_commits_between_versions("1.0", "1.1")
+        assert [json.loads(line) for line in capsys.readouterr().out.splitlines()] == [
+            {"subject": "Version: 1.1", "version": "1.1"},
+            {"subject": "Add feature", "version": None},
+            {"subject": "Version: 1.0", "version": "1.0"},
+        ]
+
+    def test_csv(self, cli, capsys):
+        cli.output_format = "csv"
+        cli.fields = ("sha", "subject")
+        cli.find_commits_by_text("feature")
+        rows = list(csv.DictReader(io.StringIO(capsys.readouterr().out)))
+        assert [row["subject"] for row in rows] == ["Add feature"]
+        assert len(rows[0]["sha"]) == 40
+
+    def test_error_goes_to_stderr(self, cli, capsys):
+        cli.output_format = "json"
+        cli.find_all_commits_between_versions("1.0", "9.9")
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "9.9" in captured.err
+
+    def test_stale_data_is_reported(self, cli, capsys, tmp_path):
+        clone = str(tmp_path / "clone")
+        os.system(f'git clone -q {cli.finder.repository_path} {clone}')
+        branch = cli.finder.get_current_branch()
+        VersionFinder(path=clone).update_repository(branch)
+        capsys.readouterr()
+
+        # Fetched just now: nothing to point out
+        finder = VersionFinder(path=clone, config=GitConfig(fetch_ttl=24 * 60 * 60))
+        finder.update_repository(branch)
+        report_data_age(finder)
+        assert capsys.readouterr().err == ""
+
+        hour_ago = time.time() - 60 * 60
+        os.utime(os.path.join(clone, ".git", "FETCH_HEAD"), (hour_ago, hour_ago))
+        finder = VersionFinder(path=clone, config=GitConfig(fetch_ttl=24 * 60 * 60))
+        finder.update_repository(branch)
+        report_data_age(finder)
+        captured = capsys.readouterr()
+        assert "fetched 60.0 minutes ago" in captured.err
+        assert "minutes ago" not in captured.out
+
+    @pytest.mark.parametrize("output_format", ["jsonl", "csv"])
+    def test_stdout_holds_only_records(self, cli, capsys, monkeypatch, output_format):
+        # A console handler on stdout, as the logger creates it. Other tests reset the logging registry,
+        # so the logger the modules hold is registered again.
+        finder_logger = version_finder.version_finder.logger
+        monkeypatch.setitem(logging.Logger.manager.loggerDict, "version_finder", finder_logger)
+        monkeypatch.setattr(finder_logger, "handlers", [logging.StreamHandler(sys.stdout)])
+        monkeypatch.setattr(version_finder.logger, "_console_stream", sys.stdout)
+        monkeypatch.setattr(VersionFinderCLI, "run_task",
+                            lambda self, task_name: self.find_all_commits_between_versions("1.0", "1.1"))
+        branch = cli.finder.get_current_branch()
+        monkeypatch.setattr(sys, "argv", ["version-finder-cli", "-p", str(cli.finder.repository_path), "-b", branch,
+                                          "-t", "1", "--no-daemon", "--format", output_format,
+                                          "--fields", "subject"])
+        capsys.readouterr()
+        assert main() == 0
+        # The finder of the run logs when it is destroyed, which must happen while the handler is patched
+        gc.collect()
+        captured = capsys.readouterr()
+        if output_format == "jsonl":
+            rows = [json.loads(line) for line in captured.out.splitlines()]
+        else:
+            rows = list(csv.DictReader(io.StringIO(captured.out)))
+        assert [row["subject"] for row in rows] == ["Version: 1.1", "Add feature", "Version: 1.0"]
+        assert "Updating repository to branch" in captured.err
+
+    def test_launcher_keeps_stdout_clean(self, tmp_path):
+        # The first log messages are written while the CLI is imported
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path), VERSION_FINDER_LOG_DIR=str(tmp_path))
+        result = subprocess.run([sys.executable, "-m", "version_finder_cli.launcher", "--format", "jsonl",
+                                 "-p", str(tmp_path / "missing")],
+                                capture_output=True, text=True, env=env, timeout=60)
+        assert result.stdout == ""
+        assert "Logging to file" in result.stderr
@@ -0,0 +1,27 @@
+# Generous bound of the cumulative import time, catching heavy modules creeping into startup
+IMPORT_TIME_BUDGET = 1.0  # seconds
+
+
+class TestStartup:
+    def test_import_skips_prompt_toolkit(self, import_profile):
+        modules = import_profile("import version_finder_cli.cli")
+        for heavy in ("prompt_toolkit", "version_finder.version_finder", "version_finder_cli.batch"):
+            assert heavy not in modules
+        assert modules["version_finder_cli.cli"] < IMPORT_TIME_BUDGET
+
+    def test_version_flag_skips_prompt_toolkit(self, import_profile):
+        modules = import_profile(
+            "import sys; from version_finder_cli.cli import main; sys.argv = ['version-finder', '--version']; main()")
+        assert "prompt_toolkit" not in modules
+        assert "version_finder.version_finder" not in modules
+
+    def test_prompts_load_prompt_toolkit(self, import_profile):
+        modules = import_profile("import version_finder_cli.prompts")
+        assert "prompt_toolkit" in modules
+
+    def test_completion_skips_cli(self, import_profile):
+        modules = import_profile(
+            "import sys; sys.argv = ['version-finder-cli', '--complete', 'branch', 'ma']; "
+            "from version_finder_cli.launcher import main; sys.exit(main())")
+        for heavy in ("version_finder_cli.cli", "version_finder.logger", "argparse", "subprocess"):
+            assert heavy not in modules
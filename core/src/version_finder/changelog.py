@@ -0,0 +1,262 @@
+"""
+changelog.py
+====================================
+Module for materializing per-version changelogs.
+History is walked once and every commit is assigned to the first version that
+contains it. The resulting buckets (version -> commits) are persisted, and a
+range of versions is served as the union of its buckets.
+"""
+from pathlib import Path
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+from version_finder.logger import get_logger
+
+logger = get_logger()
+
+# Bump when the persisted layout changes, older files are then ignored
+CHANGELOG_FORMAT_VERSION = 1
+
+
+class Changelog:
+    """Commits bucketed by the first version that contains them."""
+
+    def __init__(self,
+                 versions: List[Tuple[str, str]],
+                 buckets: Dict[str, List[str]],
+                 unreleased: List[str],
+                 head: str = "",
+                 pattern: str = ""):
+        """
+        Initialize the changelog.
+
+        Args:
+            versions: (version, commit SHA) pairs in release order, oldest first
+            buckets: Commit SHAs first released in each version, newest first
+            unreleased: Commit SHAs not contained in any version, newest first
+            head: The commit the history was walked from
+            pattern: The version grep pattern the changelog was built with
+        """
+        self.versions = versions
+        self.buckets = buckets
+        self.unreleased = unreleased
+        self.head = head
+        self.pattern = pattern
+        # Version -> position in versions. Looked up by the exact version string, like the version table.
+        self._index: Dict[str, int] = {}
+        # Commit SHA -> version, built on first lookup
+        self._versions_by_commit: Optional[Dict[str, Optional[str]]] = None
+        for index, (version, _) in enumerate(versions):
+            self._index.setdefault(version, index)
+
+    def __repr__(self):
+        return f"Changelog({len(self.versions)} versions, head={self.head[:12]})"
+
+    def __index_of(self, version: str) -> int:
+        try:
+            return self._index[version]
+        except KeyError:
+            raise KeyError(f"Version {version} is not in the changelog") from None
+
+    def commits_for(self, version: str) -> List[str]:
+        """
+        Get the commits first released in a version.
+
+        Args:
+            version: The version
+
+        Returns:
+            List[str]: Commit SHAs, newest first
+
+        Raises:
+            KeyError: If the version is not in the changelog
+        """
+        return self.buckets[self.versions[self.__index_of(version)][0]]
+
+    def commit_of(self, version: str) -> str:
+        """
+        Get the commit of a version.
+
+        Args:
+            version: The version
+
+        Returns:
+            str: Commit SHA of the version
+
+        Raises:
+            KeyError: If the version is not in the changelog
+        """
+        return self.versions[self.__index_of(version)][1]
+
+    def version_of(self, sha: str) -> Optional[str]:
+        """
+        Get the first version that contains a commit.
+
+        Args:
+            sha: Full commit SHA
+
+        Returns:
+            Optional[str]: The version, or None if the commit is unreleased
+
+        Raises:
+            KeyError: If the commit was not part of the walked history
+        """
+        if self._versions_by_commit is None:
+            versions_by_commit: Dict[str, Optional[str]] = dict.fromkeys(self.unreleased)
+            for version, commits in self.buckets.items():
+                versions_by_commit.update(dict.fromkeys(commits, version))
+            self._versions_by_commit = versions_by_commit
+        return self._versions_by_commit[sha]
+
+    def commits_between(self, start: str, end: str) -> List[str]:
+        """
+        Get the commits released after one version, up to and including another.
+
+        Args:
+            start: The version to start after
+            end: The last version to include
+
+        Returns:
+            List[str]: Commit SHAs, newest first
+
+        Raises:
+            KeyError: If a version is not in the changelog
+        """
+        start_index, end_index = self.__index_of(start), self.__index_of(end)
+        commits: List[str] = []
+        for version, _ in reversed(self.versions[start_index + 1:end_index + 1]):
+            commits.extend(self.buckets[version])
+        return commits
+
+    def extend(self, update: "Changelog") -> None:
+        """
+        Take over the versions of a changelog built for a later head.
+
+        The update only has to cover the commits this changelog left unreleased and the
+        commits added since its head, i.e. a walk of the new head excluding the version
+        commits of this changelog.
+
+        Args:
+            update: Changelog of the new commits and the previously unreleased ones
+        """
+        for version, sha in update.versions:
+            if version in self.buckets:
+                self.buckets[version] = update.buckets[version] + self.buckets[version]
+                self.versions[self.__index_of(version)] = (version, sha)
+            else:
+                self.versions.append((version, sha))
+                self.buckets[version] = update.buckets[version]
+                self._index.setdefault(version, len(self.versions) - 1)
+        self.unreleased = update.unreleased
+        self.head = update.head
+        self._versions_by_commit = None
+
+    def to_dict(self) -> dict:
+        """Get the compact, JSON serializable form of the changelog."""
+        return {
+            "format": CHANGELOG_FORMAT_VERSION,
+            "head": self.head,
+            "pattern": self.pattern,
+            "versions": [[version, sha, self.buckets[version]] for version, sha in self.versions],
+            "unreleased": self.unreleased,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Changelog":
+        """Build a changelog from its compact form."""
+        if data.get("format") != CHANGELOG_FORMAT_VERSION:
+            raise ValueError(f"Unsupported changelog format: {data.get('format')}")
+        return cls(
+            versions=[(version, sha) for version, sha, _ in data["versions"]],
+            buckets={version: commits for version, _, commits in data["versions"]},
+            unreleased=data["unreleased"],
+            head=data["head"],
+            pattern=data["pattern"],
+        )
+
+    def save(self, path: Path) -> None:
+        """
+        Persist the changelog.
+
+        Args:
+            path: File to write, replaced atomically
+        """
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            temp_path.write_text(json.dumps(self.to_dict(), separators=(",", ":")), encoding="utf-8")
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to save changelog to {path}: {e}")
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["Changelog"]:
+        """
+        Load a persisted changelog.
+
+        Args:
+            path: File to read
+
+        Returns:
+            Optional[Changelog]: The changelog, or None if the file is missing or unreadable
+        """
+        try:
+            return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug(f"Changelog not loaded from {path}: {e}")
+            return None
+
+
+def build_changelog(walk_output: bytes, version_commits: Dict[str, str], head: str = "",
+                    pattern: str = "") -> Changelog:
+    """
+    Assign every commit of a history walk to the first version that contains it.
+
+    Versions are visited in topological order. Each version takes every ancestor
+    that no earlier version already took, so each commit is visited once.
+
+    Args:
+        walk_output: Output of `git log --topo-order --reverse --format="%H %P"`
+        version_commits: Commit SHA -> version, for the version commits of the history
+        head: The commit the history was walked from
+        pattern: The version grep pattern the version commits were selected with
+
+    Returns:
+        Changelog: The materialized changelog
+    """
+    parents: Dict[str, List[str]] = {}
+    position: Dict[str, int] = {}
+    order: List[str] = []
+    for line in walk_output.decode("ascii", "replace").splitlines():
+        shas = line.split()
+        if not shas:
+            continue
+        position[shas[0]] = len(order)
+        order.append(shas[0])
+        parents[shas[0]] = shas[1:]
+
+    assigned: Dict[str, str] = {}
+    # A version committed more than once keeps its first place and its newest commit
+    version_shas: Dict[str, str] = {}
+    buckets: Dict[str, List[str]] = {}
+    for sha in order:
+        version = version_commits.get(sha)
+        if version is None or sha in assigned:
+            continue
+        bucket = buckets.setdefault(version, [])
+        version_shas[version] = sha
+        stack = [sha]
+        while stack:
+            commit = stack.pop()
+            if commit in assigned or commit not in parents:
+                continue
+            assigned[commit] = version
+            bucket.append(commit)
+            stack.extend(parents[commit])
+
+    for bucket in buckets.values():
+        bucket.sort(key=position.__getitem__, reverse=True)
+    versions = list(version_shas.items())
+    unreleased = [sha for sha in reversed(order) if sha not in assigned]
+    logger.debug(f"Materialized changelog of {len(versions)} versions over {len(order)} commits")
+    return Changelog(versions, buckets, unreleased, head=head, pattern=pattern)
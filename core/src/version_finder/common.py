@@ -5,19 +5,35 @@ Common utilities and constants for version_finder.
 """
 import argparse
 import os
+import sys
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 # Default configuration values
 DEFAULT_GIT_TIMEOUT = 30  # seconds
+DEFAULT_GIT_MAINTENANCE_TIMEOUT = 2 * 60 * 60  # seconds, writing commit-graphs and bitmaps of large repositories
 DEFAULT_GIT_MAX_RETRIES = 0
 DEFAULT_GIT_RETRY_DELAY = 1  # seconds
+DEFAULT_GIT_FETCH_TTL = 0  # seconds, 0 means always fetch
+DEFAULT_GIT_CACHE_SIZE = 64 * 1024 * 1024  # bytes, 0 disables the command cache
+DEFAULT_DAEMON_MAX_REPOS = 8  # repositories kept warm by the daemon
+DEFAULT_DAEMON_IDLE_TIMEOUT = 60 * 60  # seconds before the daemon evicts an unused repository
+DEFAULT_DAEMON_REFRESH = 5 * 60  # seconds before the daemon fetches a warm repository again
+DEFAULT_SERVER_HOST = "127.0.0.1"
+DEFAULT_SERVER_PORT = 8470
+DEFAULT_SERVER_WORKERS = 4  # queries the HTTP server runs concurrently per repository
+DEFAULT_WATCH_POLL_INTERVAL = 2  # seconds between ref checks when inotify is unavailable
+DATA_AGE_NOTICE_THRESHOLD = 60  # seconds, older remote data is pointed out to the user
 
 # Environment variable names
 ENV_GIT_TIMEOUT = "GIT_TIMEOUT"
 ENV_GIT_MAX_RETRIES = "GIT_MAX_RETRIES"
 ENV_GIT_RETRY_DELAY = "GIT_RETRY_DELAY"
+ENV_GIT_FETCH_TTL = "GIT_FETCH_TTL"
+ENV_GIT_CACHE_SIZE = "GIT_CACHE_SIZE"
+ENV_GIT_CACHE_PATH = "VERSION_FINDER_CACHE_PATH"
 ENV_DEBUG = "VERSION_FINDER_DEBUG"
+ENV_DAEMON_SOCKET = "VERSION_FINDER_SOCKET"
 
 # Git command constants
 GIT_CMD_FETCH = ["fetch", "--all"]
@@ -29,16 +45,67 @@ GIT_CMD_LOG = ["log"]
 GIT_CMD_SHOW = ["show"]
 GIT_CMD_REV_PARSE = ["rev-parse"]
 GIT_CMD_GREP = ["grep"]
+GIT_CMD_WORKTREE_ADD = ["worktree", "add", "--detach"]
+GIT_CMD_WORKTREE_PRUNE = ["worktree", "prune"]
+
+# Directory (inside the git common dir) where version_finder keeps its cached data
+VERSION_FINDER_GIT_DIR = "version_finder"
 
 # Regex patterns
 BRANCH_PATTERN = r"\s*(?:\*\s)?(.*)"
 
+# Machine-readable output
+OUTPUT_FORMATS = ("json", "jsonl", "csv", "tsv")
+COMMIT_FIELDS = ("sha", "subject", "message", "author", "timestamp", "version")
+DEFAULT_COMMIT_FIELDS = ("sha", "subject", "author", "timestamp", "version")
+
 # UI constants
 MAX_COMMITS_DISPLAY = 1000  # Maximum number of commits to display in UI
 MAX_LOG_ENTRIES = 500  # Maximum number of log entries to keep in UI
 
 # File paths
 DEFAULT_CONFIG_PATH = os.path.expanduser("~/.version_finder/config.json")
+DEFAULT_DAEMON_SOCKET_PATH = os.path.expanduser("~/.version_finder/daemon.sock")
+
+
+def report_data_age(finder) -> None:
+    """
+    Tell the user when queries run on remote data that was not fetched just now.
+
+    Written to stderr, so that it never mixes with results on stdout.
+
+    Args:
+        finder: VersionFinder updated to the queried branch
+    """
+    if finder.is_fetch_running():
+        print("Note: a background fetch is in progress, results are based on the current refs", file=sys.stderr)
+        return
+    age = finder.get_data_age()
+    if age is not None and age >= DATA_AGE_NOTICE_THRESHOLD:
+        print(f"Note: remote data was fetched {age / 60:.1f} minutes ago", file=sys.stderr)
+
+
+def parse_fields(value: str) -> Tuple[str, ...]:
+    """
+    Parse a comma separated list of commit fields.
+
+    Args:
+        value: Field names, e.g. "sha,subject"
+
+    Returns:
+        Tuple[str, ...]: The field names, in the given order and without duplicates
+
+    Raises:
+        argparse.ArgumentTypeError: If a field is unknown or no field is given
+    """
+    fields = tuple(dict.fromkeys(field.strip() for field in value.split(",") if field.strip()))
+    unknown = [field for field in fields if field not in COMMIT_FIELDS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown field(s): {', '.join(unknown)} (choose from {', '.join(COMMIT_FIELDS)})")
+    if not fields:
+        raise argparse.ArgumentTypeError("at least one field is required")
+    return fields
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -49,6 +116,10 @@ def parse_arguments() -> argparse.Namespace:
         argparse.Namespace: Parsed arguments
     """
     parser = argparse.ArgumentParser(description="Version Finder - Find and compare versions in Git repositories")
+    parser.add_argument("command", nargs="?", choices=["prepare", "daemon", "serve"],
+                        help="prepare: write commit-graph, multi-pack-index and bitmaps to speed up queries. "
+                             "daemon: serve queries from warm per-repository caches over a Unix socket. "
+                             "serve: answer queries over HTTP")
     parser.add_argument("--path", "-p", type=str, default="", help="Path to the Git repository")
     parser.add_argument("--debug", "-d", action="store_true", help="Enable debug logging")
     parser.add_argument("--config", "-c", type=str, default=DEFAULT_CONFIG_PATH, help="Path to configuration file")
@@ -67,6 +138,50 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument("--cli", action="store_true", help="Run the CLI version")
     parser.add_argument("--gui", action="store_true", help="Run the GUI version")
     parser.add_argument("--task", "-t", type=str, help="Task to run")
+    parser.add_argument("--worktree", "-w", action="store_true",
+                        help="Run queries in a cached git worktree instead of checking out branches in the repository")
+    parser.add_argument("--submodule-jobs", type=int, default=1, help="Number of submodules to update in parallel")
+    parser.add_argument("--submodule-depth", type=int, help="Shallow-fetch submodules to the given depth")
+    parser.add_argument("--submodule-filter", type=str,
+                        help="Partial-clone filter for submodules, e.g. blob:none")
+    parser.add_argument("--fetch-ttl", type=float, default=0,
+                        help="Skip fetching if the last fetch is newer than this many minutes")
+    parser.add_argument("--background-fetch", action="store_true",
+                        help="Fetch in the background and start queries on the current refs")
+    parser.add_argument("--skip-submodule-update", action="store_true",
+                        help="Do not update submodules (enough when only submodule pointers are needed)")
+    parser.add_argument("--first-parent", action="store_true",
+                        help="Follow only the first parent of merge commits (mainline history)")
+    parser.add_argument("--version-prefix", action="append",
+                        help="Prefix marking a version commit, e.g. 'Release'. Can be repeated. "
+                             "Defaults to 'Version', 'VERSION' and 'Updated version'")
+    parser.add_argument("--batch", nargs="?", const="-", metavar="FILE",
+                        help="Answer one query per line from FILE (or stdin) and print one JSON object per line. "
+                             "Lines are commit SHAs, '<start> <end>' version pairs or search terms, per --task")
+    parser.add_argument("--jobs", "-j", type=int, default=4, help="Number of queries run in parallel in batch mode")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and report the commits landing on the branch and the versions they land in. "
+                             "Queries run in a worktree, the checkout is not moved")
+    parser.add_argument("--fetch-interval", type=float,
+                        help="Fetch the watched branch every N minutes (with --watch)")
+    parser.add_argument("--complete", nargs="+", metavar="KIND",
+                        help="Print the names of KIND (branch, submodule or version) starting with the next "
+                             "argument, for shell completion scripts. Answered from an index without running git")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, dest="output_format",
+                        help="Stream the commits found by a task in a machine-readable format")
+    parser.add_argument("--fields", type=parse_fields, default=DEFAULT_COMMIT_FIELDS,
+                        help=f"Comma separated commit fields written with --format "
+                             f"(default: {','.join(DEFAULT_COMMIT_FIELDS)}, choose from {','.join(COMMIT_FIELDS)})")
+    parser.add_argument("--socket", type=str,
+                        help=f"Unix socket of the daemon. Defaults to ${ENV_DAEMON_SOCKET} "
+                             f"or {DEFAULT_DAEMON_SOCKET_PATH}")
+    parser.add_argument("--no-daemon", action="store_true", help="Run the query locally even if a daemon is running")
+    parser.add_argument("--max-repos", type=int, default=DEFAULT_DAEMON_MAX_REPOS,
+                        help="Number of repositories the daemon keeps warm")
+    parser.add_argument("--host", type=str, default=DEFAULT_SERVER_HOST, help="Address the HTTP server listens on")
+    parser.add_argument("--port", type=int, default=DEFAULT_SERVER_PORT, help="Port the HTTP server listens on")
+    parser.add_argument("--workers", type=int, default=DEFAULT_SERVER_WORKERS,
+                        help="Queries the HTTP server runs concurrently per repository")
 
     return parser.parse_args()
 
@@ -97,35 +212,3 @@ def get_repository_path(path_arg: str) -> Optional[Path]:
 
     return path
 
-
-def args_to_command(args):
-    """
-    Convert argparse.Namespace object to command-line arguments string.
-
-    Args:
-        args: argparse.Namespace object containing command-line arguments
-
-    Returns:
-        str: Command-line arguments as a string
-
-    Raises:
-        AttributeError: If args is not an argparse.Namespace object
-    """
-    if not isinstance(args, argparse.Namespace):
-        raise AttributeError("args must be an argparse.Namespace object")
-
-    command_parts = []
-
-    for key, value in vars(args).items():
-        # Replace underscores with hyphens in argument names
-        arg_name = key.replace('_', '-')
-
-        # Include boolean flags that are True
-        if isinstance(value, bool):
-            if value:
-                command_parts.append(f"--{arg_name}")
-        # Include non-None and non-False values
-        elif value is not None:
-            command_parts.append(f"--{arg_name} {value}")
-
-    return " ".join(command_parts)
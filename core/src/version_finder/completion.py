@@ -0,0 +1,147 @@
+"""
+completion.py
+====================================
+Module for shell completion of branches, submodules and versions.
+VersionFinder persists sorted name lists under <git-common-dir>/version_finder/completion/
+whenever it discovers them, and completions are answered from these lists by binary
+search. Answering never runs git and only needs the standard library, so completion
+scripts can call it on every keypress. The lists reflect the last run of version_finder
+on the repository (versions: of the last branch whose version table was built).
+"""
+from bisect import bisect_left
+import os
+from pathlib import Path
+import sys
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+# Same as common.VERSION_FINDER_GIT_DIR, which is not imported to keep argparse out of completion
+DATA_DIR = "version_finder"
+COMPLETION_DIR = "completion"
+# Completion kind -> index file name
+COMPLETION_KINDS = {
+    "branch": "branches",
+    "submodule": "submodules",
+    "version": "versions",
+}
+
+
+def find_git_dirs(worktree: Path) -> Optional[Tuple[Path, Path]]:
+    """
+    Locate the git directory and the common git directory of a worktree without running git.
+
+    Args:
+        worktree: Top-level directory of a worktree
+
+    Returns:
+        Optional[Tuple[Path, Path]]: (git directory, common git directory), or None if worktree is not the
+        top level of a worktree
+    """
+    dot_git = worktree / ".git"
+    try:
+        if dot_git.is_dir():
+            git_dir = dot_git
+        elif dot_git.is_file():
+            # Linked worktrees and submodules point to their git directory
+            content = dot_git.read_text(encoding="utf-8").strip()
+            if not content.startswith("gitdir:"):
+                return None
+            git_dir = (worktree / content[len("gitdir:"):].strip()).resolve()
+        else:
+            return None
+        common_dir = git_dir
+        commondir_file = git_dir / "commondir"
+        if commondir_file.is_file():
+            common_dir = (git_dir / commondir_file.read_text(encoding="utf-8").strip()).resolve()
+    except OSError:
+        return None
+    return git_dir, common_dir
+
+
+def write_index(data_dir: Path, kind: str, names: Iterable[str]) -> None:
+    """
+    Persist the names completed for a kind.
+
+    Args:
+        data_dir: version_finder's data directory of the repository
+        kind: One of COMPLETION_KINDS
+        names: Names to complete
+    """
+    path = Path(data_dir) / COMPLETION_DIR / COMPLETION_KINDS[kind]
+    content = "\n".join(sorted(set(name for name in names if name and "\n" not in name)))
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(content, encoding="utf-8")
+        os.replace(temp_path, path)
+    except OSError:
+        # Completion is best effort, queries never depend on it
+        pass
+
+
+def has_index(data_dir: Path, kind: str) -> bool:
+    """Check if the names of a kind were persisted."""
+    return (Path(data_dir) / COMPLETION_DIR / COMPLETION_KINDS[kind]).exists()
+
+
+def complete(path: str, kind: str, prefix: str) -> List[str]:
+    """
+    Get the names of a kind starting with a prefix.
+
+    Args:
+        path: The repository or any directory inside its top-level worktree
+        kind: One of COMPLETION_KINDS
+        prefix: Prefix typed so far
+
+    Returns:
+        List[str]: Matching names in sorted order, empty if the repository has no index yet
+    """
+    if kind not in COMPLETION_KINDS:
+        return []
+    directory = Path(os.path.abspath(path or os.getcwd()))
+    for candidate in (directory, *directory.parents):
+        git_dirs = find_git_dirs(candidate)
+        if git_dirs is not None:
+            break
+    else:
+        return []
+    index_path = git_dirs[1] / DATA_DIR / COMPLETION_DIR / COMPLETION_KINDS[kind]
+    try:
+        content = index_path.read_text(encoding="utf-8")
+    except OSError:
+        return []
+    if not content:
+        return []
+    names = content.split("\n")
+    matches = []
+    position = bisect_left(names, prefix)
+    while position < len(names) and names[position].startswith(prefix):
+        matches.append(names[position])
+        position += 1
+    return matches
+
+
+def run_completion(argv: Sequence[str]) -> int:
+    """
+    Print the completions requested by `--complete <kind> <prefix> [--path <path>]`, one per line.
+
+    Args:
+        argv: Command-line arguments
+
+    Returns:
+        int: 0 on success, 2 on invalid arguments
+    """
+    argv = list(argv)
+    try:
+        position = argv.index("--complete")
+        kind = argv[position + 1]
+    except (ValueError, IndexError):
+        print("usage: --complete {branch,submodule,version} [PREFIX]", file=sys.stderr)
+        return 2
+    prefix = argv[position + 2] if len(argv) > position + 2 and not argv[position + 2].startswith("-") else ""
+    path = ""
+    for flag in ("--path", "-p"):
+        if flag in argv[:-1]:
+            path = argv[argv.index(flag) + 1]
+    for name in complete(path, kind, prefix):
+        print(name)
+    return 0
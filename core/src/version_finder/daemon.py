@@ -0,0 +1,463 @@
+"""
+daemon.py
+====================================
+Module for serving queries from a long-running process.
+VersionFinder instances are kept warm per repository together with their command
+cache, version table and indices, so repeated queries skip validation, fetching
+and history walks. Instances run in worktree mode, so the user's checkout is never
+touched, and are evicted least recently used first or after being idle.
+Requests are newline-delimited JSON-RPC 2.0 messages over a Unix socket.
+"""
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import asdict, is_dataclass
+import inspect
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple, Union, get_args, get_origin
+from version_finder.common import (
+    DEFAULT_DAEMON_IDLE_TIMEOUT,
+    DEFAULT_DAEMON_MAX_REPOS,
+    DEFAULT_DAEMON_REFRESH,
+    DEFAULT_DAEMON_SOCKET_PATH,
+    ENV_DAEMON_SOCKET,
+)
+from version_finder.git_executer import GitCommandError, GitConfig
+from version_finder.logger import get_logger
+
+if TYPE_CHECKING:
+    # Imported when the first repository is loaded, so that clients start without it
+    from version_finder.version_finder import VersionFinder
+
+logger = get_logger()
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+QUERY_ERROR = -32000
+
+# Repository identity: path, first-parent mode and version prefixes
+FinderKey = Tuple[str, bool, Tuple[str, ...]]
+
+
+class DaemonError(Exception):
+    """Raised when the daemon returns an error"""
+
+    def __init__(self, message: str, code: int = QUERY_ERROR, error_type: Optional[str] = None):
+        super().__init__(message)
+        self.code = code
+        self.error_type = error_type
+
+
+class DaemonUnavailableError(DaemonError):
+    """Raised when no daemon answers on the socket"""
+
+
+def get_socket_path(socket_path: Optional[str] = None) -> str:
+    """
+    Get the socket path of the daemon.
+
+    Args:
+        socket_path: Explicit path, takes precedence over the environment
+
+    Returns:
+        str: The socket path
+    """
+    return socket_path or os.environ.get(ENV_DAEMON_SOCKET) or DEFAULT_DAEMON_SOCKET_PATH
+
+
+def to_jsonable(value: Any) -> Any:
+    """Convert query results (commits, lists of commits) to JSON-serializable values."""
+    if is_dataclass(value):
+        return asdict(value)
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_jsonable(item) for key, item in value.items()}
+    return value
+
+
+def _matches_annotation(value: Any, annotation: Any) -> bool:
+    """Check a JSON parameter value against the type annotation of a method parameter."""
+    if annotation is inspect.Parameter.empty or annotation is Any:
+        return True
+    if annotation is type(None):
+        return value is None
+    origin = get_origin(annotation)
+    if origin is Union:
+        return any(_matches_annotation(value, arg) for arg in get_args(annotation))
+    if origin is list:
+        item_type = (get_args(annotation) or (Any,))[0]
+        return isinstance(value, list) and all(_matches_annotation(item, item_type) for item in value)
+    if annotation is float:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    return isinstance(value, annotation)
+
+
+def validate_params(method: Callable[..., Any], params: Dict[str, Any]) -> None:
+    """
+    Check request parameters against the signature of the method answering the request.
+
+    Args:
+        method: The daemon method
+        params: The request parameters
+
+    Raises:
+        ValueError: If a parameter is unknown, missing or of the wrong type
+    """
+    signature = inspect.signature(method)
+    try:
+        bound = signature.bind(**params)
+    except TypeError as e:
+        raise ValueError(str(e)) from e
+    for name, value in bound.arguments.items():
+        if not _matches_annotation(value, signature.parameters[name].annotation):
+            raise ValueError(f"Invalid value for parameter '{name}': {value!r}")
+
+
+class _PoolEntry:
+    """A warm VersionFinder and the lock serializing its queries."""
+
+    def __init__(self, finder: "VersionFinder"):
+        self.finder = finder
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+        self.updated_at = 0.0
+        self.queries = 0
+
+
+class FinderPool:
+    """LRU pool of warm VersionFinder instances, one per repository."""
+
+    def __init__(self, max_repos: int = DEFAULT_DAEMON_MAX_REPOS,
+                 idle_timeout: float = DEFAULT_DAEMON_IDLE_TIMEOUT,
+                 refresh_interval: float = DEFAULT_DAEMON_REFRESH,
+                 config: Optional[GitConfig] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            max_repos: Number of repositories kept warm
+            idle_timeout: Seconds after which an unused repository is evicted
+            refresh_interval: Seconds after which a warm repository is updated (and fetched) again
+            config: Configuration of the created instances
+        """
+        if max_repos < 1:
+            raise ValueError("max_repos must be positive")
+        self.max_repos = max_repos
+        self.idle_timeout = idle_timeout
+        self.refresh_interval = refresh_interval
+        self.config = config or GitConfig(fetch_ttl=int(refresh_interval))
+        self._entries: "OrderedDict[FinderKey, _PoolEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __evict(self) -> None:
+        """Drop idle entries and the least recently used ones above max_repos. Called with the lock held."""
+        now = time.monotonic()
+        for key in [key for key, entry in self._entries.items() if now - entry.last_used > self.idle_timeout]:
+            logger.info(f"Evicting idle repository {key[0]}")
+            del self._entries[key]
+            self.evictions += 1
+        while len(self._entries) > self.max_repos:
+            key, _ = self._entries.popitem(last=False)
+            logger.info(f"Evicting least recently used repository {key[0]}")
+            self.evictions += 1
+
+    def __get_entry(self, key: FinderKey) -> _PoolEntry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            entry_missing = entry is None
+        if entry_missing:
+            # Created outside the pool lock, so that a cold repository does not block warm ones
+            from version_finder.version_finder import VersionFinder, VersionPattern
+            path, first_parent, prefixes = key
+            finder = VersionFinder(path=path, config=self.config, force=True, use_worktree=True,
+                                   version_pattern=VersionPattern(list(prefixes)) if prefixes else None,
+                                   first_parent=first_parent)
+            with self._lock:
+                entry = self._entries.setdefault(key, _PoolEntry(finder))
+                self._entries.move_to_end(key)
+        with self._lock:
+            entry.last_used = time.monotonic()
+            self.__evict()
+        return entry
+
+    @contextmanager
+    def acquire(self, path: str, branch: str, first_parent: bool = False,
+                version_prefixes: Optional[List[str]] = None) -> Iterator["VersionFinder"]:
+        """
+        Get a warm VersionFinder updated to a branch, with exclusive use for the block.
+
+        The repository is updated only when the branch changes or the last update is
+        older than the refresh interval.
+
+        Args:
+            path: Repository path
+            branch: Branch the queries run on
+            first_parent: Follow only the first parent of merge commits
+            version_prefixes: Optional prefixes marking version commits
+
+        Yields:
+            VersionFinder: The instance, ready for tasks on the branch
+        """
+        key = (os.path.realpath(path), bool(first_parent), tuple(version_prefixes or ()))
+        entry = self.__get_entry(key)
+        with entry.lock:
+            finder = entry.finder
+            now = time.monotonic()
+            if finder.task_branch != branch or now - entry.updated_at > self.refresh_interval:
+                finder.update_repository(branch)
+                entry.updated_at = time.monotonic()
+            entry.queries += 1
+            yield finder
+            entry.last_used = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the pool counters and the warm repositories."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "repositories": [
+                    {"path": key[0], "branch": entry.finder.task_branch, "queries": entry.queries,
+                     "cache": entry.finder.get_cache_stats()}
+                    for key, entry in self._entries.items()
+                ],
+            }
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Answer newline-delimited JSON-RPC requests until the client disconnects."""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.version_finder_daemon.handle_request(line)
+            if response is not None:
+                self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+                self.wfile.flush()
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class VersionFinderDaemon:
+    """JSON-RPC server answering version-finder queries from a FinderPool."""
+
+    def __init__(self, socket_path: Optional[str] = None, pool: Optional[FinderPool] = None):
+        """
+        Initialize the daemon.
+
+        Args:
+            socket_path: Unix socket to listen on. Defaults to get_socket_path()
+            pool: Pool of warm instances. Defaults to a FinderPool with the default limits
+        """
+        self.socket_path = get_socket_path(socket_path)
+        self.pool = pool if pool is not None else FinderPool()
+        self.started_at = time.time()
+        self._server: Optional[_UnixServer] = None
+        self._methods: Dict[str, Callable[..., Any]] = {
+            "ping": self.ping,
+            "stats": self.pool.stats,
+            "shutdown": self.shutdown,
+            "find_version": self.find_version,
+            "find_commits_between_versions": self.find_commits_between_versions,
+            "find_commits_by_text": self.find_commits_by_text,
+        }
+
+    def ping(self) -> Dict[str, Any]:
+        """Report that the daemon is alive."""
+        return {"pid": os.getpid(), "uptime": time.time() - self.started_at, "repositories": len(self.pool)}
+
+    def find_version(self, path: str, branch: str, commit: str, submodule: Optional[str] = None,
+                     first_parent: bool = False, version_prefixes: Optional[List[str]] = None) -> Optional[str]:
+        """Find the first version containing a commit, see VersionFinder.find_version."""
+        with self.pool.acquire(path, branch, first_parent, version_prefixes) as finder:
+            return finder.find_version(commit, submodule or None)
+
+    def find_commits_between_versions(self, path: str, branch: str, start_version: str, end_version: str,
+                                      submodule: Optional[str] = None, first_parent: bool = False,
+                                      version_prefixes: Optional[List[str]] = None) -> List[Any]:
+        """Find the commits between two versions, see VersionFinder.find_commits_between_versions."""
+        with self.pool.acquire(path, branch, first_parent, version_prefixes) as finder:
+            return finder.find_commits_between_versions(start_version, end_version, submodule or None)
+
+    def find_commits_by_text(self, path: str, branch: str, text: str, submodule: Optional[str] = None,
+                             first_parent: bool = False, version_prefixes: Optional[List[str]] = None) -> List[Any]:
+        """Find the commits mentioning a text, see VersionFinder.find_commits_by_text."""
+        with self.pool.acquire(path, branch, first_parent, version_prefixes) as finder:
+            return finder.find_commits_by_text(text, submodule or '')
+
+    def handle_request(self, line: bytes) -> Optional[Dict[str, Any]]:
+        """
+        Answer a single JSON-RPC request.
+
+        Args:
+            line: The encoded request
+
+        Returns:
+            Optional[Dict[str, Any]]: The response, or None for notifications (requests without an id)
+        """
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": str(e)}}
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": INVALID_REQUEST, "message": "Invalid request"}}
+
+        request_id = request.get("id")
+        method = self._methods.get(request["method"])
+        params = request.get("params") or {}
+        if method is None:
+            error = {"code": METHOD_NOT_FOUND, "message": f"Method not found: {request['method']}"}
+        elif not isinstance(params, dict):
+            error = {"code": INVALID_PARAMS, "message": "params must be an object"}
+        else:
+            try:
+                validate_params(method, params)
+            except ValueError as e:
+                error = {"code": INVALID_PARAMS, "message": str(e)}
+            else:
+                start_time = time.time()
+                try:
+                    result = to_jsonable(method(**params))
+                    logger.info(f"{request['method']} answered in {time.time() - start_time:.3f} seconds")
+                    return None if request_id is None else {"jsonrpc": "2.0", "id": request_id, "result": result}
+                except Exception as e:
+                    error = self.__error_from_exception(request["method"], e)
+        return None if request_id is None else {"jsonrpc": "2.0", "id": request_id, "error": error}
+
+    @staticmethod
+    def __error_from_exception(name: str, error: Exception) -> Dict[str, Any]:
+        """
+        Get the JSON-RPC error object of a failed method call.
+
+        Failures of the query itself (git errors, unknown commits, branches or versions) are
+        QUERY_ERROR, anything else is a bug in the daemon and reported as INTERNAL_ERROR.
+        """
+        # Imported here, so that clients of this module start without it
+        from version_finder.version_finder import GitError
+        data = {"type": type(error).__name__}
+        if isinstance(error, (GitError, GitCommandError)):
+            logger.error(f"{name} failed: {error}")
+            return {"code": QUERY_ERROR, "message": str(error), "data": data}
+        logger.error(f"{name} failed with an internal error: {type(error).__name__}: {error}")
+        return {"code": INTERNAL_ERROR, "message": f"Internal error: {error}", "data": data}
+
+    def serve_forever(self) -> None:
+        """
+        Listen on the socket until shutdown() is called.
+
+        Raises:
+            DaemonError: If Unix sockets are not supported or another daemon is listening on the socket
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            raise DaemonError("Unix sockets are not supported on this platform")
+        if DaemonClient(self.socket_path).is_running():
+            raise DaemonError(f"A daemon is already listening on {self.socket_path}")
+        # A socket file left behind by a daemon that did not shut down cleanly
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        os.makedirs(os.path.dirname(os.path.abspath(self.socket_path)), exist_ok=True)
+
+        self._server = _UnixServer(self.socket_path, _RequestHandler)
+        self._server.version_finder_daemon = self
+        os.chmod(self.socket_path, 0o600)
+        logger.info(f"Daemon listening on {self.socket_path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            logger.info("Daemon stopped")
+
+    def shutdown(self) -> bool:
+        """Stop serving. Safe to call from a request handler."""
+        if self._server is not None:
+            # serve_forever() must not be shut down from its own thread
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+        return True
+
+
+class DaemonClient:
+    """Client of a VersionFinderDaemon."""
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: Optional[float] = None):
+        """
+        Initialize the client.
+
+        Args:
+            socket_path: Unix socket of the daemon. Defaults to get_socket_path()
+            timeout: Socket timeout in seconds, None waits for the query to finish
+        """
+        self.socket_path = get_socket_path(socket_path)
+        self.timeout = timeout
+        self._next_id = 0
+
+    def is_running(self) -> bool:
+        """Check if a daemon answers on the socket."""
+        if not hasattr(socket, "AF_UNIX") or not os.path.exists(self.socket_path):
+            return False
+        try:
+            self.call("ping", _timeout=1.0)
+            return True
+        except DaemonError:
+            return False
+
+    def call(self, method: str, _timeout: Optional[float] = None, **params: Any) -> Any:
+        """
+        Call a daemon method.
+
+        Args:
+            method: Method name, e.g. "find_version"
+            **params: Method parameters
+
+        Returns:
+            Any: The method result
+
+        Raises:
+            DaemonUnavailableError: If the daemon can not be reached
+            DaemonError: If the daemon returns an error
+        """
+        self._next_id += 1
+        request = {"jsonrpc": "2.0", "id": self._next_id, "method": method, "params": params}
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.settimeout(_timeout if _timeout is not None else self.timeout)
+                client.connect(self.socket_path)
+                client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+                with client.makefile("rb") as reader:
+                    line = reader.readline()
+        except (OSError, AttributeError) as e:
+            raise DaemonUnavailableError(f"Daemon is not reachable on {self.socket_path}: {e}") from e
+        if not line:
+            raise DaemonUnavailableError(f"Daemon on {self.socket_path} closed the connection")
+
+        response = json.loads(line)
+        error = response.get("error")
+        if error:
+            raise DaemonError(error.get("message", "Unknown error"), error.get("code", QUERY_ERROR),
+                              (error.get("data") or {}).get("type"))
+        return response.get("result")
@@ -0,0 +1,171 @@
+"""
+fetch_planner.py
+====================================
+Module for planning git fetches.
+Every remote/branch is fetched at most once per session, fetches are skipped
+while FETCH_HEAD is younger than a freshness TTL, and a fetch can optionally
+run in the background while queries use the current refs.
+"""
+from pathlib import Path
+import threading
+import time
+from typing import List, Optional, Set, Tuple
+from version_finder.git_executer import GitCommandExecutor, GitCommandError
+from version_finder.common import GIT_CMD_FETCH
+from version_finder.logger import get_logger
+
+logger = get_logger()
+
+# Key used for a fetch of all remotes / of a whole remote
+ALL_REMOTES = "*"
+
+
+class FetchPlanner:
+    """Decide which fetches are needed and run each of them only once."""
+
+    def __init__(self, git: GitCommandExecutor, ttl: int = 0, background: bool = False):
+        """
+        Initialize the fetch planner.
+
+        Args:
+            git: Executor bound to the repository to fetch into
+            ttl: Freshness TTL in seconds. A fetch is skipped if FETCH_HEAD is younger than this.
+            background: If True, fetches run in a background thread and return immediately.
+        """
+        self._git = git
+        self.ttl = ttl
+        self.background = background
+        self._fetched: Set[Tuple[str, Optional[str]]] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._fetch_head_path: Optional[Path] = None
+        self._remotes: Optional[List[str]] = None
+
+    def __get_fetch_head_path(self) -> Path:
+        if self._fetch_head_path is None:
+            output = self._git.execute(["rev-parse", "--git-path", "FETCH_HEAD"]).decode("utf-8").strip()
+            self._fetch_head_path = (Path(self._git.repository_path) / output).resolve()
+        return self._fetch_head_path
+
+    def list_remotes(self) -> List[str]:
+        """Get the configured remotes."""
+        if self._remotes is None:
+            try:
+                self._remotes = self._git.execute(["remote"]).decode("utf-8").split()
+            except GitCommandError:
+                self._remotes = []
+        return self._remotes
+
+    def get_default_remote(self) -> Optional[str]:
+        """Get the remote used for branch fetches: origin if configured, else the first remote."""
+        remotes = self.list_remotes()
+        if "origin" in remotes:
+            return "origin"
+        return remotes[0] if remotes else None
+
+    def has_remote_branch(self, remote: str, branch: str) -> bool:
+        """Check whether the remote-tracking branch of a branch exists."""
+        # With check=False, the output is returned on success and the failed process otherwise
+        return isinstance(self._git.execute(
+            ["show-ref", "--verify", "--quiet", f"refs/remotes/{remote}/{branch}"], check=False), bytes)
+
+    def get_data_age(self) -> Optional[float]:
+        """
+        Get how stale the remote data is.
+
+        Returns:
+            Optional[float]: Seconds since the last fetch, or None if the repository was never fetched
+        """
+        try:
+            return max(0.0, time.time() - self.__get_fetch_head_path().stat().st_mtime)
+        except (OSError, GitCommandError):
+            return None
+
+    def is_fresh(self) -> bool:
+        """Check whether the last fetch is younger than the TTL."""
+        if self.ttl <= 0:
+            return False
+        age = self.get_data_age()
+        return age is not None and age < self.ttl
+
+    def is_running(self) -> bool:
+        """Check whether a background fetch is in progress."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def __is_covered(self, remote: str, branch: Optional[str]) -> bool:
+        return bool({(ALL_REMOTES, None), (remote, None), (remote, branch)} & self._fetched)
+
+    def fetch(self, branch: Optional[str] = None, remote: Optional[str] = None, force: bool = False) -> bool:
+        """
+        Fetch the given branch (or all remotes) unless it was already fetched in this session.
+
+        A branch without a remote-tracking branch, e.g. a local-only branch or one created on
+        the remote since the last fetch, is not fetched by name: the whole remote is fetched.
+
+        Args:
+            branch: Branch to fetch. Fetches all remotes if None.
+            remote: Remote to fetch from. Defaults to the default remote when a branch is given.
+            force: If True, fetch even if already fetched in this session or within the TTL
+
+        Returns:
+            bool: True if a fetch was started, False if it was skipped
+
+        Raises:
+            GitCommandError: If a foreground fetch fails
+        """
+        if branch and not remote:
+            remote = self.get_default_remote()
+            if remote is None:
+                logger.debug("No remote configured, skipping fetch")
+                return False
+        if branch and not self.has_remote_branch(remote, branch):
+            logger.debug(f"Branch {branch} is not tracked from {remote}, fetching the whole remote")
+            branch = None
+        remote = remote or ALL_REMOTES
+
+        with self._lock:
+            if not force and self.__is_covered(remote, branch):
+                logger.debug(f"Skipping fetch of {remote} {branch or ''}: already fetched in this session")
+                return False
+            if not force and self.is_fresh():
+                logger.info(f"Skipping fetch, remote data is {self.get_data_age():.0f} seconds old "
+                            f"(TTL is {self.ttl} seconds)")
+                self._fetched.add((ALL_REMOTES, None))
+                return False
+            self._fetched.add((remote, branch))
+
+        if remote == ALL_REMOTES:
+            command = list(GIT_CMD_FETCH)
+        else:
+            command = ["fetch", remote] + ([branch] if branch else [])
+
+        if not self.background:
+            self.__run_fetch(command, remote, branch, raise_on_error=True)
+            return True
+
+        self.wait()
+        self._thread = threading.Thread(target=self.__run_fetch, args=(command, remote, branch, False))
+        self._thread.daemon = True
+        self._thread.start()
+        logger.info(f"Started background fetch: git {' '.join(command)}")
+        return True
+
+    def __run_fetch(self, command: List[str], remote: str, branch: Optional[str], raise_on_error: bool) -> None:
+        start_time = time.time()
+        try:
+            output = self._git.execute(command)
+            logger.debug(f"Fetch output: {output}")
+            logger.info(f"Fetched {remote if remote != ALL_REMOTES else 'all remotes'} "
+                        f"{branch or ''} in {time.time() - start_time:.2f} seconds")
+        except GitCommandError as e:
+            # Allow a later retry of the same fetch
+            with self._lock:
+                self._fetched.discard((remote, branch))
+            logger.error(f"Failed to fetch repository: {e}")
+            if raise_on_error:
+                raise
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Wait for a background fetch to finish."""
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -3,20 +3,33 @@ git_executor.py
 ====================================
 Module for handling git command execution logic.
 """
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
+import atexit
+import functools
+import json
+import re
+import shutil
 import subprocess
+import tempfile
+import threading
 import time
 import os
-from typing import Optional, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from version_finder.logger import get_logger
 from version_finder.common import (
     DEFAULT_GIT_TIMEOUT,
     DEFAULT_GIT_MAX_RETRIES,
     DEFAULT_GIT_RETRY_DELAY,
+    DEFAULT_GIT_FETCH_TTL,
+    DEFAULT_GIT_CACHE_SIZE,
     ENV_GIT_TIMEOUT,
     ENV_GIT_MAX_RETRIES,
-    ENV_GIT_RETRY_DELAY
+    ENV_GIT_RETRY_DELAY,
+    ENV_GIT_FETCH_TTL,
+    ENV_GIT_CACHE_SIZE,
+    ENV_GIT_CACHE_PATH
 )
 
 
@@ -29,6 +42,10 @@ class GitConfig:
     timeout: int = int(os.environ.get(ENV_GIT_TIMEOUT, str(DEFAULT_GIT_TIMEOUT)))
     max_retries: int = int(os.environ.get(ENV_GIT_MAX_RETRIES, str(DEFAULT_GIT_MAX_RETRIES)))
     retry_delay: int = int(os.environ.get(ENV_GIT_RETRY_DELAY, str(DEFAULT_GIT_RETRY_DELAY)))
+    fetch_ttl: int = int(os.environ.get(ENV_GIT_FETCH_TTL, str(DEFAULT_GIT_FETCH_TTL)))
+    background_fetch: bool = False
+    cache_size: int = int(os.environ.get(ENV_GIT_CACHE_SIZE, str(DEFAULT_GIT_CACHE_SIZE)))
+    cache_path: Optional[str] = os.environ.get(ENV_GIT_CACHE_PATH)
 
     def __post_init__(self):
         if self.timeout <= 0:
@@ -37,6 +54,10 @@ class GitConfig:
             raise ValueError("max_retries cannot be negative")
         if self.retry_delay <= 0:
             raise ValueError("retry_delay must be positive")
+        if self.fetch_ttl < 0:
+            raise ValueError("fetch_ttl cannot be negative")
+        if self.cache_size < 0:
+            raise ValueError("cache_size cannot be negative")
 
 
 class GitCommandError(Exception):
@@ -55,21 +76,358 @@ class GitPermissionError(GitCommandError):
     """Raised when git operations fail due to permission issues"""
 
 
+# Commands whose output is fully determined by immutable object IDs
+PURE_GIT_COMMANDS = {"cat-file", "show", "ls-tree", "diff", "rev-parse"}
+
+# A full object ID, optionally followed by ancestry suffixes (e.g. <sha>^, <sha>~2) or :<path>
+IMMUTABLE_REVISION_PATTERN = re.compile(r"^[0-9a-f]{40}(?:[0-9a-f]{24})?(?:[~^]\d*)*(?::.*)?$")
+
+# Global git options that take a separate value, e.g. ["-C", "<path>"]
+GIT_GLOBAL_OPTIONS_WITH_VALUE = {"-C", "--git-dir", "--work-tree", "-c"}
+
+# diff options that compare against the index or files instead of commits
+DIFF_WORKTREE_OPTIONS = {"--cached", "--staged", "--no-index"}
+
+
+def is_pure_command(command: List[str]) -> bool:
+    """
+    Check whether a git command's output depends only on immutable object IDs.
+
+    Commands that refer to refs (HEAD, branch names, short SHAs) are never pure,
+    as their result changes when the refs move.
+
+    Args:
+        command: Git command and arguments as list (without the leading "git")
+
+    Returns:
+        bool: True if the command output can be cached
+    """
+    index = 0
+    while index < len(command) and command[index] in GIT_GLOBAL_OPTIONS_WITH_VALUE:
+        index += 2
+    if index >= len(command) or command[index] not in PURE_GIT_COMMANDS:
+        return False
+
+    verb = command[index]
+    revisions = []
+    for arg in command[index + 1:]:
+        if arg == "--":
+            break
+        if arg.startswith("-"):
+            if verb == "diff" and arg in DIFF_WORKTREE_OPTIONS:
+                return False
+            continue
+        if verb == "diff" and ".." in arg:
+            # <A>..<B> (or <A>...<B>) names both sides of the diff
+            revisions.extend(arg.replace("...", "..").split("..", 1))
+        else:
+            revisions.append(arg)
+        if verb == "ls-tree":
+            # Arguments after the tree-ish are paths
+            break
+
+    if verb == "diff" and len(revisions) != 2:
+        # A single revision is compared against the working tree
+        return False
+    return bool(revisions) and all(IMMUTABLE_REVISION_PATTERN.match(rev) for rev in revisions)
+
+
+class GitCommandCache:
+    """LRU cache of pure git command outputs, bounded by the total output size."""
+
+    def __init__(self, max_bytes: int = DEFAULT_GIT_CACHE_SIZE, path: Optional[Union[str, Path]] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Maximum total size of the cached outputs
+            path: Optional file the cache is loaded from and persisted to at exit
+        """
+        self.max_bytes = max_bytes
+        self.path = Path(path) if path else None
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+        self._entries: "OrderedDict[Tuple[str, ...], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        if self.path:
+            self.load()
+            atexit.register(self.save)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple[str, ...]) -> Optional[bytes]:
+        """Get a cached output and mark it as recently used."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Tuple[str, ...], value: bytes) -> None:
+        """Store an output, evicting the least recently used entries above the size cap."""
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = value
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self) -> None:
+        """Remove all cached outputs."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get the cache counters."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self.size}
+
+    def load(self) -> None:
+        """Load persisted entries, ignoring a missing or corrupt cache file."""
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            for key, value in data.get("entries", []):
+                # Entries persisted under older purity rules may depend on the working tree
+                if is_pure_command(key[1:]):
+                    self.put(tuple(key), value.encode("latin-1"))
+            logger.debug(f"Loaded {len(self._entries)} cached git command outputs from {self.path}")
+        except (OSError, ValueError, AttributeError) as e:
+            logger.debug(f"Git command cache not loaded from {self.path}: {e}")
+
+    def save(self) -> None:
+        """Persist the entries to the cache file."""
+        if not self.path:
+            return
+        try:
+            with self._lock:
+                entries = [[list(key), value.decode("latin-1")] for key, value in self._entries.items()]
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            temp_path.write_text(json.dumps({"entries": entries}), encoding="utf-8")
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save git command cache to {self.path}: {e}")
+
+
+# Environment overrides for spawned git processes: never take optional locks,
+# never prompt for credentials and never start a pager
+GIT_ENV_OVERRIDES = {
+    "GIT_OPTIONAL_LOCKS": "0",
+    "GIT_TERMINAL_PROMPT": "0",
+    "GIT_PAGER": "cat",
+    "PAGER": "cat",
+}
+
+# Variables of the caller's environment passed on to git: the locale, the home and configuration
+# directories, ssh agent and proxy settings, and what Windows needs to start a process.
+# Every GIT_* and LC_* variable is passed on as well, see git_environment.
+GIT_ENV_ALLOWLIST = frozenset({
+    "PATH", "HOME", "USER", "LOGNAME", "LANG", "LANGUAGE", "TZ", "TMPDIR", "XDG_CONFIG_HOME",
+    "SSH_AUTH_SOCK", "SSH_AGENT_PID", "HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY", "NO_PROXY",
+    "SSL_CERT_FILE", "SSL_CERT_DIR", "CURL_CA_BUNDLE",
+    "SYSTEMROOT", "SYSTEMDRIVE", "USERPROFILE", "HOMEDRIVE", "HOMEPATH", "APPDATA", "LOCALAPPDATA",
+    "TEMP", "TMP", "COMSPEC", "PATHEXT",
+})
+GIT_ENV_PREFIXES = ("GIT_", "LC_")
+
+# Options passed to every git invocation
+GIT_GLOBAL_ARGS = ["--no-pager", "-c", "core.fsmonitor=false"]
+
+
+def git_environment() -> Dict[str, str]:
+    """
+    Build the environment git is spawned with.
+
+    Only the variables git uses are taken from the caller's environment, so that unrelated
+    secrets and settings of the calling process do not leak into git and the hooks or helpers
+    it runs. GIT_ENV_OVERRIDES are applied on top.
+
+    Returns:
+        Dict[str, str]: The environment for git processes
+    """
+    env = {key: value for key, value in os.environ.items()
+           if key.upper() in GIT_ENV_ALLOWLIST or key.upper().startswith(GIT_ENV_PREFIXES)}
+    env.update(GIT_ENV_OVERRIDES)
+    return env
+
+
+@functools.lru_cache(maxsize=None)
+def get_git_binary() -> Tuple[str, str]:
+    """
+    Resolve the git binary and check its version, once per process.
+
+    Returns:
+        Tuple[str, str]: Absolute path of the git binary and its version string
+
+    Raises:
+        GitCommandError: If git is not installed
+    """
+    git_binary = shutil.which("git")
+    if not git_binary:
+        raise GitCommandError("Git is not installed")
+    try:
+        version = subprocess.check_output([git_binary, "--version"]).decode("utf-8").strip()
+    except (OSError, subprocess.CalledProcessError):
+        raise GitCommandError("Git is not installed")
+    logger.debug(f"Using {version} at {git_binary}")
+    return git_binary, version
+
+
+class _ProcessWatchdog:
+    """Kill git processes that exceed their timeout, using a single shared thread."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._deadlines: Dict[subprocess.Popen, float] = {}
+        self._timed_out = set()
+        self._next_deadline: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, process: subprocess.Popen, timeout: float) -> None:
+        """Start watching a process."""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            self._deadlines[process] = deadline
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="git-watchdog", daemon=True)
+                self._thread.start()
+            elif self._next_deadline is None or deadline < self._next_deadline:
+                self._condition.notify()
+
+    def unwatch(self, process: subprocess.Popen) -> bool:
+        """Stop watching a process. Returns True if it was killed for exceeding its timeout."""
+        with self._condition:
+            self._deadlines.pop(process, None)
+            if process in self._timed_out:
+                self._timed_out.discard(process)
+                return True
+            return False
+
+    def _run(self) -> None:
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                for process, deadline in list(self._deadlines.items()):
+                    if deadline <= now:
+                        del self._deadlines[process]
+                        self._timed_out.add(process)
+                        process.kill()
+                self._next_deadline = min(self._deadlines.values()) if self._deadlines else None
+                self._condition.wait(None if self._next_deadline is None else self._next_deadline - now)
+
+
+_watchdog = _ProcessWatchdog()
+
+
 class GitCommandExecutor:
     def __init__(self,
                  repository_path: Path,
-                 config: Optional[GitConfig] = None):
+                 config: Optional[GitConfig] = None,
+                 cache: Optional[GitCommandCache] = None):
         self.repository_path = repository_path
         self.config = config or GitConfig()
+        if cache is None and self.config.cache_size > 0:
+            cache = GitCommandCache(self.config.cache_size, self.config.cache_path)
+        self.cache = cache
 
         # Check Git is installed
+        git_binary, _ = get_git_binary()
+        # Use "-C <path>" rather than a cwd, together with an absolute binary path and
+        # close_fds=False this lets subprocess spawn git with posix_spawn instead of fork/exec.
+        # close_fds=False does not hand git the open files of this process: Python creates file
+        # descriptors non-inheritable (PEP 446), so only the pipes subprocess sets up are inherited.
+        self._base_command = [git_binary, "-C", str(repository_path)] + GIT_GLOBAL_ARGS
+        self._env = git_environment()
+
+    def _run(self, command: List[str], input: Optional[bytes] = None,
+             env: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> bytes:
+        """
+        Spawn git and return its output.
+
+        The timeout is enforced by the shared watchdog, so that waiting for the process
+        blocks instead of polling (subprocess polls with sleeps when given a timeout).
+
+        Raises:
+            subprocess.TimeoutExpired: When git did not finish within the timeout (default: the configured one)
+            subprocess.CalledProcessError: When git exited with a non-zero status
+        """
+        args = self._base_command + command
+        process = subprocess.Popen(args, stdin=subprocess.PIPE if input is not None else None,
+                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   env=dict(self._env, **env) if env else self._env, close_fds=False)
+        timeout = timeout or self.config.timeout
+        _watchdog.watch(process, timeout)
         try:
-            subprocess.check_output(["git", "--version"])
-        except FileNotFoundError:
-            raise GitCommandError("Git is not installed")
+            stdout, stderr = process.communicate(input)
+        finally:
+            timed_out = _watchdog.unwatch(process)
+
+        # A process that exited on its own right at its deadline is not a timeout
+        if timed_out and process.returncode != 0:
+            raise subprocess.TimeoutExpired(args, timeout, output=stdout, stderr=stderr)
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, args, output=stdout, stderr=stderr)
+        return stdout
+
+    def stream(self, command: List[str], chunk_size: int = 64 * 1024,
+               input: Optional[bytes] = None) -> Iterator[bytes]:
+        """
+        Execute a git command and yield its output as git produces it.
+
+        Streamed commands bypass the command cache and are not retried. The timeout is not
+        enforced either, since the pace of the consumer determines how long git runs.
+        Closing the iterator early kills git.
 
-    def execute(self, command: list[str], retries: int = 0,
-                check: bool = True) -> Union[bytes, subprocess.CompletedProcess]:
+        Args:
+            command: Git command and arguments as list
+            chunk_size: Maximal number of bytes per chunk
+            input: Optional bytes written to the command's standard input before its output is read
+
+        Yields:
+            bytes: Consecutive chunks of the standard output
+
+        Raises:
+            GitCommandError: When git exited with a non-zero status
+        """
+        logger.debug(f"Streaming git command: {' '.join(command)}")
+        # stderr goes to a file, so that git never blocks on a full stderr pipe while stdout is read
+        with tempfile.TemporaryFile() as stderr:
+            process = subprocess.Popen(self._base_command + command, stdout=subprocess.PIPE, stderr=stderr,
+                                       stdin=subprocess.PIPE if input is not None else None,
+                                       env=self._env, close_fds=False)
+            try:
+                if input is not None:
+                    process.stdin.write(input)
+                    process.stdin.close()
+                while True:
+                    chunk = process.stdout.read1(chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+                process.wait()
+            finally:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+                process.stdout.close()
+            if process.returncode:
+                stderr.seek(0)
+                error_msg = stderr.read().decode('utf-8', errors='replace')
+                raise GitCommandError(f"Git command failed: {error_msg}")
+
+    def execute(self, command: list[str], retries: int = 0, check: bool = True, input: Optional[bytes] = None,
+                env: Optional[Dict[str, str]] = None,
+                timeout: Optional[float] = None) -> Union[bytes, subprocess.CompletedProcess]:
         """
         Execute a git command with retry logic and timeout.
 
@@ -77,6 +435,10 @@ class GitCommandExecutor:
             command: Git command and arguments as list
             retries: Number of retries attempted so far
             check: Whether to check return code and raise on error
+            input: Optional bytes written to the command's standard input
+            env: Optional environment variables set for this command only, e.g. GIT_TRACE2_EVENT
+            timeout: Seconds before this command is killed, instead of the configured timeout.
+                For long-running commands such as repository maintenance.
 
         Returns:
             Command output as bytes or CompletedProcess if check=False
@@ -87,14 +449,19 @@ class GitCommandExecutor:
             GitTimeoutError: When command execution times out
             GitPermissionError: When permission issues occur
         """
+        cache_key = None
+        if self.cache is not None and retries == 0 and input is None and env is None and is_pure_command(command):
+            cache_key = (str(self.repository_path),) + tuple(command)
+            output = self.cache.get(cache_key)
+            if output is not None:
+                logger.debug(f"Cached git command: {' '.join(command)}")
+                return output
+
         try:
             logger.debug(f"Executing git command: {' '.join(command)}")
-            output = subprocess.check_output(
-                ["git"] + command,
-                cwd=self.repository_path,
-                stderr=subprocess.PIPE,
-                timeout=self.config.timeout
-            )
+            output = self._run(command, input, env, timeout)
+            if cache_key is not None:
+                self.cache.put(cache_key, output)
             return output
         except subprocess.TimeoutExpired as e:
             if not check:
@@ -104,9 +471,9 @@ class GitCommandExecutor:
             if retries < self.config.max_retries:
                 logger.warning(f"Git command timed out, retrying in {self.config.retry_delay}s: {e}")
                 time.sleep(self.config.retry_delay)
-                return self.execute(command, retries + 1)
+                return self.execute(command, retries + 1, input=input, env=env, timeout=timeout)
 
-            raise GitTimeoutError(f"Git command timed out after {self.config.timeout}s: {' '.join(command)}") from e
+            raise GitTimeoutError(f"Git command timed out after {e.timeout}s: {' '.join(command)}") from e
 
         except subprocess.CalledProcessError as e:
             if not check:
@@ -128,6 +495,6 @@ class GitCommandExecutor:
             if retries < self.config.max_retries:
                 logger.warning(f"Git command failed, retrying in {self.config.retry_delay}s: {error_msg}")
                 time.sleep(self.config.retry_delay)
-                return self.execute(command, retries + 1)
+                return self.execute(command, retries + 1, input=input, env=env, timeout=timeout)
 
             raise GitCommandError(f"Git command failed: {error_msg}") from e
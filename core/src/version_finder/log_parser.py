@@ -0,0 +1,174 @@
+"""
+log_parser.py
+====================================
+Module for parsing delimited git log output.
+Records are located directly in the raw output bytes and fields are exposed as
+memoryview slices of it, so no copy of the whole output is made and each field
+is only decoded when it is accessed.
+"""
+from typing import Iterable, Iterator, List, Tuple
+
+# Separators used by the git formats built with log_format()
+RECORD_SEPARATOR = b"\x1e"
+FIELD_SEPARATOR = b"\x1f"
+NUL_SEPARATOR = b"\x00"
+
+
+def log_format(*placeholders: str) -> str:
+    """
+    Build a git pretty format whose records can be parsed with iter_records().
+
+    Args:
+        placeholders: git pretty format placeholders, one per field (e.g. "%H", "%s")
+
+    Returns:
+        str: A format string that starts every record with a record separator and
+        separates the fields with a field separator
+    """
+    return "%x1E" + "%x1F".join(placeholders)
+
+
+class LogRecord:
+    """A single record of a git log output. Fields are decoded on access."""
+
+    __slots__ = ("_view", "_bounds")
+
+    def __init__(self, view: memoryview, bounds: List[Tuple[int, int]]):
+        self._view = view
+        self._bounds = bounds
+
+    def __len__(self) -> int:
+        return len(self._bounds)
+
+    def raw(self, index: int) -> memoryview:
+        """
+        Get a field without decoding it.
+
+        Args:
+            index: Index of the field
+
+        Returns:
+            memoryview: The field bytes, sharing memory with the parsed output
+        """
+        start, end = self._bounds[index]
+        return self._view[start:end]
+
+    def __getitem__(self, index: int) -> str:
+        return str(self.raw(index), "utf-8", "replace")
+
+    def get(self, index: int, default: str = "") -> str:
+        """Get a decoded field, or default if the record has fewer fields."""
+        if -len(self._bounds) <= index < len(self._bounds):
+            return self[index]
+        return default
+
+    def __repr__(self):
+        return f"LogRecord({[self[i] for i in range(len(self))]})"
+
+
+def iter_records(output: bytes,
+                 record_separator: bytes = RECORD_SEPARATOR,
+                 field_separator: bytes = FIELD_SEPARATOR) -> Iterator[LogRecord]:
+    """
+    Iterate over the records of delimited git output.
+
+    A record runs from a record separator to the next one. The newline git
+    appends after each record is not part of the last field. Any output before
+    the first record separator is ignored.
+
+    Args:
+        output: Raw git output
+        record_separator: Byte that starts every record
+        field_separator: Byte that separates fields within a record
+
+    Returns:
+        Iterator[LogRecord]: The records, in output order
+    """
+    view = memoryview(output)
+    find = output.find
+    position = find(record_separator)
+    while position != -1:
+        start = position + 1
+        position = find(record_separator, start)
+        end = len(output) if position == -1 else position
+        if end > start and output[end - 1] == 0x0A:
+            end -= 1
+
+        bounds = []
+        field_start = start
+        field_end = find(field_separator, field_start, end)
+        while field_end != -1:
+            bounds.append((field_start, field_end))
+            field_start = field_end + 1
+            field_end = find(field_separator, field_start, end)
+        bounds.append((field_start, end))
+        yield LogRecord(view, bounds)
+
+
+def iter_stream_records(chunks: Iterable[bytes],
+                        record_separator: bytes = RECORD_SEPARATOR,
+                        field_separator: bytes = FIELD_SEPARATOR) -> Iterator[LogRecord]:
+    """
+    Iterate over the records of delimited git output that arrives in chunks.
+
+    A record is yielded as soon as the separator of the next record arrives, so the
+    first records are available before git finishes. Only the incomplete tail of the
+    output is kept between chunks.
+
+    Args:
+        chunks: Consecutive pieces of raw git output, e.g. from GitCommandExecutor.stream()
+        record_separator: Byte that starts every record
+        field_separator: Byte that separates fields within a record
+
+    Returns:
+        Iterator[LogRecord]: The records, in output order
+    """
+    # The tail is kept as a list of chunks and joined once its record completes, so a record
+    # spanning many chunks is copied once instead of once per chunk. Every chunk is scanned once.
+    pending: List[bytes] = []
+    for chunk in chunks:
+        boundary = chunk.rfind(record_separator)
+        if boundary == -1:
+            pending.append(chunk)
+            continue
+        pending.append(chunk[:boundary])
+        complete = b"".join(pending)
+        pending = [chunk[boundary:]]
+        yield from iter_records(complete, record_separator, field_separator)
+    yield from iter_records(b"".join(pending), record_separator, field_separator)
+
+
+def iter_tokens(output: bytes, separator: bytes = NUL_SEPARATOR) -> Iterator[str]:
+    """
+    Iterate over the non-empty tokens of NUL (or otherwise) separated git output.
+
+    Args:
+        output: Raw git output, e.g. from a command run with -z
+        separator: Byte separating the tokens
+
+    Returns:
+        Iterator[str]: The decoded tokens
+    """
+    view = memoryview(output)
+    start = 0
+    size = len(output)
+    while start < size:
+        end = output.find(separator, start)
+        if end == -1:
+            end = size
+        if end > start:
+            yield str(view[start:end], "utf-8", "replace")
+        start = end + 1
+
+
+def parse_hashes(output: bytes) -> List[str]:
+    """
+    Parse whitespace separated object names, e.g. the output of log --format=%H.
+
+    Args:
+        output: Raw git output
+
+    Returns:
+        List[str]: The object names, in output order
+    """
+    return output.decode("ascii", "replace").split()
@@ -1,8 +1,18 @@
+import argparse
+import importlib
+import importlib.util
 import os
-import sys
-import subprocess
-from .common import parse_arguments, args_to_command
-from .version_finder import VersionFinder
+from typing import Callable
+from .common import parse_arguments, report_data_age
+
+# The task modules are imported by the commands using them, so that --version,
+# --help and the external interfaces start without loading them
+
+# Interface -> (module, main function taking the parsed arguments)
+EXTERNAL_INTERFACES = {
+    "cli": ("version_finder_cli.cli", "cli_main"),
+    "gui": ("version_finder_gui.gui", "gui_main"),
+}
 
 
 class ExternalInterfaceNotSupportedError(Exception):
@@ -14,38 +24,77 @@ class ExternalInterfaceNotSupportedError(Exception):
         super().__init__(f"External interface '{interface}' is not supported. {installation_instructions}")
 
 
-def is_package_installed(package_name: str) -> bool:
-    """Verify if the package is installed in the system using pip show."""
-    try:
-        print(f"Verifying installation of CLI: {package_name}")
-        result = subprocess.run(
-            [sys.executable, '-m', 'pip', 'show', package_name],
-            capture_output=True,
-            text=True
-        )
-        return result.returncode == 0
-    except Exception:
-        return False
+def get_interface_main(interface: str) -> Callable[[argparse.Namespace], int]:
+    """
+    Get the entry point of an external interface, to be called in-process.
+
+    Args:
+        interface: One of EXTERNAL_INTERFACES
+
+    Returns:
+        Callable[[argparse.Namespace], int]: The interface's main function taking the parsed arguments
+
+    Raises:
+        ExternalInterfaceNotSupportedError: If the interface is not installed
+    """
+    module_name, function_name = EXTERNAL_INTERFACES[interface]
+    # find_spec only locates the package, nothing is imported unless it is installed
+    if importlib.util.find_spec(module_name.split(".")[0]) is None:
+        raise ExternalInterfaceNotSupportedError(interface)
+    return getattr(importlib.import_module(module_name), function_name)
 
 
 def call_cli_app(args):
     """Call the CLI app."""
-    # Verify if the CLI app installed in the system
-    if not is_package_installed("version-finder-git-based-versions-cli"):
-        raise ExternalInterfaceNotSupportedError("cli")
-
-    # Call the CLI app with the provided arguments
-    os.system(f"version-finder-cli {args_to_command(args)}")
-    return 0
+    return get_interface_main("cli")(args)
 
 
 def call_gui_app(args):
     """Call the GUI app."""
-    # Verify if the GUI app installed in the system
-    if not is_package_installed("version-finder-git-based-versions-gui-app"):
-        raise ExternalInterfaceNotSupportedError("gui")
-    # Call the GUI app with the provided arguments
-    os.system(f"version-finder-gui {args_to_command(args)}")
+    return get_interface_main("gui")(args)
+
+
+def prepare_repository(args):
+    """Prepare the repository for fast queries and report the result."""
+    from .version_finder import VersionFinder
+    try:
+        # Worktree mode never stashes or checks out in the user's tree, which maintenance must not touch
+        vf = VersionFinder(path=args.path or os.getcwd(), force=True, use_worktree=True,
+                           first_parent=args.first_parent)
+        report = vf.optimize_repository()
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        return 1
+
+    for repository, steps in report["steps"].items():
+        for step, result in steps.items():
+            print(f"{repository}: {step} {result}")
+    for query, before in report["before"].items():
+        print(f"{query}: {before * 1000:.1f} ms -> {report['after'][query] * 1000:.1f} ms")
+    print(f"Speedup of the standard queries: {report['speedup']:.1f}x")
+    return 0
+
+
+def run_daemon(args):
+    """Serve queries from warm per-repository caches until the daemon is shut down."""
+    from .daemon import DaemonError, FinderPool, VersionFinderDaemon
+    daemon = VersionFinderDaemon(args.socket, FinderPool(max_repos=args.max_repos))
+    print(f"Version Finder daemon listening on {daemon.socket_path}")
+    try:
+        daemon.serve_forever()
+    except DaemonError as e:
+        print(f"Error: {str(e)}")
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def run_http_server(args):
+    """Answer queries over HTTP until interrupted."""
+    from .server import run_server
+    print(f"Version Finder server listening on http://{args.host}:{args.port}")
+    run_server(args.host, args.port, args.workers)
     return 0
 
 
@@ -58,17 +107,35 @@ def main():
         print(f"version_finder v{__version__}")
         return 0
 
+    if args.command == "prepare":
+        return prepare_repository(args)
+    if args.command == "daemon":
+        return run_daemon(args)
+    if args.command == "serve":
+        return run_http_server(args)
+
     if args.cli:
-        call_cli_app(args)
+        if args.output_format or args.batch is not None:
+            # Machine-readable output owns stdout, also for the messages logged while the CLI loads
+            from .logger import log_to_stderr
+            log_to_stderr()
+        return call_cli_app(args)
     elif args.gui:
-        call_gui_app(args)
+        return call_gui_app(args)
     else:
         if args.path is None:
             args.path = os.getcwd()
         if args.path and args.branch and args.commit:
+            from .version_finder import VersionFinder, SubmoduleUpdateOptions, GitConfig, VersionPattern
             try:
+                config = GitConfig(background_fetch=args.background_fetch)
+                if args.fetch_ttl:
+                    config.fetch_ttl = int(args.fetch_ttl * 60)
+
                 # Initialize with force parameter
-                vf = VersionFinder(path=args.path, force=args.force)
+                vf = VersionFinder(path=args.path, config=config, force=args.force, use_worktree=args.worktree,
+                                   version_pattern=VersionPattern(args.version_prefix) if args.version_prefix else None,
+                                   first_parent=args.first_parent)
 
                 # Check for uncommitted changes
                 state = vf.get_saved_state()
@@ -78,7 +145,8 @@ def main():
                         print("Operation cancelled by user")
                         return 0
 
-                vf.update_repository(args.branch)
+                vf.update_repository(args.branch, submodule_options=SubmoduleUpdateOptions.from_args(args))
+                report_data_age(vf)
                 version = vf.find_first_version_containing_commit(args.commit, args.submodule)
 
                 if version:
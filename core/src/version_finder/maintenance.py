@@ -0,0 +1,255 @@
+"""
+maintenance.py
+====================================
+Module for preparing a repository for fast history traversal.
+Writes the commit-graph with changed-path Bloom filters (fast path-limited log
+and ancestry checks), a multi-pack-index and reachability bitmaps, and checks
+whether the existing structures are current.
+"""
+from pathlib import Path
+import re
+import struct
+import time
+from typing import Dict, List, Optional, Tuple
+from version_finder.common import DEFAULT_GIT_MAINTENANCE_TIMEOUT
+from version_finder.git_executer import GitCommandExecutor, GitCommandError, get_git_binary
+from version_finder.logger import get_logger
+
+logger = get_logger()
+
+# Minimum git versions of the optional features
+GIT_VERSION_CHANGED_PATHS = (2, 27)
+GIT_VERSION_MIDX_BITMAP = (2, 34)
+
+# Step results reported by RepositoryOptimizer.optimize()
+STEP_WRITTEN = "written"
+STEP_CURRENT = "current"
+STEP_SKIPPED = "skipped"
+
+
+def parse_git_version(version: str) -> Tuple[int, ...]:
+    """
+    Parse the output of `git --version`.
+
+    Args:
+        version: Version string, e.g. "git version 2.39.5"
+
+    Returns:
+        Tuple[int, ...]: The numeric version, e.g. (2, 39, 5). Empty if it can not be parsed.
+    """
+    match = re.search(r"(\d+(?:\.\d+)+)", version)
+    return tuple(int(part) for part in match.group(1).split(".")) if match else ()
+
+
+def _read_chunk_table(data: bytes, table_offset: int, num_chunks: int) -> Dict[bytes, int]:
+    """Read the chunk lookup table shared by the commit-graph and multi-pack-index formats."""
+    chunks = {}
+    for index in range(num_chunks):
+        entry = table_offset + index * 12
+        chunk_id = data[entry:entry + 4]
+        (offset,) = struct.unpack(">Q", data[entry + 4:entry + 12])
+        chunks[chunk_id] = offset
+    return chunks
+
+
+def read_commit_graph(path: Path) -> Optional[Tuple[int, bool]]:
+    """
+    Read the header of a commit-graph file.
+
+    Args:
+        path: The commit-graph file
+
+    Returns:
+        Optional[Tuple[int, bool]]: Number of commits in the file and whether it holds
+        changed-path Bloom filters, or None if the file is missing or invalid
+    """
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    if len(data) < 8 or data[:4] != b"CGPH":
+        return None
+    chunks = _read_chunk_table(data, 8, data[6])
+    fanout = chunks.get(b"OIDF")
+    if fanout is None or len(data) < fanout + 1024:
+        return None
+    (commits,) = struct.unpack(">I", data[fanout + 1020:fanout + 1024])
+    return commits, b"BIDX" in chunks and b"BDAT" in chunks
+
+
+def read_multi_pack_index(path: Path) -> Optional[int]:
+    """
+    Read the header of a multi-pack-index file.
+
+    Args:
+        path: The multi-pack-index file
+
+    Returns:
+        Optional[int]: Number of packs in the index, or None if the file is missing or invalid
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(12)
+    except OSError:
+        return None
+    if len(header) < 12 or header[:4] != b"MIDX":
+        return None
+    (packs,) = struct.unpack(">I", header[8:12])
+    return packs
+
+
+class RepositoryOptimizer:
+    """Check and write the structures that speed up history traversal in one repository."""
+
+    def __init__(self, git: GitCommandExecutor, timeout: float = DEFAULT_GIT_MAINTENANCE_TIMEOUT):
+        """
+        Initialize the optimizer.
+
+        Args:
+            git: Executor bound to the repository to optimize
+            timeout: Seconds each write step may take. Writing the structures of a large
+                repository takes far longer than the timeout of queries.
+        """
+        self._git = git
+        self.timeout = timeout
+        self.git_version = parse_git_version(get_git_binary()[1])
+
+    def __objects_dir(self) -> Path:
+        output = self._git.execute(["rev-parse", "--git-path", "objects"]).decode("utf-8").strip()
+        return (Path(self._git.repository_path) / output).resolve()
+
+    def commit_graph_status(self) -> Dict[str, object]:
+        """
+        Check the commit-graph.
+
+        Returns:
+            Dict[str, object]: "commits" in the graph, "reachable" commits, "bloom_filters"
+            and "current", which is True when the graph covers every reachable commit
+            with Bloom filters
+        """
+        info_dir = self.__objects_dir() / "info"
+        graph_files = [info_dir / "commit-graph"]
+        chain_file = info_dir / "commit-graphs" / "commit-graph-chain"
+        if chain_file.exists():
+            graph_files = [info_dir / "commit-graphs" / f"graph-{line.strip()}.graph"
+                           for line in chain_file.read_text().splitlines() if line.strip()]
+
+        commits, bloom_filters = 0, bool(graph_files)
+        for graph_file in graph_files:
+            info = read_commit_graph(graph_file)
+            if info is None:
+                commits, bloom_filters = 0, False
+                break
+            commits += info[0]
+            bloom_filters = bloom_filters and info[1]
+
+        reachable = int(self._git.execute(["rev-list", "--all", "--count"]).decode("utf-8").strip() or 0)
+        return {
+            "commits": commits,
+            "reachable": reachable,
+            "bloom_filters": bloom_filters,
+            "current": commits >= reachable and bloom_filters,
+        }
+
+    def multi_pack_index_status(self) -> Dict[str, object]:
+        """
+        Check the multi-pack-index and its reachability bitmap.
+
+        Returns:
+            Dict[str, object]: "packs" in the index, "pack_files" on disk, "loose_objects",
+            "bitmap" and "current", which is True when the index covers every pack, has a
+            bitmap and no objects are loose
+        """
+        pack_dir = self.__objects_dir() / "pack"
+        indexed_packs = read_multi_pack_index(pack_dir / "multi-pack-index")
+        pack_files = len(list(pack_dir.glob("*.pack")))
+        bitmap = any(pack_dir.glob("multi-pack-index-*.bitmap"))
+        loose_objects = self.count_loose_objects()
+        return {
+            "packs": indexed_packs or 0,
+            "pack_files": pack_files,
+            "loose_objects": loose_objects,
+            "bitmap": bitmap,
+            "current": indexed_packs == pack_files and pack_files > 0 and bitmap and loose_objects == 0,
+        }
+
+    def count_loose_objects(self) -> int:
+        """Get the number of loose objects."""
+        output = self._git.execute(["count-objects", "-v"]).decode("utf-8")
+        for line in output.splitlines():
+            key, _, value = line.partition(":")
+            if key.strip() == "count":
+                return int(value.strip())
+        return 0
+
+    def optimize(self, force: bool = False) -> Dict[str, str]:
+        """
+        Write the structures that are not current.
+
+        Loose objects are packed first, since bitmaps only cover packed objects.
+
+        Args:
+            force: If True, rewrite the structures even if they are current
+
+        Returns:
+            Dict[str, str]: Result of each step ("written", "current" or "skipped: <reason>")
+
+        Raises:
+            GitCommandError: If writing a structure fails
+        """
+        steps: Dict[str, str] = {}
+
+        commit_graph = self.commit_graph_status()
+        if commit_graph["current"] and not force:
+            steps["commit-graph"] = STEP_CURRENT
+        else:
+            command = ["commit-graph", "write", "--reachable"]
+            if self.git_version >= GIT_VERSION_CHANGED_PATHS:
+                command.append("--changed-paths")
+            self.__run_step(command)
+            steps["commit-graph"] = STEP_WRITTEN
+
+        midx = self.multi_pack_index_status()
+        if midx["current"] and not force:
+            steps["multi-pack-index"] = STEP_CURRENT
+        else:
+            if midx["loose_objects"] or not midx["pack_files"]:
+                self.__run_step(["repack", "-d", "-q"])
+            if self.git_version >= GIT_VERSION_MIDX_BITMAP:
+                self.__run_step(["multi-pack-index", "write", "--bitmap"])
+                steps["multi-pack-index"] = STEP_WRITTEN
+            else:
+                self.__run_step(["multi-pack-index", "write"])
+                steps["multi-pack-index"] = f"{STEP_WRITTEN} (bitmap {STEP_SKIPPED}: git is older than 2.34)"
+        return steps
+
+    def __run_step(self, command: List[str]) -> None:
+        start_time = time.time()
+        try:
+            self._git.execute(command, timeout=self.timeout)
+        except GitCommandError as e:
+            logger.error(f"Failed to run git {' '.join(command)}: {e}")
+            raise
+        logger.info(f"git {' '.join(command)} took {time.time() - start_time:.2f} seconds")
+
+    def time_queries(self, queries: Dict[str, List[str]], repeat: int = 3) -> Dict[str, float]:
+        """
+        Time a set of git commands.
+
+        Args:
+            queries: Name -> git command
+            repeat: Number of runs per command, the fastest one is reported
+
+        Returns:
+            Dict[str, float]: Name -> seconds of the fastest run
+        """
+        timings = {}
+        for name, command in queries.items():
+            best = None
+            for _ in range(repeat):
+                start_time = time.perf_counter()
+                self._git.execute(command, check=False)
+                elapsed = time.perf_counter() - start_time
+                best = elapsed if best is None else min(best, elapsed)
+            timings[name] = best or 0.0
+        return timings
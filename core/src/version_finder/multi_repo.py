@@ -0,0 +1,230 @@
+"""
+multi_repo.py
+====================================
+Module for running the same query across many repositories.
+Each repository is queried in its own process, so the fan-out takes about as long
+as the slowest repository instead of the sum of all of them. Results are streamed
+as repositories finish. Repositories that do not contain the commit are answered
+without initializing a VersionFinder.
+"""
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+import hashlib
+import multiprocessing
+import os
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from version_finder.daemon import to_jsonable
+from version_finder.git_executer import GitCommandExecutor, GitConfig
+from version_finder.logger import get_logger
+from version_finder.version_finder import VersionFinder, VersionPattern
+
+logger = get_logger()
+
+DEFAULT_REPO_TIMEOUT = 300  # seconds
+
+# Queue on which the worker processes report when they start a repository, see _init_worker
+_started_queue: Optional[Any] = None
+
+
+@dataclass
+class RepoResult:
+    """The outcome of a query in one repository."""
+    path: str
+    found: bool = False
+    result: Any = None
+    branch: Optional[str] = None
+    error: Optional[str] = None
+    timed_out: bool = False
+    elapsed: float = 0.0
+
+
+@dataclass
+class _ScanOptions:
+    """Settings shared by the worker processes."""
+    branch: Optional[str]
+    timeout: int
+    cache_dir: Optional[str]
+    first_parent: bool
+    version_prefixes: Optional[List[str]]
+    fetch_ttl: int
+
+
+def _cache_path(cache_dir: str, path: str) -> str:
+    """One cache file per repository, so that parallel workers never write the same file."""
+    digest = hashlib.sha1(os.path.realpath(path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{digest}.json")
+
+
+def _run_query(path: str, options: _ScanOptions, method: str, args: tuple) -> RepoResult:
+    """Run a query in one repository. Executed in a worker process."""
+    start_time = time.time()
+    result = RepoResult(path=path)
+    try:
+        config = GitConfig(timeout=options.timeout, fetch_ttl=options.fetch_ttl,
+                           cache_path=_cache_path(options.cache_dir, path) if options.cache_dir else None)
+        if method == "find_version":
+            # A repository without the commit needs no further work. rev-parse exits with 1
+            # when the commit is missing, and with 128 when the path is not a repository.
+            probe = GitCommandExecutor(path, GitConfig(timeout=options.timeout, cache_size=0))
+            output = probe.execute(["rev-parse", "--verify", "--quiet", f"{args[0]}^{{commit}}"], check=False)
+            if getattr(output, "returncode", 0) == 1:
+                result.elapsed = time.time() - start_time
+                return result
+
+        finder = VersionFinder(path=path, config=config, force=True, use_worktree=True,
+                               version_pattern=VersionPattern(options.version_prefixes)
+                               if options.version_prefixes else None,
+                               first_parent=options.first_parent)
+        branch = options.branch or finder.get_current_branch()
+        if not branch:
+            raise ValueError("No branch given and the repository is in detached HEAD state")
+        finder.update_repository(branch)
+        result.branch = branch
+        result.result = to_jsonable(getattr(finder, method)(*args))
+        result.found = bool(result.result)
+        finder.save_cache()
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.elapsed = time.time() - start_time
+    return result
+
+
+def _init_worker(started_queue: Any) -> None:
+    """Keep the queue start times are reported on. Runs once in each worker process."""
+    global _started_queue
+    _started_queue = started_queue
+
+
+def _run_in_worker(path: str, options: _ScanOptions, method: str, args: tuple) -> RepoResult:
+    """Report the start of a repository to the scanning process, then query it."""
+    if _started_queue is not None:
+        _started_queue.put((path, time.time()))
+    return _run_query(path, options, method, args)
+
+
+class MultiRepoVersionFinder:
+    """Run queries across many repositories in a process pool."""
+
+    def __init__(self, paths: Iterable[str], max_workers: Optional[int] = None,
+                 timeout: int = DEFAULT_REPO_TIMEOUT, cache_dir: Optional[str] = None,
+                 first_parent: bool = False, version_prefixes: Optional[List[str]] = None,
+                 fetch_ttl: int = 0):
+        """
+        Initialize the scanner.
+
+        Args:
+            paths: Repository paths
+            max_workers: Number of repositories queried at once. Defaults to the CPU count.
+            timeout: Seconds a single repository may take. Also bounds each git command.
+            cache_dir: Optional directory of on-disk git command caches, one file per repository,
+                shared by later scans
+            first_parent: Follow only the first parent of merge commits
+            version_prefixes: Optional prefixes marking version commits
+            fetch_ttl: Skip fetching repositories fetched less than this many seconds ago
+        """
+        self.paths = list(dict.fromkeys(os.path.abspath(path) for path in paths))
+        self.max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(self.paths) or 1))
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+        self.first_parent = first_parent
+        self.version_prefixes = version_prefixes
+        self.fetch_ttl = fetch_ttl
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def find_version(self, commit: str, branch: Optional[str] = None,
+                     submodule: Optional[str] = None) -> Iterator[RepoResult]:
+        """
+        Find the first version containing a commit in every repository.
+
+        Args:
+            commit: Commit SHA to look for
+            branch: Branch to search in every repository. Defaults to each repository's current branch.
+            submodule: Optional submodule path the commit belongs to
+
+        Yields:
+            RepoResult: One result per repository, as the repositories finish. `found` is False
+            when the repository does not contain the commit or no version includes it.
+        """
+        return self.__scan(branch, "find_version", (commit, submodule))
+
+    def find_commits_by_text(self, text: str, branch: Optional[str] = None,
+                             submodule: str = '') -> Iterator[RepoResult]:
+        """
+        Find the commits mentioning a text in every repository.
+
+        Args:
+            text: Text to search for
+            branch: Branch to search in every repository. Defaults to each repository's current branch.
+            submodule: Optional submodule path
+
+        Yields:
+            RepoResult: One result per repository, as the repositories finish
+        """
+        return self.__scan(branch, "find_commits_by_text", (text, submodule))
+
+    def __scan(self, branch: Optional[str], method: str, args: tuple) -> Iterator[RepoResult]:
+        options = _ScanOptions(branch=branch, timeout=self.timeout, cache_dir=self.cache_dir,
+                               first_parent=self.first_parent, version_prefixes=self.version_prefixes,
+                               fetch_ttl=self.fetch_ttl)
+        start_time = time.time()
+        # A repository's timeout starts when a worker picks it up, not when it is queued.
+        # The workers report their start times, which the deadlines are computed from.
+        started_queue = multiprocessing.SimpleQueue()
+        executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                       initargs=(started_queue,))
+        timed_out = False
+        futures: Dict[Future, str] = {}
+        try:
+            futures = {
+                executor.submit(_run_in_worker, path, options, method, args): path for path in self.paths}
+            started: Dict[str, float] = {}
+            pending = set(futures)
+            while pending:
+                # A repository that starts while waiting has a deadline after the wait ends,
+                # so waiting up to the earliest known deadline never misses one
+                now = time.time()
+                deadlines = [started[futures[future]] + self.timeout for future in pending
+                             if futures[future] in started]
+                wait_timeout = max(0.0, min(deadlines, default=now + self.timeout) - now)
+                done, pending = wait(pending, timeout=wait_timeout, return_when=FIRST_COMPLETED)
+                while not started_queue.empty():
+                    path, started_at = started_queue.get()
+                    started[path] = started_at
+                for future in done:
+                    try:
+                        yield future.result()
+                    except Exception as e:
+                        yield RepoResult(path=futures[future], error=f"{type(e).__name__}: {e}")
+                now = time.time()
+                for future in list(pending):
+                    path = futures[future]
+                    if path in started and now - started[path] >= self.timeout:
+                        pending.discard(future)
+                        timed_out = True
+                        logger.warning(f"Query in {path} timed out after {self.timeout} seconds")
+                        yield RepoResult(path=path, error=f"Timed out after {self.timeout} seconds",
+                                         timed_out=True, elapsed=now - started[path])
+        finally:
+            # Not shutdown(cancel_futures=True), which needs Python 3.9
+            for future in futures:
+                future.cancel()
+            if timed_out:
+                self.__terminate_workers(executor)
+            executor.shutdown(wait=True)
+        logger.info(f"Queried {len(self.paths)} repositories in {time.time() - start_time:.2f} seconds")
+
+    @staticmethod
+    def __terminate_workers(executor: ProcessPoolExecutor) -> None:
+        """
+        Terminate the worker processes, including those stuck on a timed out repository.
+
+        A stuck worker would otherwise keep running, and the interpreter joins it at exit.
+        The executor has no public API for this, so its process table is used.
+        """
+        for process in list(getattr(executor, "_processes", {}).values()):
+            if process.is_alive():
+                process.terminate()
+        for process in list(getattr(executor, "_processes", {}).values()):
+            process.join()
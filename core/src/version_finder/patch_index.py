@@ -0,0 +1,169 @@
+"""
+patch_index.py
+====================================
+Module for finding patch-equivalent commits.
+Cherry-picks get new SHAs but keep their patch, so commits are indexed by the
+stable patch-id of their diff. Patch-ids are computed in parallel batches with
+`git patch-id --stable` and cached by commit SHA, so every commit is diffed once.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+from version_finder.git_executer import GitCommandExecutor
+from version_finder.log_parser import parse_hashes
+from version_finder.logger import get_logger
+
+logger = get_logger()
+
+# Number of commits diffed by a single git log -p call
+PATCH_ID_BATCH_SIZE = 500
+
+
+class PatchIdIndex:
+    """Map commits to stable patch-ids and patch-ids back to commits."""
+
+    def __init__(self, git: GitCommandExecutor, path: Optional[Path] = None, max_workers: int = 4):
+        """
+        Initialize the index.
+
+        Args:
+            git: Executor bound to the repository
+            path: Optional JSON file the patch-ids are persisted to
+            max_workers: Number of batches diffed in parallel
+        """
+        self._git = git
+        self.path = path
+        self.max_workers = max_workers
+        # Commit SHA -> patch-id, or None for commits without a diff
+        self._patch_ids: Dict[str, Optional[str]] = {}
+        self._commits_by_patch_id: Dict[str, Set[str]] = {}
+        self._branch_commits: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if path:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._patch_ids)
+
+    def __add(self, sha: str, patch_id: Optional[str]) -> None:
+        self._patch_ids[sha] = patch_id
+        if patch_id:
+            self._commits_by_patch_id.setdefault(patch_id, set()).add(sha)
+
+    def load(self) -> None:
+        """Load persisted patch-ids, ignoring a missing or corrupt file."""
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            for sha, patch_id in data.items():
+                self.__add(sha, patch_id or None)
+            logger.debug(f"Loaded {len(self._patch_ids)} patch-ids from {self.path}")
+        except (OSError, ValueError, AttributeError) as e:
+            logger.debug(f"Patch-ids not loaded from {self.path}: {e}")
+
+    def save(self) -> None:
+        """Persist the patch-ids if new ones were computed."""
+        if not self.path or not self._dirty:
+            return
+        try:
+            with self._lock:
+                data = json.dumps({sha: patch_id or "" for sha, patch_id in self._patch_ids.items()},
+                                  separators=(",", ":"))
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            temp_path.write_text(data, encoding="utf-8")
+            os.replace(temp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Failed to save patch-ids to {self.path}: {e}")
+
+    def __compute_batch(self, shas: List[str]) -> Dict[str, Optional[str]]:
+        """Compute the patch-ids of a batch of commits with one log -p and one patch-id call."""
+        diffs = self._git.execute(
+            ["log", "-p", "--no-walk=unsorted", "--stdin", "--no-color", "--no-ext-diff", "--format=commit %H"],
+            input="".join(f"{sha}\n" for sha in shas).encode("utf-8"))
+        output = self._git.execute(["patch-id", "--stable"], input=diffs)
+        result: Dict[str, Optional[str]] = {sha: None for sha in shas}
+        for line in output.decode("ascii", "replace").splitlines():
+            parts = line.split()
+            if len(parts) == 2:
+                result[parts[1]] = parts[0]
+        return result
+
+    def compute(self, shas: Iterable[str]) -> None:
+        """
+        Compute the patch-ids of the commits that are not indexed yet.
+
+        Args:
+            shas: Full commit SHAs
+        """
+        missing = [sha for sha in dict.fromkeys(shas) if sha not in self._patch_ids]
+        if not missing:
+            return
+        start_time = time.time()
+        batches = [missing[i:i + PATCH_ID_BATCH_SIZE] for i in range(0, len(missing), PATCH_ID_BATCH_SIZE)]
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(batches)))) as executor:
+            for result in executor.map(self.__compute_batch, batches):
+                with self._lock:
+                    for sha, patch_id in result.items():
+                        self.__add(sha, patch_id)
+        self._dirty = True
+        logger.info(f"Computed {len(missing)} patch-ids in {time.time() - start_time:.2f} seconds")
+
+    def index_branches(self, tips: Iterable[str]) -> Dict[str, Set[str]]:
+        """
+        Index every non-merge commit reachable from the given branch tips.
+
+        The commits of all branches are listed in parallel, and the patch-ids of the
+        union are computed once.
+
+        Args:
+            tips: Commit SHAs of the branch tips
+
+        Returns:
+            Dict[str, Set[str]]: Tip -> the non-merge commits reachable from it
+        """
+        tips = list(tips)
+        missing_tips = [tip for tip in dict.fromkeys(tips) if tip not in self._branch_commits]
+        if missing_tips:
+            def list_commits(tip: str) -> List[str]:
+                return parse_hashes(self._git.execute(["rev-list", "--no-merges", tip]))
+
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(missing_tips)))) as executor:
+                commit_lists = list(executor.map(list_commits, missing_tips))
+            self.compute(sha for commits in commit_lists for sha in commits)
+            for tip, commits in zip(missing_tips, commit_lists):
+                self._branch_commits[tip] = set(commits)
+        return {tip: self._branch_commits[tip] for tip in tips}
+
+    def get_patch_id(self, sha: str) -> Optional[str]:
+        """
+        Get the stable patch-id of a commit.
+
+        Args:
+            sha: Full commit SHA
+
+        Returns:
+            Optional[str]: The patch-id, or None if the commit has no diff (e.g. a merge)
+        """
+        self.compute([sha])
+        return self._patch_ids.get(sha)
+
+    def equivalents(self, sha: str) -> Set[str]:
+        """
+        Get the indexed commits with the same patch as a commit, including the commit itself.
+
+        Args:
+            sha: Full commit SHA
+
+        Returns:
+            Set[str]: Patch-equivalent commits
+        """
+        patch_id = self.get_patch_id(sha)
+        if patch_id is None:
+            return {sha}
+        return self._commits_by_patch_id.get(patch_id, set()) | {sha}
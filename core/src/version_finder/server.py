@@ -0,0 +1,316 @@
+"""
+server.py
+====================================
+Module for answering version-finder queries over HTTP.
+A lightweight asyncio HTTP/1.1 server exposing the task APIs as JSON endpoints:
+
+    GET  /health
+    GET  /find_version?path=...&branch=...&commit=...[&submodule=...]
+    GET  /find_commits_between_versions?path=...&branch=...&start_version=...&end_version=...
+    GET  /find_commits_by_text?path=...&branch=...&text=...
+
+Parameters may also be sent as a JSON object in a POST body. Queries run in
+read-only worktree mode, one VersionFinder per repository and branch, so
+concurrent requests never touch the user's checkout or each other's. Each
+repository has a bounded worker pool, and identical in-flight requests are
+coalesced into a single query (single-flight).
+"""
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from version_finder.common import (
+    DEFAULT_DAEMON_REFRESH,
+    DEFAULT_SERVER_HOST,
+    DEFAULT_SERVER_PORT,
+    DEFAULT_SERVER_WORKERS,
+)
+from version_finder.daemon import to_jsonable
+from version_finder.git_executer import GitCommandError, GitConfig
+from version_finder.logger import get_logger
+from version_finder.version_finder import GitError, VersionFinder, VersionPattern
+
+logger = get_logger()
+
+# Largest accepted request body
+MAX_BODY_SIZE = 1024 * 1024
+
+# Endpoint -> (required parameters, optional parameters)
+ENDPOINTS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "find_version": (("path", "branch", "commit"), ("submodule",)),
+    "find_commits_between_versions": (("path", "branch", "start_version", "end_version"), ("submodule",)),
+    "find_commits_by_text": (("path", "branch", "text"), ("submodule",)),
+}
+# Parameters selecting the VersionFinder instance rather than the query
+INSTANCE_PARAMS = ("first_parent", "version_prefix")
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    """Raised to answer a request with an error status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class _Slot:
+    """A VersionFinder prepared for one branch, and the queries running on it."""
+
+    def __init__(self):
+        self.finder: Optional[VersionFinder] = None
+        self.updated_at = 0.0
+        self.active = 0
+        # Held while the instance is created or refreshed, new queries wait for it
+        self.refresh_lock = asyncio.Lock()
+        self.idle = asyncio.Event()
+        self.idle.set()
+
+
+class VersionFinderServer:
+    """Asyncio HTTP server answering version-finder queries."""
+
+    def __init__(self, host: str = DEFAULT_SERVER_HOST, port: int = DEFAULT_SERVER_PORT,
+                 workers_per_repo: int = DEFAULT_SERVER_WORKERS,
+                 refresh_interval: float = DEFAULT_DAEMON_REFRESH,
+                 config: Optional[GitConfig] = None):
+        """
+        Initialize the server.
+
+        Args:
+            host: Address to listen on
+            port: Port to listen on, 0 picks a free one
+            workers_per_repo: Queries run concurrently per repository
+            refresh_interval: Seconds after which a branch is updated (and fetched) again
+            config: Configuration of the created VersionFinder instances
+        """
+        if workers_per_repo < 1:
+            raise ValueError("workers_per_repo must be positive")
+        self.host = host
+        self.port = port
+        self.workers_per_repo = workers_per_repo
+        self.refresh_interval = refresh_interval
+        self.config = config or GitConfig(fetch_ttl=int(refresh_interval))
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._pools: Dict[str, ThreadPoolExecutor] = {}
+        self._slots: Dict[Tuple[str, str, bool, Tuple[str, ...]], _Slot] = {}
+        self._repo_locks: Dict[str, asyncio.Lock] = {}
+        self._in_flight: Dict[str, "asyncio.Task[Any]"] = {}
+        self.stats = {"requests": 0, "queries": 0, "coalesced": 0, "errors": 0}
+
+    async def start(self) -> int:
+        """
+        Start listening.
+
+        Returns:
+            int: The bound port
+        """
+        self._server = await asyncio.start_server(self.__handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Server listening on http://{self.host}:{self.port}")
+        return self.port
+
+    async def close(self) -> None:
+        """Stop listening and shut the worker pools down."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for pool in self._pools.values():
+            pool.shutdown(wait=True)
+        self._pools.clear()
+
+    async def serve_forever(self) -> None:
+        """Start the server and answer requests until cancelled."""
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    def __get_pool(self, path: str) -> ThreadPoolExecutor:
+        pool = self._pools.get(path)
+        if pool is None:
+            pool = ThreadPoolExecutor(max_workers=self.workers_per_repo, thread_name_prefix="version-finder")
+            self._pools[path] = pool
+        return pool
+
+    async def __run_in_pool(self, path: str, function, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.__get_pool(path), function, *args)
+
+    async def __prepare(self, slot: _Slot, path: str, branch: str, first_parent: bool,
+                        prefixes: Tuple[str, ...]) -> None:
+        """Create or refresh the instance of a slot once no query runs on it. Called with the refresh lock held."""
+        if slot.finder is not None and time.monotonic() - slot.updated_at <= self.refresh_interval:
+            return
+        await slot.idle.wait()
+        # Fetches and worktree updates of different branches of a repository are serialized
+        async with self._repo_locks.setdefault(path, asyncio.Lock()):
+            if slot.finder is None:
+                slot.finder = await self.__run_in_pool(
+                    path, lambda: VersionFinder(path=path, config=self.config, force=True, use_worktree=True,
+                                                version_pattern=VersionPattern(list(prefixes)) if prefixes else None,
+                                                first_parent=first_parent))
+            await self.__run_in_pool(path, slot.finder.update_repository, branch)
+        slot.updated_at = time.monotonic()
+
+    async def __query(self, endpoint: str, params: Dict[str, Any]) -> Any:
+        path, branch = os.path.realpath(params["path"]), params["branch"]
+        first_parent = params.get("first_parent", False)
+        prefixes = tuple(params.get("version_prefix") or ())
+        slot = self._slots.setdefault((path, branch, first_parent, prefixes), _Slot())
+
+        async with slot.refresh_lock:
+            await self.__prepare(slot, path, branch, first_parent, prefixes)
+            slot.active += 1
+            slot.idle.clear()
+        try:
+            self.stats["queries"] += 1
+            finder = slot.finder
+            submodule = params.get("submodule")
+            if endpoint == "find_version":
+                call = (finder.find_version, params["commit"], submodule or None)
+            elif endpoint == "find_commits_between_versions":
+                call = (finder.find_commits_between_versions, params["start_version"], params["end_version"],
+                        submodule or None)
+            else:
+                call = (finder.find_commits_by_text, params["text"], submodule or '')
+            return to_jsonable(await self.__run_in_pool(path, *call))
+        finally:
+            slot.active -= 1
+            if slot.active == 0:
+                slot.idle.set()
+
+    async def query(self, endpoint: str, params: Dict[str, Any]) -> Any:
+        """
+        Answer a query, sharing the result with identical queries already in flight.
+
+        Args:
+            endpoint: One of ENDPOINTS
+            params: Validated query parameters
+
+        Returns:
+            Any: JSON-serializable result
+        """
+        key = json.dumps([endpoint, params], sort_keys=True)
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            task = asyncio.ensure_future(self.__query(endpoint, params))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # A cancelled client must not cancel the query shared with other clients
+        return await asyncio.shield(task)
+
+    def __parse_params(self, endpoint: str, query: str, body: bytes) -> Dict[str, Any]:
+        """Merge query string and JSON body parameters and validate them."""
+        params: Dict[str, Any] = {}
+        prefixes: List[str] = []
+        for name, value in parse_qsl(query):
+            if name == "version_prefix":
+                prefixes.append(value)
+            else:
+                params[name] = value
+        if prefixes:
+            params["version_prefix"] = prefixes
+        if body:
+            try:
+                data = json.loads(body)
+            except ValueError as e:
+                raise HTTPError(400, f"Invalid JSON body: {e}")
+            if not isinstance(data, dict):
+                raise HTTPError(400, "The JSON body must be an object")
+            params.update(data)
+
+        required, optional = ENDPOINTS[endpoint]
+        missing = [name for name in required if not params.get(name)]
+        if missing:
+            raise HTTPError(400, f"Missing parameters: {', '.join(missing)}")
+        unknown = set(params) - set(required) - set(optional) - set(INSTANCE_PARAMS)
+        if unknown:
+            raise HTTPError(400, f"Unknown parameters: {', '.join(sorted(unknown))}")
+        params["first_parent"] = str(params.get("first_parent", "")).lower() in ("1", "true", "yes")
+        if isinstance(params.get("version_prefix"), str):
+            params["version_prefix"] = [params["version_prefix"]]
+        return params
+
+    async def __handle_request(self, method: str, target: str, body: bytes) -> Tuple[int, Any]:
+        url = urlsplit(target)
+        endpoint = url.path.strip("/")
+        if endpoint == "health":
+            return 200, {"status": "ok", "stats": self.stats}
+        if endpoint not in ENDPOINTS:
+            raise HTTPError(404, f"Unknown endpoint: {url.path}")
+        if method not in ("GET", "POST"):
+            raise HTTPError(405, f"Method not allowed: {method}")
+        params = self.__parse_params(endpoint, url.query, body)
+        try:
+            return 200, {"result": await self.query(endpoint, params)}
+        except (GitError, GitCommandError) as e:
+            raise HTTPError(422, f"{type(e).__name__}: {e}")
+
+    async def __handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        start_time = time.time()
+        status, payload = 500, None
+        request_line = ""
+        try:
+            request_line = (await reader.readline()).decode("latin-1").strip()
+            if not request_line:
+                return
+            self.stats["requests"] += 1
+            parts = request_line.split()
+            if len(parts) != 3:
+                raise HTTPError(400, f"Malformed request line: {request_line}")
+            method, target, _ = parts
+
+            content_length = 0
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                if name.strip().lower() == "content-length":
+                    content_length = int(value.strip() or 0)
+            if content_length > MAX_BODY_SIZE:
+                raise HTTPError(413, "Request body too large")
+            body = await reader.readexactly(content_length) if content_length else b""
+
+            status, payload = await self.__handle_request(method, target, body)
+        except HTTPError as e:
+            status, payload = e.status, {"error": str(e)}
+        except (ValueError, asyncio.IncompleteReadError) as e:
+            status, payload = 400, {"error": f"Malformed request: {e}"}
+        except Exception as e:
+            logger.error(f"Request {request_line} failed: {e}")
+            status, payload = 500, {"error": str(e)}
+        finally:
+            if payload is not None:
+                if status >= 400:
+                    self.stats["errors"] += 1
+                data = json.dumps(payload).encode("utf-8")
+                writer.write(f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                             f"Content-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\n"
+                             f"Connection: close\r\n\r\n".encode("latin-1") + data)
+                logger.info(f"{request_line} -> {status} in {time.time() - start_time:.3f} seconds")
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+            writer.close()
+
+
+def run_server(host: str = DEFAULT_SERVER_HOST, port: int = DEFAULT_SERVER_PORT,
+               workers_per_repo: int = DEFAULT_SERVER_WORKERS) -> None:
+    """Run a VersionFinderServer until interrupted."""
+    server = VersionFinderServer(host, port, workers_per_repo)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
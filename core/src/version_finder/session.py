@@ -0,0 +1,192 @@
+"""
+session.py
+====================================
+Module for persisting repository discovery between runs.
+The branches, submodules, remote status and resolved branch refs found when a
+VersionFinder is created are stored under <git-common-dir>/version_finder/.
+A snapshot is only used while cheap fingerprints of the files these results
+depend on (HEAD, packed-refs, the loose ref directories, config and .gitmodules)
+are unchanged, so a later run can skip the discovery commands.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+from version_finder.common import VERSION_FINDER_GIT_DIR
+from version_finder.completion import find_git_dirs
+from version_finder.logger import get_logger
+
+logger = get_logger()
+
+# Version of the snapshot file layout, snapshots of other versions are ignored
+SESSION_FORMAT = 1
+SESSION_FILE = "session.json"
+
+
+def _stat(path: Path) -> Optional[list]:
+    """Get the modification time and size of a file, None if it does not exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class SessionSnapshot:
+    """Discovery results of a repository, validated by file fingerprints."""
+
+    def __init__(self, worktree: Path, git_dir: Path, common_dir: Path):
+        """
+        Initialize the snapshot of a worktree.
+
+        Args:
+            worktree: Top-level directory of the worktree
+            git_dir: Git directory of the worktree
+            common_dir: Git directory shared by all worktrees of the repository
+        """
+        self.worktree = worktree
+        self.git_dir = git_dir
+        self.common_dir = common_dir
+        self.data_dir = common_dir / VERSION_FINDER_GIT_DIR
+        if git_dir == common_dir:
+            self.path = self.data_dir / SESSION_FILE
+        else:
+            # Linked worktrees have their own HEAD and therefore their own snapshot
+            digest = hashlib.sha1(str(git_dir).encode("utf-8")).hexdigest()[:16]
+            self.path = self.data_dir / f"session-{digest}.json"
+        self._fingerprint: Optional[Dict[str, Any]] = None
+        self._info: Dict[str, Any] = {}
+        self._refs: Dict[str, str] = {}
+        # Whether the refs were unchanged at the last load or validation, see validate_refs
+        self._refs_current = False
+
+    @classmethod
+    def for_repository(cls, repository_path: Union[str, Path]) -> Optional["SessionSnapshot"]:
+        """
+        Get the snapshot of a repository.
+
+        Args:
+            repository_path: Top-level directory of the repository
+
+        Returns:
+            Optional[SessionSnapshot]: The snapshot, or None if the git directory cannot be
+            located without running git (e.g. for a subdirectory of a worktree)
+        """
+        git_dirs = find_git_dirs(Path(repository_path))
+        if git_dirs is None:
+            return None
+        return cls(Path(repository_path), *git_dirs)
+
+    def fingerprint(self) -> Dict[str, Any]:
+        """
+        Get the current fingerprint of the files the discovery results depend on.
+
+        Returns:
+            Dict[str, Any]: The content of HEAD and the modification time and size of the other files
+        """
+        try:
+            head = (self.git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        except OSError:
+            head = None
+        files = {}
+        for path in (self.common_dir / "packed-refs", self.common_dir / "config", self.worktree / ".gitmodules"):
+            files[str(path)] = _stat(path)
+        # Creating, updating or deleting a loose ref changes the mtime of its directory
+        for root in (self.common_dir / "refs" / "heads", self.common_dir / "refs" / "remotes"):
+            for directory, _, _ in os.walk(root):
+                files[directory] = _stat(Path(directory))
+        return {"head": head, "files": files}
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the snapshot if it is still current.
+
+        Returns:
+            Optional[Dict[str, Any]]: The saved discovery results, or None if there is no
+            snapshot or the repository changed since it was saved
+        """
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.debug(f"Session snapshot not loaded from {self.path}: {e}")
+            return None
+        if not isinstance(data, dict) or data.get("format") != SESSION_FORMAT:
+            return None
+        fingerprint = self.fingerprint()
+        if data.get("fingerprint") != fingerprint:
+            logger.debug(f"Session snapshot {self.path} is stale")
+            return None
+        self._fingerprint = fingerprint
+        self._info = data.get("info", {})
+        self._refs = data.get("refs", {})
+        self._refs_current = True
+        logger.debug(f"Loaded session snapshot from {self.path}")
+        return self._info
+
+    def save(self, fingerprint: Dict[str, Any], info: Dict[str, Any]) -> None:
+        """
+        Save discovery results.
+
+        Args:
+            fingerprint: Fingerprint taken before the discovery, so that changes made while
+                discovering invalidate the snapshot
+            info: Discovery results
+        """
+        self._fingerprint = fingerprint
+        self._info = info
+        self._refs = {}
+        self._refs_current = True
+        self.__write()
+
+    def validate_refs(self) -> bool:
+        """
+        Check whether the refs changed since the snapshot was taken.
+
+        The fingerprint walks the ref directories, so it is taken once here (and in load)
+        rather than on every get_ref. Call it again when the refs may have changed, e.g.
+        before resolving the branch of a new task.
+
+        Returns:
+            bool: True if the saved refs are still current
+        """
+        self._refs_current = self._fingerprint is not None and self.fingerprint() == self._fingerprint
+        return self._refs_current
+
+    def get_ref(self, name: str) -> Optional[str]:
+        """
+        Get a resolved branch ref, if the refs were unchanged at the last load or validate_refs.
+
+        Args:
+            name: Branch name
+
+        Returns:
+            Optional[str]: Commit SHA of the branch, or None if unknown or possibly stale
+        """
+        sha = self._refs.get(name)
+        if sha is None or not self._refs_current:
+            return None
+        return sha
+
+    def record_ref(self, name: str, sha: str) -> None:
+        """
+        Save a resolved branch ref.
+
+        Args:
+            name: Branch name
+            sha: Commit SHA the branch resolved to
+        """
+        if self._fingerprint is None or self._refs.get(name) == sha:
+            return
+        self._refs[name] = sha
+        self.__write()
+
+    def __write(self) -> None:
+        data = {"format": SESSION_FORMAT, "fingerprint": self._fingerprint, "info": self._info, "refs": self._refs}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            temp_path.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save session snapshot to {self.path}: {e}")
@@ -7,20 +7,58 @@ It includes classes and functions for handling git operations and version findin
 The module is designed to work with git repositories and provides a user-friendly interface for
 finding and comparing versions.
 """
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 import difflib
+import fnmatch
+import hashlib
+import json
 import os
 import re
+import shutil
+import tempfile
+import threading
 import time
-from typing import List, Optional, Dict, Callable
+import weakref
+from typing import Any, List, Optional, Dict, Callable, Iterable, Iterator, Sequence, Tuple, Union
 from version_finder.git_executer import GitCommandExecutor, GitConfig, GitCommandError
+from version_finder.fetch_planner import FetchPlanner
+from version_finder.log_parser import LogRecord, iter_records, iter_stream_records, log_format, parse_hashes
+from version_finder.version_pattern import DEFAULT_VERSION_PATTERN, VersionPattern
+from version_finder.version_table import VersionEntry, VersionTable, parse_version_key
+from version_finder.changelog import Changelog, build_changelog
+from version_finder.maintenance import RepositoryOptimizer
+from version_finder.patch_index import PatchIdIndex
+from version_finder.session import SessionSnapshot
+from version_finder.completion import has_index, write_index
+from version_finder.watcher import RefWatcher
 from version_finder.logger import get_logger
 from version_finder.common import GIT_CMD_FETCH, GIT_CMD_CHECKOUT, GIT_CMD_SUBMODULE_UPDATE, GIT_CMD_LIST_BRANCHES, GIT_CMD_LIST_SUBMODULES, BRANCH_PATTERN
+from version_finder.common import GIT_CMD_WORKTREE_ADD, GIT_CMD_WORKTREE_PRUNE, VERSION_FINDER_GIT_DIR
+from version_finder.common import COMMIT_FIELDS, DEFAULT_COMMIT_FIELDS, DEFAULT_WATCH_POLL_INTERVAL
 
 # Initialize module logger
 logger = get_logger()
 
+# Format of the records Commit objects are built from
+COMMIT_LOG_FORMAT = log_format("%H", "%s", "%B", "%an", "%at")
+# git pretty format placeholder each commit field is read from, the version is extracted from the message
+COMMIT_FIELD_PLACEHOLDERS = {
+    "sha": "%H",
+    "subject": "%s",
+    "message": "%B",
+    "author": "%an",
+    "timestamp": "%at",
+    "version": "%B",
+}
+# Matches the new submodule pointer in the diff of a gitlink
+SUBPROJECT_COMMIT_PATTERN = re.compile(rb"^\+Subproject commit ([0-9a-f]+)", re.MULTILINE)
+# Worktree directories claimed by live VersionFinder instances of this process. A claimed worktree is
+# reset and queried by its owner only, so finders on the same branch never move each other's checkout.
+_worktree_owners: "weakref.WeakValueDictionary[str, VersionFinder]" = weakref.WeakValueDictionary()
+_worktree_owners_lock = threading.Lock()
+
 
 class GitError(Exception):
     """Base exception for git operations"""
@@ -95,6 +133,121 @@ class Commit:
         return f"{self.sha}    {self.subject}"
 
 
+@dataclass(frozen=True)
+class ResolvedCommit:
+    """
+    A commit whose existence was already validated.
+
+    Passing a handle instead of a revision string through a query's call chain
+    lets every step skip re-validating the same object.
+    """
+    rev: str
+    sha: str
+    submodule: str = ''
+
+    def __str__(self):
+        return self.sha
+
+
+# Kinds of WatchEvent
+WATCH_EVENT_LANDED = "landed"
+WATCH_EVENT_RELEASED = "released"
+WATCH_EVENT_VERSION = "version"
+WATCH_EVENT_RESET = "reset"
+
+
+@dataclass
+class WatchEvent:
+    """A change of a watched branch, reported by VersionFinder.watch."""
+    kind: str
+    branch: str
+    commit: str
+    version: Optional[str] = None
+    subject: str = ""
+
+    def __str__(self):
+        if self.kind == WATCH_EVENT_RELEASED:
+            return f"commit {self.commit[:12]} landed in version {self.version}    {self.subject}"
+        if self.kind == WATCH_EVENT_VERSION:
+            return f"version {self.version} created by commit {self.commit[:12]}    {self.subject}"
+        if self.kind == WATCH_EVENT_RESET:
+            return f"branch {self.branch} was rewritten to {self.commit[:12]}, indices rebuilt"
+        return f"commit {self.commit[:12]} landed on {self.branch}, not in a version yet    {self.subject}"
+
+
+# A commit given either as a revision string or as an already resolved handle
+CommitRef = Union[str, ResolvedCommit]
+
+
+def _sha_of(commit: CommitRef) -> str:
+    """Get the SHA of a resolved commit, or the revision string as is."""
+    return commit.sha if isinstance(commit, ResolvedCommit) else commit
+
+
+def _submodule_durations(trace: str, paths: Sequence[str]) -> Dict[str, float]:
+    """
+    Get the time spent on every submodule from the trace2 events of a submodule update.
+
+    The update runs a child process per submodule clone (submodule--helper clone --path <path>)
+    and per step run inside a submodule (checkout, recursive update), each reporting its duration.
+
+    Args:
+        trace: GIT_TRACE2_EVENT output, one JSON event per line
+        paths: The updated submodule paths
+
+    Returns:
+        Dict[str, float]: Seconds spent on each submodule that git reported
+    """
+    wanted = set(paths)
+    children: Dict[Tuple[str, int], str] = {}
+    durations: Dict[str, float] = {}
+    for line in trace.splitlines():
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        key = (event.get("sid"), event.get("child_id"))
+        if event.get("event") == "child_start":
+            argv = event.get("argv") or []
+            path = event.get("cd")
+            if "submodule--helper" in argv and "clone" in argv and "--path" in argv[:-1]:
+                path = argv[argv.index("--path") + 1]
+            if path in wanted:
+                children[key] = path
+        elif event.get("event") == "child_exit" and key in children:
+            path = children.pop(key)
+            durations[path] = durations.get(path, 0.0) + float(event.get("t_rel") or 0.0)
+    return durations
+
+
+@dataclass
+class SubmoduleUpdateOptions:
+    """Strategy used by update_repository to update submodules."""
+    skip: bool = False
+    paths: Optional[List[str]] = None
+    jobs: int = 1
+    depth: Optional[int] = None
+    filter_spec: Optional[str] = None
+
+    def __post_init__(self):
+        if self.jobs < 1:
+            raise ValueError("jobs must be at least 1")
+        if self.depth is not None and self.depth <= 0:
+            raise ValueError("depth must be positive")
+
+    @classmethod
+    def from_args(cls, args) -> "SubmoduleUpdateOptions":
+        """Build the options from parsed command-line arguments."""
+        submodule = getattr(args, "submodule", None)
+        return cls(
+            skip=getattr(args, "skip_submodule_update", False),
+            paths=[submodule] if submodule else None,
+            jobs=getattr(args, "submodule_jobs", None) or 1,
+            depth=getattr(args, "submodule_depth", None),
+            filter_spec=getattr(args, "submodule_filter", None),
+        )
+
+
 @dataclass
 class VersionFinderTask:
     """A class to represent a VersionFinder task."""
@@ -184,7 +337,7 @@ class VersionFinder:
     branches: List[str]
     _has_remote: bool
 
-    # Consolidated version pattern that handles various formats:
+    # Version commits are described by a VersionPattern, which handles various formats:
     # - Optional prefixes like "Version:", "VERSION:", "Updated version"
     # - Optional "XX_" prefix in the version number
     # - Year formats (e.g., 2023)
@@ -196,15 +349,22 @@ class VersionFinder:
     # - VERSION: XX_2023_01_15
     # - Updated version 4.5-2
     # - 2023.01.15
-    version_pattern = r"(?:(?:Version|VERSION|Updated version)\s*:?\s*|[^a-zA-Z0-9][^0-9\s]*)?(?:XX_)?(\d{1,4}(?:[._-]\d+)+)"
+    version_matcher: VersionPattern = DEFAULT_VERSION_PATTERN
+    version_pattern = DEFAULT_VERSION_PATTERN.regex.pattern
 
-    # Pattern used specifically for git grep searches
-    git_regex_pattern_for_version = "(Version|VERSION|Updated version)(:)? (XX_)?[0-9]+([._-][0-9]+)+"
+    # Pattern used specifically for git grep searches, generated from the same definition
+    git_regex_pattern_for_version = DEFAULT_VERSION_PATTERN.git_pattern
 
     def __init__(self,
                  path: str = '',
                  config: Optional[GitConfig] = None,
-                 force: bool = False) -> None:
+                 force: bool = False,
+                 use_worktree: bool = False,
+                 worktree_dir: Optional[str] = None,
+                 sparse_paths: Optional[List[str]] = None,
+                 version_pattern: Optional[VersionPattern] = None,
+                 first_parent: bool = False,
+                 session: bool = True) -> None:
         """
         Initialize the VersionFinder with a repository path and configuration.
 
@@ -212,10 +372,30 @@ class VersionFinder:
             path: Path to the git repository. Uses current directory if None.
             config: Configuration settings for git operations.
             force: If True, allow initialization even if the repository has uncommitted changes.
+            use_worktree: If True, run queries in a cached detached worktree per branch
+                instead of stashing and checking out branches in the user's working tree.
+            worktree_dir: Directory holding the cached worktrees.
+                Defaults to <git-common-dir>/version_finder/worktrees.
+            sparse_paths: Optional paths to restrict the worktree checkout to (sparse checkout).
+            version_pattern: Definition of version commits. Defaults to DEFAULT_VERSION_PATTERN.
+            first_parent: If True, history walks follow only the first parent of merge commits
+                (the mainline), skipping commits that were merged in from side branches.
+            session: If True, reuse the branches, submodules and refs discovered by an earlier run
+                while the repository's refs, HEAD and .gitmodules are unchanged, instead of
+                running the discovery commands again.
         """
         self.config = config or GitConfig()
         self.repository_path = Path(path or os.getcwd()).resolve()
         self.force = force
+        self.use_worktree = use_worktree
+        self.worktree_dir = Path(worktree_dir).resolve() if worktree_dir else None
+        self.sparse_paths = sparse_paths or []
+        self.worktree_path: Optional[Path] = None
+        self.first_parent = first_parent
+        if version_pattern is not None:
+            self.version_matcher = version_pattern
+            self.version_pattern = version_pattern.regex.pattern
+            self.git_regex_pattern_for_version = version_pattern.git_pattern
 
         # State tracking
         self._initial_state = {
@@ -229,10 +409,27 @@ class VersionFinder:
         except GitCommandError as e:
             logger.error(f"Error initializing git executor: {e}")
             raise GitNotInstalledError(e)
+        # Executor bound to the user's repository. Queries run through self._git,
+        # which points to the cached worktree once one is prepared.
+        self._repo_git = self._git
+        self._fetch_planner = FetchPlanner(self._repo_git, ttl=self.config.fetch_ttl,
+                                           background=self.config.background_fetch)
 
         self.is_task_ready = False
         self.submodules: List[str] = []
         self.branches: List[str] = []
+        self._version_table: Optional[VersionTable] = None
+        self._changelog: Optional[Changelog] = None
+        self._patch_index: Optional[PatchIdIndex] = None
+        # Submodule pointer indices keyed by (repository, submodule path), reset when the branch changes,
+        # and ancestry checks keyed by (repository, ancestor, descendant), which never go stale
+        self._pointer_indices: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+        self._ancestry_cache: Dict[Tuple[str, str, str], bool] = {}
+        self._nested_submodules: Optional[List[str]] = None
+        # Branch and submodule strategy given to the last update_repository call
+        self._task_branch: Optional[str] = None
+        self._submodule_options = SubmoduleUpdateOptions()
+        self._session = SessionSnapshot.for_repository(self.repository_path) if session else None
 
         self.__validate_repository()
         self.__load_repository_info()
@@ -247,37 +444,62 @@ class VersionFinder:
 
     def __validate_repository(self) -> None:
         """Validate the git repository and its state."""
-        try:
-            # Check if directory is a git repository by running git status
-            self._git.execute(["status"])
-        except GitCommandError as e:
-            # Convert GitCommandError to InvalidGitRepository
-            raise InvalidGitRepository(f"Path {self.repository_path} is not a valid git repository: {str(e)}") from e
+        info = self._session.load() if self._session is not None else None
+        if info is not None:
+            # A current snapshot was written for this repository by an earlier run
+            self._has_remote = info["has_remote"]
+        else:
+            try:
+                # Check if directory is a git repository by running git status
+                self._git.execute(["status"])
+            except GitCommandError as e:
+                # Convert GitCommandError to InvalidGitRepository
+                raise InvalidGitRepository(
+                    f"Path {self.repository_path} is not a valid git repository: {str(e)}") from e
 
-        # Store remote status
-        self._has_remote = self.__has_remote()
+            # Store remote status
+            self._has_remote = self.__has_remote()
         logger.debug(f"Repository has remote: {self._has_remote}")
 
         # Check for uncommitted changes
         has_changes = not self.__is_clean_git_repo()
 
-        # Only raise an error if force is False
-        if has_changes and not self.force:
+        # Only raise an error if force is False. In worktree mode the user's tree is never touched.
+        if has_changes and not self.force and not self.use_worktree:
             logger.warning("Repository has uncommitted changes. Use force=True to proceed anyway.")
             raise GitRepositoryNotClean("Repository has uncommitted changes")
 
     def __load_repository_info(self) -> None:
-        """Load repository information including submodules and branches."""
-        if self._has_remote:
-            logger.info(f"Fetching latest changes from remote repository: {self.repository_path}")
-            self.__fetch_repository()
-        self.__load_branches()
-        self.__load_submodules()
-        # If the checked out branch is valid, set it as updated
-        self.updated_branch = self.get_current_branch()
+        """
+        Load repository information including submodules and branches.
 
-        # Save initial repository state
-        self.save_repository_state()
+        Nothing is fetched here, update_repository fetches only the branch a query needs.
+        """
+        info = self._session.load() if self._session is not None else None
+        if info is not None:
+            self.branches = info["branches"]
+            self.submodules = info["submodules"]
+            self.updated_branch = info["current_branch"]
+            logger.debug(f"Loaded repository info from the session snapshot: {self._session.path}")
+            if not has_index(self._session.data_dir, "branch"):
+                write_index(self._session.data_dir, "branch", self.branches)
+                write_index(self._session.data_dir, "submodule", self.submodules)
+        else:
+            fingerprint = self._session.fingerprint() if self._session is not None else None
+            self.__load_branches()
+            self.__load_submodules()
+            # If the checked out branch is valid, set it as updated
+            self.updated_branch = self.get_current_branch()
+            if self._session is not None:
+                self._session.save(fingerprint, {"has_remote": self._has_remote, "branches": self.branches,
+                                                 "submodules": self.submodules,
+                                                 "current_branch": self.updated_branch})
+                write_index(self._session.data_dir, "branch", self.branches)
+                write_index(self._session.data_dir, "submodule", self.submodules)
+
+        # Save initial repository state. Worktree mode never stashes or checks out in the user's tree.
+        if not self.use_worktree:
+            self.save_repository_state()
 
     def __load_submodules(self) -> None:
         """Load git submodules information."""
@@ -289,14 +511,6 @@ class VersionFinder:
             logger.error(f"Failed to load submodules: {e}")
             self.submodules = []
 
-    def __fetch_repository(self) -> None:
-        """Fetch latest changes from remote repository."""
-        try:
-            output = self._git.execute(["fetch", "--all"])
-            logger.debug(f"Fetch output: {output}")
-        except GitCommandError as e:
-            logger.error(f"Failed to fetch repository: {e}")
-
     def __load_branches(self) -> None:
         """Load git branches information."""
         try:
@@ -333,16 +547,12 @@ class VersionFinder:
             Optional[str]: Extracted version or None if no version found
         """
 
-        match = re.search(self.version_pattern, commit_message)
-        if match:
-            logger.debug(f"match.group(0) = {match.group(0)}")
-            return match.group(1)
-        return None
+        return self.version_matcher.extract(commit_message)
 
     def __is_clean_git_repo(self) -> bool:
         """Check if the git repository is clean."""
         try:
-            self._git.execute(["diff", "--quiet", "HEAD"])
+            self._repo_git.execute(["diff", "--quiet", "HEAD"])
             return True
         except GitCommandError:
             return False
@@ -355,6 +565,11 @@ class VersionFinder:
         """Get list of branches."""
         return self.branches
 
+    @property
+    def task_branch(self) -> Optional[str]:
+        """Branch the repository was last updated to for tasks, None before update_repository."""
+        return self._task_branch
+
     def get_commit_info(self, commit_sha: str, submodule: str = '') -> Commit:
         """Get detailed commit information."""
 
@@ -362,31 +577,42 @@ class VersionFinder:
         if not self.is_task_ready:
             raise RepositoryNotTaskReady()
 
-        git_command = ["show", "-s", "--format=%H%x1F%s%x1F%B%x1F%an%x1F%at", commit_sha]
+        git_command = ["show", "-s", f"--format={COMMIT_LOG_FORMAT}", commit_sha]
         if submodule:
             git_command.insert(0, "--git-dir")
             git_command.insert(1, f"{submodule}/.git")
         try:
-            output = self._git.execute(git_command).decode("utf-8").strip()
+            output = self._git.execute(git_command)
         except GitCommandError as e:
             raise InvalidCommitError(f"Failed to get commit info: {e}")
         logger.debug(f"Commit info output: {output}")
-        output = output.split('\x1F')
-        for elemetn in output:
-            logger.debug(f"Element: {elemetn}")
-        logger.debug(f"The length of output is: {len(output)}")
-        sha, subject, message, author, timestamp = output
-        version = self.__extract_version_from_message(message)
-
+        for record in iter_records(output):
+            return self.__commit_from_record(record)
+        raise InvalidCommitError(f"Failed to get commit info: no output for {commit_sha}")
+
+    def __log_command(self, *args: str) -> List[str]:
+        """Build a git log command that honors the first-parent traversal mode."""
+        if self.first_parent:
+            return ["log", "--first-parent", *args]
+        return ["log", *args]
+
+    def __commit_from_record(self, record: LogRecord) -> Commit:
+        """Build a Commit from a record in COMMIT_LOG_FORMAT."""
+        message = record[2]
         return Commit(
-            sha=sha,
-            subject=subject,
+            sha=record[0],
+            subject=record[1],
             message=message,
-            author=author,
-            timestamp=int(timestamp),
-            version=version
+            author=record[3],
+            timestamp=int(record.raw(4)),
+            version=self.__extract_version_from_message(message)
         )
 
+    def __log_commits(self, command: List[str]) -> List[Commit]:
+        """Run a git log command in COMMIT_LOG_FORMAT and build a Commit for every record."""
+        output = self._git.execute(command + [f"--format={COMMIT_LOG_FORMAT}"])
+        return [self.__commit_from_record(record) for record in iter_records(output)]
+
     def get_current_branch(self) -> str:
         """Get the current Git branch name.
 
@@ -402,7 +628,7 @@ class VersionFinder:
         """
         current_branch = None
         try:
-            output = self._git.execute(["rev-parse", "--abbrev-ref", "HEAD"])
+            output = self._repo_git.execute(["rev-parse", "--abbrev-ref", "HEAD"])
             output = output.decode("utf-8").strip()
             logger.debug(f"Current branch output: {output}")
             if output not in ["HEAD"]:
@@ -690,13 +916,15 @@ class VersionFinder:
             logger.error(f"Failed to restore repository state: {e}")
             return False
 
-    def update_repository(self, branch: str, save_state: bool = True) -> None:
+    def update_repository(self, branch: str, save_state: bool = True,
+                          submodule_options: Optional[SubmoduleUpdateOptions] = None) -> None:
         """
         Update the repository to the specified branch.
 
         Args:
             branch: Branch name to checkout
             save_state: Whether to save the current state before updating
+            submodule_options: How to update submodules. Defaults to updating all of them serially.
 
         Raises:
             InvalidBranchError: If the branch is invalid
@@ -705,37 +933,316 @@ class VersionFinder:
         logger.info(f"Updating repository to branch: {branch}")
 
         # Save current state if requested
-        if save_state and not self._state_saved:
+        if save_state and not self._state_saved and not self.use_worktree:
             self.save_repository_state()
 
-        # Fetch latest changes
+        # Fetch latest changes of the branch, unless already fetched in this session
+        if self._has_remote:
+            try:
+                self._fetch_planner.fetch(branch=branch)
+            except GitCommandError as e:
+                # The local refs can still answer the query
+                logger.warning(f"Failed to fetch branch {branch}, using the local refs: {e}")
+            self.__log_data_age()
+
+        # Check if branch exists. The fetch may have brought a branch that was unknown at init.
+        if branch not in self.list_branches() and self._has_remote:
+            self.__load_branches()
+        if branch not in self.list_branches():
+            raise InvalidBranchError(f"Branch '{branch}' not found in repository")
+
+        if self.use_worktree:
+            # The refs may have moved since the snapshot was loaded or the last update
+            if self._session is not None:
+                self._session.validate_refs()
+            self.__prepare_worktree(branch)
+        else:
+            # Checkout branch
+            try:
+                self._git.execute(GIT_CMD_CHECKOUT + [branch])
+            except GitCommandError as e:
+                logger.error(f"Failed to checkout branch {branch}: {e}")
+                raise
+
+        self._submodule_options = submodule_options or SubmoduleUpdateOptions()
+        self.__update_submodules(self._submodule_options)
+
+        # The version table and changelog belong to the previously updated branch
+        self._version_table = None
+        self._changelog = None
+        self._pointer_indices = {}
+        self._nested_submodules = None
+        self._task_branch = branch
+        self.is_task_ready = True
+        logger.info(f"Repository updated to branch: {branch}")
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """
+        Get the hit/miss counters of the git command cache.
+
+        Returns:
+            Dict[str, int]: Cache counters, empty if the cache is disabled
+        """
+        cache = self._repo_git.cache
+        return cache.stats() if cache is not None else {}
+
+    def save_cache(self) -> None:
+        """Persist the git command cache now, if it has a path (it is otherwise saved at exit)."""
+        cache = self._repo_git.cache
+        if cache is not None:
+            cache.save()
+
+    def optimize_repository(self, force: bool = False, benchmark: bool = True,
+                            include_submodules: bool = True) -> Dict[str, object]:
+        """
+        Prepare the repository for fast history traversal.
+
+        Writes the commit-graph with changed-path Bloom filters, a multi-pack-index and
+        reachability bitmaps, unless they are already current. This speeds up path-limited
+        log on submodule paths and ancestry checks.
+
+        Args:
+            force: If True, rewrite the structures even if they are current
+            benchmark: If True, time a standard query set before and after optimizing
+            include_submodules: If True, also optimize the initialized submodules
+
+        Returns:
+            Dict[str, object]: "steps" with the result of each step per repository ("." is the
+            superproject), and with benchmark, "before"/"after" timings in seconds and the "speedup"
+
+        Raises:
+            GitCommandError: If writing a structure fails
+        """
+        queries = self.__get_standard_queries() if benchmark else {}
+        optimizer = RepositoryOptimizer(self._repo_git)
+        report: Dict[str, object] = {}
+        if queries:
+            report["before"] = optimizer.time_queries(queries)
+
+        steps = {".": optimizer.optimize(force=force)}
+        if include_submodules:
+            for submodule in self.submodules:
+                if not (self.repository_path / submodule / ".git").exists():
+                    logger.debug(f"Submodule {submodule} is not initialized, not optimizing it")
+                    continue
+                submodule_git = GitCommandExecutor(self.repository_path / submodule, self.config)
+                steps[submodule] = RepositoryOptimizer(submodule_git).optimize(force=force)
+        report["steps"] = steps
+
+        if queries:
+            report["after"] = optimizer.time_queries(queries)
+            before, after = sum(report["before"].values()), sum(report["after"].values())
+            report["speedup"] = before / after if after else 1.0
+            logger.info(f"Standard queries took {before:.3f}s before and {after:.3f}s after optimizing "
+                        f"({report['speedup']:.1f}x)")
+        return report
+
+    def __get_standard_queries(self) -> Dict[str, List[str]]:
+        """Get the traversal-heavy git commands that version finding relies on."""
+        queries = {
+            "count commits": ["rev-list", "--count", "HEAD"],
+            "version log": self.__log_command(
+                f"--grep={self.git_regex_pattern_for_version}", "--extended-regexp", "--format=%H"),
+        }
         try:
-            self._git.execute(GIT_CMD_FETCH)
-        except GitCommandError as e:
-            logger.error(f"Failed to fetch: {e}")
-            raise
+            roots = parse_hashes(self._repo_git.execute(["rev-list", "--max-parents=0", "HEAD"]))
+        except GitCommandError:
+            roots = []
+        if roots:
+            queries["ancestry check"] = ["merge-base", "--is-ancestor", roots[0], "HEAD"]
+        for submodule in self.submodules:
+            queries[f"submodule pointer log {submodule}"] = self.__log_command("--format=%H", "--", submodule)
+        return queries
+
+    def get_data_age(self) -> Optional[float]:
+        """
+        Get how stale the remote data used by queries is.
 
-        # Check if branch exists
-        branches = self.list_branches()
-        if branch not in branches:
-            raise InvalidBranchError(f"Branch '{branch}' not found in repository")
+        Returns:
+            Optional[float]: Seconds since the last fetch, or None if the repository was never fetched
+        """
+        return self._fetch_planner.get_data_age()
+
+    def is_fetch_running(self) -> bool:
+        """Check whether a background fetch is in progress, in which case queries use the current refs."""
+        return self._fetch_planner.is_running()
+
+    def __log_data_age(self) -> None:
+        """Report the staleness of the remote data through the logger."""
+        if self.is_fetch_running():
+            logger.info("Background fetch in progress, queries use the current refs")
+        age = self.get_data_age()
+        if age is not None:
+            logger.info(f"Remote data was fetched {age / 60:.1f} minutes ago")
+
+    def __update_submodules(self, options: SubmoduleUpdateOptions) -> None:
+        """
+        Update submodules according to the given strategy.
+
+        The submodules are updated by a single git command, which runs up to
+        options.jobs clones in parallel. The time spent on each submodule is read
+        from git's trace2 events of that command.
 
-        # Checkout branch
+        Args:
+            options: Submodule update strategy
+
+        Raises:
+            InvalidSubmoduleError: If a requested submodule path is unknown
+        """
+        if options.skip:
+            logger.info("Skipping submodule update")
+            return
+
+        if options.paths:
+            for path in options.paths:
+                if path not in self.submodules:
+                    raise InvalidSubmoduleError(f"Invalid submodule path: {path}")
+            paths = options.paths
+        else:
+            # The checked out branch may define different submodules than the initially loaded ones
+            try:
+                output = self._git.execute(GIT_CMD_LIST_SUBMODULES)
+                paths = [line.split()[1] for line in output.decode("utf-8").splitlines()]
+            except GitCommandError as e:
+                logger.warning(f"Failed to list submodules: {e}")
+                return
+        if not paths:
+            return
+
+        update_command = list(GIT_CMD_SUBMODULE_UPDATE) + ["--jobs", str(options.jobs)]
+        if options.depth:
+            update_command += ["--depth", str(options.depth)]
+        if options.filter_spec:
+            update_command.append(f"--filter={options.filter_spec}")
+
+        # A single command, git clones up to jobs submodules at once and
+        # registers them in the superproject config one at a time
+        trace_fd, trace_path = tempfile.mkstemp(prefix="version_finder_trace2_")
+        os.close(trace_fd)
+        start_time = time.time()
         try:
-            self._git.execute(GIT_CMD_CHECKOUT + [branch])
+            output = self._git.execute(update_command + ["--"] + paths, env={"GIT_TRACE2_EVENT": trace_path})
+            trace = Path(trace_path).read_text(encoding="utf-8", errors="replace")
         except GitCommandError as e:
-            logger.error(f"Failed to checkout branch {branch}: {e}")
-            raise
+            # Continue anyway, as this might not be critical
+            logger.warning(f"Failed to update submodules: {e}")
+            return
+        finally:
+            os.unlink(trace_path)
+        for line in output.decode("utf-8", "replace").splitlines():
+            logger.debug(line)
+        for path, duration in _submodule_durations(trace, paths).items():
+            logger.info(f"Updated submodule {path} in {duration:.2f} seconds")
+        logger.info(f"Updated {len(paths)} submodules in {time.time() - start_time:.2f} seconds "
+                    f"using {options.jobs} jobs")
+
+    def __resolve_branch_commit(self, branch: str) -> str:
+        """Resolve a branch name (local or origin remote-tracking) to a commit SHA."""
+        if self._session is not None:
+            sha = self._session.get_ref(branch)
+            if sha:
+                return sha
+        for ref in (branch, f"origin/{branch}"):
+            try:
+                output = self._repo_git.execute(["rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"])
+            except GitCommandError:
+                continue
+            sha = output.decode("utf-8").strip()
+            if self._session is not None:
+                self._session.record_ref(branch, sha)
+            return sha
+        raise InvalidBranchError(f"Branch '{branch}' could not be resolved to a commit")
+
+    def __get_data_dir(self) -> Path:
+        """Get the directory inside the git directory that holds version_finder's data."""
+        if self._session is not None:
+            return self._session.data_dir
+        git_common_dir = self._repo_git.execute(["rev-parse", "--git-common-dir"]).decode("utf-8").strip()
+        return (self.repository_path / git_common_dir).resolve() / VERSION_FINDER_GIT_DIR
+
+    def __get_worktree_root(self) -> Path:
+        """Get the directory that holds the cached worktrees."""
+        if self.worktree_dir:
+            return self.worktree_dir
+        return self.__get_data_dir() / "worktrees"
+
+    def __claim_worktree_path(self, branch: str) -> Path:
+        """
+        Get the worktree directory for the branch, owned by this instance.
+
+        The directory name is made of the branch and the repository, so that repositories sharing a
+        worktree_dir do not collide. A directory that another live instance owns (a server slot or a
+        daemon entry on the same branch) is skipped for the next free numbered one, and the directory
+        this instance owned for its previous branch is released.
+
+        Args:
+            branch: Branch name to get the worktree directory for
+
+        Returns:
+            Path: The worktree directory
+        """
+        repo_key = hashlib.sha1(str(self.repository_path).encode("utf-8")).hexdigest()[:8]
+        base_name = f"{re.sub(r'[^A-Za-z0-9._-]', '_', branch)}-{repo_key}"
+        root = self.__get_worktree_root()
+        with _worktree_owners_lock:
+            if self.worktree_path is not None and _worktree_owners.get(str(self.worktree_path)) is self:
+                del _worktree_owners[str(self.worktree_path)]
+            slot = 1
+            while True:
+                worktree_path = root / (base_name if slot == 1 else f"{base_name}-{slot}")
+                owner = _worktree_owners.get(str(worktree_path))
+                if owner is None or owner is self:
+                    _worktree_owners[str(worktree_path)] = self
+                    return worktree_path
+                slot += 1
+
+    def __prepare_worktree(self, branch: str, target_commit: Optional[str] = None) -> None:
+        """
+        Prepare a cached detached worktree for the branch and point queries at it.
+
+        A warm worktree that is already at the branch tip is reused without any checkout.
+        Every instance works in a worktree it owns, see __claim_worktree_path.
+
+        Args:
+            branch: Branch name to prepare the worktree for
+            target_commit: Commit to check out. Defaults to the tip of the branch.
+        """
+        target_commit = target_commit or self.__resolve_branch_commit(branch)
+        worktree_path = self.__claim_worktree_path(branch)
+        worktree_git = GitCommandExecutor(worktree_path, self.config, cache=self._repo_git.cache)
+
+        if (worktree_path / ".git").exists():
+            try:
+                head = worktree_git.execute(["rev-parse", "HEAD"]).decode("utf-8").strip()
+                if head == target_commit:
+                    logger.info(f"Reusing warm worktree for branch {branch}: {worktree_path}")
+                else:
+                    worktree_git.execute(["reset", "-q", "--hard", target_commit])
+                    logger.info(f"Moved worktree for branch {branch} to {target_commit}")
+                self._git = worktree_git
+                self.worktree_path = worktree_path
+                return
+            except GitCommandError as e:
+                logger.warning(f"Cached worktree {worktree_path} is unusable, recreating it: {e}")
+
+        # Remove stale leftovers before creating the worktree from scratch
+        if worktree_path.exists():
+            shutil.rmtree(worktree_path, ignore_errors=True)
+        self._repo_git.execute(GIT_CMD_WORKTREE_PRUNE)
+        worktree_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Update submodules
         try:
-            self._git.execute(GIT_CMD_SUBMODULE_UPDATE)
+            self._repo_git.execute(GIT_CMD_WORKTREE_ADD + ["--no-checkout", str(worktree_path), target_commit])
+            if self.sparse_paths:
+                worktree_git.execute(["sparse-checkout", "set"] + self.sparse_paths)
+            worktree_git.execute(["reset", "-q", "--hard", target_commit])
         except GitCommandError as e:
-            logger.warning(f"Failed to update submodules: {e}")
-            # Continue anyway, as this might not be critical
+            logger.error(f"Failed to prepare worktree for branch {branch}: {e}")
+            raise
 
-        self.is_task_ready = True
-        logger.info(f"Repository updated to branch: {branch}")
+        logger.info(f"Created worktree for branch {branch}: {worktree_path}")
+        self._git = worktree_git
+        self.worktree_path = worktree_path
 
     def find_commits_by_text(self, text: str, submodule: str = '') -> List[Commit]:
         """
@@ -755,43 +1262,105 @@ class VersionFinder:
             raise RepositoryNotTaskReady()
 
         try:
-            command = [
-                "log",
-                "--format=%H%x1F%s%x1F%b"
-            ]
-
-            if submodule:
-                # Verify submodule exists
-                if submodule not in self.submodules:
-                    raise InvalidSubmoduleError(f"Invalid submodule path: {submodule}")
-                # Execute command in submodule directory
-                command.insert(0, "-C")
-                command.insert(1, submodule)
+            # The body is a separate field so that matches are checked against subject and body only
+            command = self.__text_log_command(submodule)
+            command.append(f"--format={log_format('%H', '%s', '%B', '%an', '%at', '%b')}")
 
             output = self._git.execute(command)
-            commits = output.decode("utf-8").strip().split("\n")
+            text = text.lower()
             matching_commits = []
 
-            for commit in commits:
-                if not commit:  # Skip empty lines
-                    continue
-                # Split the commit info using the ASCII delimiter
-                commit_parts = commit.split("\x1F")
-                if len(commit_parts) >= 2:  # Only require hash and subject
-                    commit_hash = commit_parts[0]
-                    subject = commit_parts[1]
-                    body = commit_parts[2] if len(commit_parts) >= 3 else ""
-                    # Search in both subject and body
-                    if (text.lower() in subject.lower() or
-                            text.lower() in body.lower()):
-                        matching_commits.append(commit_hash)
-
-            return [self.get_commit_info(commit_sha, submodule=submodule) for commit_sha in matching_commits]
+            for record in iter_records(output):
+                # Search in both subject and body
+                if text in record[1].lower() or text in record.get(5).lower():
+                    matching_commits.append(self.__commit_from_record(record))
+
+            return matching_commits
+        except GitCommandError as e:
+            logger.error(f"Failed to find commits by text: {e}")
+            raise
+
+    def iter_commits_by_text(self, text: str, submodule: str = '',
+                             fields: Sequence[str] = DEFAULT_COMMIT_FIELDS) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the commits in the specified branch that contain the given text in either title or description.
+
+        Args:
+            text: Text to search for in commit messages (title and description).
+            submodule: Optional submodule path to search in.
+            fields: Fields of every commit, out of COMMIT_FIELDS. Only these are read from git.
+
+        Yields:
+            Dict[str, Any]: The selected fields of every matching commit, as soon as git reports it
+
+        Raises:
+            GitCommandError: If the git command fails.
+        """
+        if not self.is_task_ready:
+            raise RepositoryNotTaskReady()
+        text = text.lower()
+
+        def matches(record: LogRecord, first_field: int) -> bool:
+            return text in record[first_field].lower() or text in record.get(first_field + 1).lower()
+
+        try:
+            yield from self.__iter_commit_rows(self.__text_log_command(submodule), fields, ("%s", "%b"), matches)
         except GitCommandError as e:
             logger.error(f"Failed to find commits by text: {e}")
             raise
 
-    def get_commit_surrounding_versions(self, commit_sha: str) -> List[Optional[str]]:
+    def __text_log_command(self, submodule: str) -> List[str]:
+        """Build the git log command searched by text, in the submodule if given."""
+        command = self.__log_command()
+        if submodule:
+            # Verify submodule exists
+            if submodule not in self.submodules and submodule not in self.__list_nested_submodules():
+                raise InvalidSubmoduleError(f"Invalid submodule path: {submodule}")
+            # Execute command in submodule directory
+            command.insert(0, "-C")
+            command.insert(1, submodule)
+        return command
+
+    def __iter_commit_rows(self, command: List[str], fields: Sequence[str], filter_placeholders: Tuple[str, ...] = (),
+                           record_filter: Optional[Callable[[LogRecord, int], bool]] = None,
+                           input: Optional[bytes] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a git log command, reading only the placeholders the selected fields need.
+
+        Args:
+            command: git log command without a format
+            fields: Fields of every commit, out of COMMIT_FIELDS
+            filter_placeholders: Placeholders appended to every record for record_filter
+            record_filter: Called with each record and the index of the first filter placeholder,
+                records it rejects are skipped
+            input: Optional bytes written to the standard input of git, e.g. the commits of log --stdin
+
+        Yields:
+            Dict[str, Any]: The selected fields of every commit
+        """
+        unknown = [field for field in fields if field not in COMMIT_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown commit fields: {', '.join(unknown)}")
+        placeholders = list(dict.fromkeys(COMMIT_FIELD_PLACEHOLDERS[field] for field in fields))
+        indices = {field: placeholders.index(COMMIT_FIELD_PLACEHOLDERS[field]) for field in fields}
+        first_filter_field = len(placeholders)
+        placeholders.extend(filter_placeholders)
+
+        stream = self._git.stream(command + [f"--format={log_format(*placeholders)}"], input=input)
+        for record in iter_stream_records(stream):
+            if record_filter is not None and not record_filter(record, first_filter_field):
+                continue
+            row = {}
+            for field in fields:
+                if field == "timestamp":
+                    row[field] = int(record.raw(indices[field]))
+                elif field == "version":
+                    row[field] = self.__extract_version_from_message(record[indices[field]])
+                else:
+                    row[field] = record[indices[field]]
+            yield row
+
+    def get_commit_surrounding_versions(self, commit_sha: CommitRef) -> List[Optional[str]]:
         """
         Find the nearest version commits before and after the given commit.
 
@@ -804,27 +1373,26 @@ class VersionFinder:
         try:
             if not self.has_commit(commit_sha):
                 raise GitCommandError(f"Commit {commit_sha} does not exist")
+            commit_sha = _sha_of(commit_sha)
             # Find nearest version commits using grep
-            prev_version = self._git.execute([
-                "log",
+            prev_version = self._git.execute(self.__log_command(
                 f"--grep={self.git_regex_pattern_for_version}",
                 "--extended-regexp",
                 "--format=%H",
                 "-n", "1",
                 f"{commit_sha}~1"
-            ]).decode("utf-8").strip() or None
+            )).decode("utf-8").strip() or None
 
             # Add validation for empty output
             if not prev_version:
                 logger.debug("No previous version found")
 
-            next_version_output = self._git.execute([
-                "log",
+            next_version_output = self._git.execute(self.__log_command(
                 f"--grep={self.git_regex_pattern_for_version}",
                 "--extended-regexp",
                 "--format=%H",
                 f"{commit_sha}^1..HEAD"
-            ]).decode("utf-8").strip()
+            )).decode("utf-8").strip()
 
             # Add validation for empty output
             next_version = next_version_output.split()[-1] if next_version_output else None
@@ -867,7 +1435,66 @@ class VersionFinder:
         except GitCommandError as e:
             raise GitCommandError(f"Failed to get version for commit {commit_sha}: {e}") from e
 
-    def has_commit(self, commit_sha: str) -> bool:
+    def resolve_many(self, revs: Iterable[str], submodule: str = '') -> Dict[str, Optional[str]]:
+        """
+        Resolve many revisions to commit SHAs using a single git call.
+
+        Args:
+            revs: Revisions to resolve (SHAs, short SHAs, branches, relative revisions like HEAD~1)
+            submodule: Optional submodule path to resolve the revisions in
+
+        Returns:
+            Dict[str, Optional[str]]: Mapping from each revision to its commit SHA, or None if it
+            does not name a commit
+        """
+        revs = list(dict.fromkeys(revs))
+        result: Dict[str, Optional[str]] = {rev: None for rev in revs}
+        # The batch protocol is line based, revisions with whitespace can not name a commit
+        valid_revs = [rev for rev in revs if rev and not any(c.isspace() for c in rev)]
+        if not valid_revs:
+            return result
+
+        command = ["cat-file", "--batch-check=%(objectname) %(objecttype)"]
+        if submodule:
+            command = ["-C", submodule] + command
+        batch_input = "".join(f"{rev}^{{commit}}\n" for rev in valid_revs).encode("utf-8")
+        try:
+            output = self._git.execute(command, input=batch_input).decode("utf-8")
+        except GitCommandError as e:
+            logger.error(f"Failed to resolve revisions: {e}")
+            return result
+
+        for rev, line in zip(valid_revs, output.splitlines()):
+            parts = line.split()
+            if len(parts) == 2 and parts[1] == "commit":
+                result[rev] = parts[0]
+        logger.debug(f"Resolved revisions: {result}")
+        return result
+
+    def resolve_commit(self, commit: CommitRef, submodule: str = '') -> ResolvedCommit:
+        """
+        Resolve a revision to a commit handle that carries its validation through a query.
+
+        Args:
+            commit: Revision or already resolved commit
+            submodule: Optional submodule path the commit belongs to
+
+        Returns:
+            ResolvedCommit: The resolved commit
+
+        Raises:
+            InvalidCommitError: If the revision does not name a commit
+        """
+        if isinstance(commit, ResolvedCommit) and commit.submodule == submodule:
+            return commit
+        rev = _sha_of(commit)
+        sha = self.resolve_many([rev], submodule=submodule)[rev]
+        if sha is None:
+            location = f"submodule {submodule}" if submodule else f"the repository: {self.repository_path}"
+            raise InvalidCommitError(f"Commit {rev} does not exist in {location}")
+        return ResolvedCommit(rev=rev, sha=sha, submodule=submodule)
+
+    def has_commit(self, commit_sha: CommitRef) -> bool:
         """
         Check if a commit exists in the repository.
 
@@ -877,6 +1504,9 @@ class VersionFinder:
         Returns:
             bool: True if the commit exists, False otherwise.
         """
+        if isinstance(commit_sha, ResolvedCommit) and not commit_sha.submodule:
+            return True
+        commit_sha = _sha_of(commit_sha)
         try:
             # -e flag just checks for existence, -t type check is also good
             self._git.execute(["cat-file", "-e", commit_sha])
@@ -884,7 +1514,7 @@ class VersionFinder:
         except GitCommandError:
             return False
 
-    def submodule_has_commit(self, submodule_path: str, commit_sha: str) -> bool:
+    def submodule_has_commit(self, submodule_path: str, commit_sha: CommitRef) -> bool:
         """
         Check if a commit exists in a submodule.
 
@@ -895,6 +1525,9 @@ class VersionFinder:
         Returns:
             bool: True if the commit exists in the submodule, False otherwise.
         """
+        if isinstance(commit_sha, ResolvedCommit) and commit_sha.submodule == submodule_path:
+            return True
+        commit_sha = _sha_of(commit_sha)
         try:
             # Check if the commit exists in the submodule
             self._git.execute(["-C", submodule_path, "cat-file", "-e", commit_sha])
@@ -904,61 +1537,159 @@ class VersionFinder:
             return False
 
     def get_first_commit_including_submodule_changes(
-            self, submodule_path: str, submodule_target_commit: str) -> str:
+            self, submodule_path: str, submodule_target_commit: CommitRef) -> str:
         """
         Get the first commit that includes changes in the specified submodule.
+
+        Nested submodules (e.g. "platform/vendor/lib") are resolved level by level: the
+        commit is mapped to the first commit of its parent repository whose pointer
+        includes it, up to the superproject. The pointer index of every level is built
+        once, concurrently, and reused by later queries.
+
+        Args:
+            submodule_path: Path of the submodule relative to the superproject
+            submodule_target_commit: The commit in the submodule
+
+        Returns:
+            str: SHA of the first superproject commit that includes the submodule commit
+
+        Raises:
+            GitCommandError: If the submodule path is invalid, the commit does not exist in it,
+                or a level has no commits changing its submodule pointer
         """
         if not self.is_task_ready:
             raise RepositoryNotTaskReady()
 
         # Verify submodule path exists
-        if submodule_path not in self.submodules:
+        chain = self.__get_submodule_chain(submodule_path)
+        if chain is None:
             raise GitCommandError(f"Invalid submodule path: {submodule_path}")
 
         # Verify commit exists in submodule
         if not self.submodule_has_commit(submodule_path, submodule_target_commit):
             raise GitCommandError(f"Commit {submodule_target_commit} does not exist in submodule {submodule_path}")
+        target_commit = _sha_of(submodule_target_commit)
+
+        # Each level is (parent repository, submodule path relative to it), outermost first
+        levels = [(chain[index - 1], path[len(chain[index - 1]) + 1:]) if index else ('', path)
+                  for index, path in enumerate(chain)]
+
+        # The pointer indices do not depend on each other, so all levels are scanned at once
+        with ThreadPoolExecutor(max_workers=len(levels)) as executor:
+            indices = list(executor.map(lambda level: self.__get_pointer_index(*level), levels))
+
+        # Walk up from the innermost level, the commit found in a parent is the target of the next level
+        for (repository, submodule), index in reversed(list(zip(levels, indices))):
+            target_commit = self.__find_first_pointer_including(repository, submodule, index, target_commit)
+        logger.debug(f"First commit that includes submodule change: {target_commit}")
+        return target_commit
+
+    def __get_submodule_chain(self, submodule_path: str) -> Optional[List[str]]:
+        """
+        Get the submodules from the superproject down to a submodule.
+
+        Args:
+            submodule_path: Path of the submodule relative to the superproject
+
+        Returns:
+            Optional[List[str]]: Superproject-relative paths, outermost first, e.g.
+            ["platform", "platform/vendor/lib"], or None if the path is not a submodule
+        """
+        if submodule_path in self.submodules:
+            return [submodule_path]
+        nested = self.__list_nested_submodules()
+        if submodule_path not in nested:
+            return None
+        return [path for path in nested if submodule_path.startswith(path + "/")] + [submodule_path]
+
+    def __list_nested_submodules(self) -> List[str]:
+        """Get the initialized submodules at every level, sorted so that parents come first."""
+        if self._nested_submodules is None:
+            try:
+                output = self._git.execute(["submodule", "status", "--recursive"])
+                paths = [line.split()[1] for line in output.decode("utf-8").splitlines() if line.strip()]
+            except GitCommandError as e:
+                logger.warning(f"Failed to list nested submodules: {e}")
+                paths = []
+            self._nested_submodules = sorted(paths, key=lambda path: (path.count("/"), path))
+        return self._nested_submodules
+
+    def __get_pointer_index(self, repository: str, submodule_path: str) -> List[Tuple[str, str]]:
+        """
+        Get the commits of a repository that change a submodule pointer.
+
+        Args:
+            repository: Path of the repository relative to the superproject, '' for the superproject
+            submodule_path: Path of the submodule relative to the repository
 
-        def parse_git_log_output(git_log_output):
-            repo_commit_sha = None
-            tuples = []
-            for line in git_log_output.splitlines():
-                # Detect commit lines
-                if line.startswith("Commit: "):
-                    repo_commit_sha = line.split()[1]
-                # Detect submodule commit change lines
-                match = re.match(r"^\+Subproject commit (\w+)", line)
-                if match and repo_commit_sha:
-                    submodule_commit_sha = match.group(1)
-                    tuples.append((repo_commit_sha, submodule_commit_sha))
-                    repo_commit_sha = None  # Reset to avoid duplication
-            return tuples
-
-        git_log_output = self.__get_commits_changing_submodule_pointers_and_the_new_pointer(submodule_path, 1500)
-        if not git_log_output:
+        Returns:
+            List[Tuple[str, str]]: (commit, new submodule pointer) tuples, newest first
+
+        Raises:
+            GitCommandError: If no commit changes the submodule pointer
+        """
+        key = (repository, submodule_path)
+        index = self._pointer_indices.get(key)
+        if index is not None:
+            return index
+
+        index = self.__parse_pointer_changes(self.__get_commits_changing_submodule_pointers_and_the_new_pointer(
+            submodule_path, 1500, repository))
+        if not index:
             raise GitCommandError(f"No commits found that change submodule {submodule_path} or its ancestors")
-        # Parse the git log output
-        repo_commot_submodule_ptr_tuples = parse_git_log_output(git_log_output)
-        logger.debug(
-            f"Found {len(repo_commot_submodule_ptr_tuples)} commits that change submodule {submodule_path}")
-        logger.debug(f"First commit: {repo_commot_submodule_ptr_tuples[0][0]}")
-        logger.debug(f"Last commit: {repo_commot_submodule_ptr_tuples[-1][0]}")
-
-        # Apply binary search to find the first commit that points to an ancestor of the target commit
-        left, right = 0, len(repo_commot_submodule_ptr_tuples) - 1
+        logger.debug(f"Found {len(index)} commits that change submodule {submodule_path}")
+        logger.debug(f"First commit: {index[0][0]}")
+        logger.debug(f"Last commit: {index[-1][0]}")
+        self._pointer_indices[key] = index
+        return index
+
+    def __parse_pointer_changes(self, git_log_output: bytes) -> List[Tuple[str, str]]:
+        """Get the (commit, new submodule pointer) tuples of a pointer change log."""
+        changes = []
+        for record in iter_records(git_log_output):
+            # The second field holds the diff, only the new submodule pointer is decoded
+            match = SUBPROJECT_COMMIT_PATTERN.search(record.raw(1)) if len(record) > 1 else None
+            if match:
+                changes.append((record[0], match.group(1).decode("ascii")))
+        return changes
+
+    def __is_ancestor_or_equal(self, repository: str, ancestor: str, descendant: str) -> bool:
+        """Check if a commit is reachable from another one, caching the result per repository."""
+        if ancestor == descendant:
+            return True
+        key = (repository, ancestor, descendant)
+        result = self._ancestry_cache.get(key)
+        if result is None:
+            command = ["merge-base", "--is-ancestor", ancestor, descendant]
+            if repository:
+                command = ["-C", repository] + command
+            result = self._git.execute(command, check=False) == b''
+            self._ancestry_cache[key] = result
+        return result
+
+    def __find_first_pointer_including(self, repository: str, submodule_path: str,
+                                       index: List[Tuple[str, str]], target_commit: str) -> str:
+        """
+        Binary search a pointer index for the first commit whose submodule pointer includes a commit.
+
+        Args:
+            repository: Path of the repository relative to the superproject, '' for the superproject
+            submodule_path: Path of the submodule relative to the repository
+            index: The pointer index of the submodule, newest first
+            target_commit: Commit SHA in the submodule
+
+        Returns:
+            str: SHA of the commit in the repository
+        """
+        submodule_repository = os.path.join(repository, submodule_path) if repository else submodule_path
+        left, right = 0, len(index) - 1
         while left <= right:
             mid = (left + right) // 2
-            submodule_ptr = repo_commot_submodule_ptr_tuples[mid][1]
+            submodule_ptr = index[mid][1]
             logger.debug(f"Binary search - Left: {left}, Right: {right}, Mid: {mid}")
-            logger.debug(f"Checking if {submodule_target_commit} is ancestor of {submodule_ptr}")
-
-            is_ancestor = self._git.execute(
-                ["-C", submodule_path, "merge-base", "--is-ancestor", submodule_target_commit, submodule_ptr],
-                check=False) == b''
-            logger.debug(f"Is ancestor: {is_ancestor}")
-            is_equal = submodule_target_commit == submodule_ptr
-            logger.debug(f"Is equal: {is_equal}")
-            is_ancestor_or_equal = is_ancestor or is_equal
+            logger.debug(f"Checking if {target_commit} is ancestor of {submodule_ptr}")
+
+            is_ancestor_or_equal = self.__is_ancestor_or_equal(submodule_repository, target_commit, submodule_ptr)
             logger.debug(f"Is ancestor or equal result: {is_ancestor_or_equal}")
 
             if is_ancestor_or_equal:
@@ -969,19 +1700,18 @@ class VersionFinder:
                 right = mid - 1
 
         logger.debug(f"Binary search completed - Final left: {left}, Final right: {right}")
+        return index[right][0]
 
-        first_commit_to_include_submodule_change = repo_commot_submodule_ptr_tuples[right][0]
-        logger.debug(f"First commit that includes submodule change: {first_commit_to_include_submodule_change}")
-        return first_commit_to_include_submodule_change
-
-    def __get_commits_changing_submodule_pointers_and_the_new_pointer(self, submodule_path, commit_num_limit):
-        git_log_command = [
-            "log", "--format=Commit: %H", "-p", "--", submodule_path,
-        ]
+    def __get_commits_changing_submodule_pointers_and_the_new_pointer(self, submodule_path, commit_num_limit,
+                                                                       repository='', revision_range=''):
+        revisions = [revision_range] if revision_range else []
+        git_log_command = self.__log_command(f"--format={log_format('%H', '')}", "-p", *revisions,
+                                             "--", submodule_path)
         if commit_num_limit:
             git_log_command.insert(2, f"-n {commit_num_limit}")
-        git_log_output = self._git.execute(git_log_command).decode("utf-8").strip()
-        return git_log_output
+        if repository:
+            git_log_command = ["-C", repository] + git_log_command
+        return self._git.execute(git_log_command)
 
     def find_commit_by_version(self, version: str) -> List[str]:
         """
@@ -1002,19 +1732,337 @@ class VersionFinder:
         # - "VERSION: X_Y_Z"
         # - "Updated version X_Y_Z"
         # - With optional XX_ prefix
-        version_pattern = f"(Version|VERSION|Updated version)(:)? (XX_)?{version}"
+        version_pattern = self.version_matcher.git_pattern_for(version)
         logger.debug(f"Using version pattern: {version_pattern}")
 
-        commits = self._git.execute(
-            ["log", "--grep", version_pattern, "--extended-regexp", "--format=%H"]).decode("utf-8").strip().split("\n")
-
-        # Filter out empty strings that might occur if no commits are found
-        commits = [commit for commit in commits if commit]
+        commits = parse_hashes(self._git.execute(
+            self.__log_command("--grep", version_pattern, "--extended-regexp", "--format=%H")))
 
         logger.debug(f"Found {len(commits)} commits for version {version}")
         logger.debug(f"The type of commits: {type(commits)}")
         return commits
 
+    def get_version_table(self) -> VersionTable:
+        """
+        Get all versions of the updated branch, sorted by version order.
+
+        The table is built from a single git log call and kept until the repository is
+        updated again, so range queries over it need no further git calls.
+
+        Returns:
+            VersionTable: The versions and the commits that introduced them
+
+        Raises:
+            RepositoryNotTaskReady: If the repository is not ready
+        """
+        if not self.is_task_ready:
+            raise RepositoryNotTaskReady()
+        if self._version_table is not None:
+            return self._version_table
+
+        start_time = time.time()
+        output = self._git.execute(self.__log_command(
+            f"--grep={self.git_regex_pattern_for_version}",
+            "--extended-regexp",
+            f"--format={log_format('%H', '%at', '%B')}",
+        ))
+        entries = []
+        for record in iter_records(output):
+            version = self.version_matcher.extract(record[2])
+            if version:
+                entries.append(VersionEntry(version=version, sha=record[0], timestamp=int(record.raw(1))))
+        self._version_table = VersionTable(entries)
+        logger.debug(f"Built version table of {len(self._version_table)} versions "
+                     f"in {time.time() - start_time:.2f} seconds")
+        if self._session is not None:
+            write_index(self._session.data_dir, "version", (entry.version for entry in entries))
+        return self._version_table
+
+    def __get_changelog_path(self) -> Path:
+        """Get the file the changelog of the updated branch is persisted to."""
+        branch_name = re.sub(r'[^A-Za-z0-9._-]', '_', self._task_branch or "HEAD")
+        if self.first_parent:
+            branch_name += ".first-parent"
+        return self.__get_data_dir() / "changelogs" / f"{branch_name}.json"
+
+    def materialize_changelog(self, refresh: bool = False) -> Changelog:
+        """
+        Assign every commit of the updated branch to the first version that contains it.
+
+        History is walked once. The result is persisted under the git directory and
+        reused while the branch tip and the version pattern are unchanged.
+
+        Args:
+            refresh: If True, rebuild the changelog even if a persisted one is current
+
+        Returns:
+            Changelog: The commits of each version, serving version ranges as unions of buckets
+
+        Raises:
+            RepositoryNotTaskReady: If the repository is not ready
+        """
+        if not self.is_task_ready:
+            raise RepositoryNotTaskReady()
+
+        head = self._git.execute(["rev-parse", "HEAD"]).decode("utf-8").strip()
+        if not refresh and self._changelog is not None and self._changelog.head == head:
+            return self._changelog
+
+        path = self.__get_changelog_path()
+        changelog = None if refresh else Changelog.load(path)
+        if (changelog is None or changelog.head != head or
+                changelog.pattern != self.git_regex_pattern_for_version):
+            start_time = time.time()
+            version_commits = {entry.sha: entry.version for entry in self.get_version_table()}
+            # In first-parent mode merged-in commits are absent from the walk, so the
+            # bucket walk does not follow them either
+            walk_output = self._git.execute(
+                self.__log_command("--topo-order", "--reverse", "--format=%H %P", head))
+            changelog = build_changelog(walk_output, version_commits, head=head,
+                                        pattern=self.git_regex_pattern_for_version)
+            changelog.save(path)
+            logger.info(f"Materialized changelog of {len(changelog.versions)} versions "
+                        f"in {time.time() - start_time:.2f} seconds")
+        self._changelog = changelog
+        return changelog
+
+    def __current_changelog(self) -> Optional[Changelog]:
+        """Get the materialized changelog of the updated branch if it is current, without building one."""
+        head = self._git.execute(["rev-parse", "HEAD"]).decode("utf-8").strip()
+        if self._changelog is not None and self._changelog.head == head:
+            return self._changelog
+        changelog = Changelog.load(self.__get_changelog_path())
+        if (changelog is None or changelog.head != head or
+                changelog.pattern != self.git_regex_pattern_for_version):
+            return None
+        self._changelog = changelog
+        return changelog
+
+    def __changelog_commits_between(self, start_version: str, end_version: str,
+                                    submodule: Optional[str]) -> Optional[List[str]]:
+        """
+        Get the commits between two versions from a current materialized changelog.
+
+        The commits match the git log range of __versions_log_command, i.e. the start version
+        commit and the commits released after it up to the end version. Commits merged into the
+        start version commit itself belong to its bucket and are not listed, unlike with git log.
+
+        Returns:
+            Optional[List[str]]: Commit SHAs, newest first, or None if the changelog cannot serve the range
+        """
+        if submodule:
+            return None
+        changelog = self.__current_changelog()
+        if changelog is None:
+            return None
+        try:
+            commits = changelog.commits_between(start_version, end_version)
+            start_commit = changelog.commit_of(start_version)
+        except KeyError:
+            return None
+        if not commits and start_version != end_version:
+            # The end version precedes the start version, leave the range to git
+            return None
+        logger.debug(f"Serving commits between {start_version} and {end_version} from the changelog")
+        return commits + [start_commit]
+
+    def watch(self, branch: Optional[str] = None, poll_interval: float = DEFAULT_WATCH_POLL_INTERVAL,
+              fetch_interval: Optional[float] = None, timeout: Optional[float] = None) -> Iterator[WatchEvent]:
+        """
+        Report the commits that land on a branch, and the versions they land in, as they arrive.
+
+        Ref updates are detected with inotify where available and by polling otherwise. The
+        version table, changelog and submodule pointer indices are extended with the new
+        commits only, instead of being rebuilt. A rewritten branch rebuilds them.
+
+        Queries follow the branch in a worktree, so a VersionFinder that was not created in
+        worktree mode switches to it and leaves the user's checkout alone. With a fetch
+        interval the remote-tracking branch is followed, since fetching only moves that ref.
+
+        Args:
+            branch: Branch to watch. Defaults to the branch of the last update_repository call.
+            poll_interval: Seconds between ref checks when inotify is unavailable
+            fetch_interval: If given, fetch the branch every this many seconds
+            timeout: Stop watching after this many seconds. Watches until closed if None.
+
+        Yields:
+            WatchEvent: One event per new commit: WATCH_EVENT_LANDED for a commit not in a
+            version yet, WATCH_EVENT_RELEASED once a new version includes it, and
+            WATCH_EVENT_VERSION for the version commit itself. WATCH_EVENT_RESET if the
+            branch was rewritten.
+
+        Raises:
+            RepositoryNotTaskReady: If no branch is given and the repository is not ready
+        """
+        branch = branch or self._task_branch
+        if branch is None:
+            raise RepositoryNotTaskReady()
+        if not self.use_worktree:
+            logger.info(f"Watching branch {branch} in a worktree, the checkout of {self.repository_path} is not moved")
+            self.use_worktree = True
+            self.is_task_ready = False
+        if branch != self._task_branch or not self.is_task_ready:
+            self.update_repository(branch, submodule_options=self._submodule_options)
+        if self._session is not None:
+            snapshot = self._session
+        else:
+            git_dir, common_dir = (Path(path) for path in self._repo_git.execute(
+                ["rev-parse", "--absolute-git-dir", "--git-common-dir"]).decode("utf-8").split())
+            snapshot = SessionSnapshot(self.repository_path, git_dir, (self.repository_path / common_dir).resolve())
+
+        tracking_ref = None
+        if fetch_interval is not None and self._has_remote:
+            remote = self._fetch_planner.get_default_remote()
+            if remote is not None:
+                tracking_ref = f"refs/remotes/{remote}/{branch}"
+
+        tip = self.materialize_changelog().head
+        start_time = last_fetch = time.monotonic()
+        with RefWatcher(snapshot, poll_interval) as watcher:
+            logger.info(f"Watching branch {branch} at {tip[:12]} "
+                        f"({'inotify' if watcher.uses_inotify else 'polling'})")
+            while True:
+                now = time.monotonic()
+                if timeout is not None and now - start_time >= timeout:
+                    return
+                wait_time = None if timeout is None else start_time + timeout - now
+                if fetch_interval is not None and self._has_remote:
+                    if now - last_fetch >= fetch_interval:
+                        try:
+                            self._fetch_planner.fetch(branch=branch, force=True)
+                        except GitCommandError as e:
+                            logger.warning(f"Fetch of watched branch {branch} failed: {e}")
+                        last_fetch = now
+                    next_fetch = last_fetch + fetch_interval - now
+                    wait_time = next_fetch if wait_time is None else min(wait_time, next_fetch)
+                watcher.wait(wait_time)
+                try:
+                    new_tip = self.__resolve_watched_tip(branch, tracking_ref)
+                except InvalidBranchError:
+                    logger.warning(f"Watched branch {branch} cannot be resolved")
+                    continue
+                if new_tip != tip:
+                    yield from self.__advance_watched_branch(branch, tip, new_tip)
+                    tip = new_tip
+
+    def __resolve_watched_tip(self, branch: str, tracking_ref: Optional[str]) -> str:
+        """Resolve the tip of a watched branch, preferring the remote-tracking ref a fetch updates."""
+        if tracking_ref is not None:
+            try:
+                output = self._repo_git.execute(["rev-parse", "--verify", "--quiet", f"{tracking_ref}^{{commit}}"])
+                return output.decode("utf-8").strip()
+            except GitCommandError:
+                logger.debug(f"{tracking_ref} does not exist, watching the local branch {branch}")
+        if self._session is not None:
+            self._session.validate_refs()
+        return self.__resolve_branch_commit(branch)
+
+    def __advance_watched_branch(self, branch: str, old_tip: str, new_tip: str) -> Iterator[WatchEvent]:
+        """Move the query worktree of a watched branch to its new tip and extend the indices with the new commits."""
+        if not self.__is_ancestor_or_equal('', old_tip, new_tip):
+            logger.info(f"Branch {branch} was rewritten, rebuilding its indices")
+            self.__prepare_worktree(branch, new_tip)
+            self.__update_submodules(self._submodule_options)
+            self._version_table = None
+            self._changelog = None
+            self._pointer_indices = {}
+            self._nested_submodules = None
+            self.materialize_changelog()
+            yield WatchEvent(WATCH_EVENT_RESET, branch, new_tip)
+            return
+
+        start_time = time.time()
+        self.__prepare_worktree(branch, new_tip)
+        revision_range = f"{old_tip}..{new_tip}"
+
+        # Version table: the version commits among the new commits
+        output = self._git.execute(self.__log_command(
+            f"--grep={self.git_regex_pattern_for_version}", "--extended-regexp",
+            f"--format={log_format('%H', '%at', '%B')}", revision_range))
+        new_entries = []
+        for record in iter_records(output):
+            version = self.version_matcher.extract(record[2])
+            if version:
+                new_entries.append(VersionEntry(version=version, sha=record[0], timestamp=int(record.raw(1))))
+        if self._version_table is not None and new_entries:
+            # Listed first, so that the newest commit of a repeated version is kept
+            self._version_table = VersionTable([*new_entries, *self._version_table])
+            if self._session is not None:
+                write_index(self._session.data_dir, "version", (entry.version for entry in self._version_table))
+
+        # Changelog: the previously unreleased commits and the new ones, bucketed by the new versions
+        changelog = self.materialize_changelog() if self._changelog is None else self._changelog
+        previously_unreleased = set(changelog.unreleased)
+        walk_input = f"{new_tip}\n" + "".join(f"^{sha}\n" for _, sha in changelog.versions)
+        walk_output = self._git.execute(
+            self.__log_command("--topo-order", "--reverse", "--format=%H %P", "--stdin"),
+            input=walk_input.encode("utf-8"))
+        update = build_changelog(walk_output, {entry.sha: entry.version for entry in new_entries},
+                                 head=new_tip, pattern=self.git_regex_pattern_for_version)
+        changelog.extend(update)
+        changelog.save(self.__get_changelog_path())
+
+        # Pointer indices of the superproject's submodules gain the new pointer changes
+        for (repository, submodule_path), index in list(self._pointer_indices.items()):
+            if not repository:
+                index[:0] = self.__parse_pointer_changes(
+                    self.__get_commits_changing_submodule_pointers_and_the_new_pointer(
+                        submodule_path, 0, revision_range=revision_range))
+        if self.submodules and self._git.execute(["diff", "--name-only", old_tip, new_tip, "--",
+                                                  *self.submodules]).strip():
+            self.__update_submodules(self._submodule_options)
+            # Nested pointer indices follow the updated submodule checkouts
+            self._pointer_indices = {key: index for key, index in self._pointer_indices.items() if not key[0]}
+            self._nested_submodules = None
+        logger.info(f"Advanced watched branch {branch} to {new_tip[:12]} "
+                    f"in {time.time() - start_time:.2f} seconds")
+
+        events = []
+        for version, version_sha in update.versions:
+            for sha in reversed(update.buckets[version]):
+                kind = WATCH_EVENT_VERSION if sha == version_sha else WATCH_EVENT_RELEASED
+                events.append(WatchEvent(kind, branch, sha, version))
+        for sha in reversed(update.unreleased):
+            if sha not in previously_unreleased:
+                events.append(WatchEvent(WATCH_EVENT_LANDED, branch, sha))
+        subjects = {commit.sha: commit.subject for commit in self.get_commits_info([event.commit for event in events])}
+        for event in events:
+            event.subject = subjects.get(event.commit, "")
+            yield event
+
+    def get_commits_info(self, commit_shas: List[str]) -> List[Commit]:
+        """
+        Get detailed information of many commits using a single git call.
+
+        Args:
+            commit_shas: The commits, in the order to return them
+
+        Returns:
+            List[Commit]: The commits
+
+        Raises:
+            RepositoryNotTaskReady: If the repository is not ready
+        """
+        if not self.is_task_ready:
+            raise RepositoryNotTaskReady()
+        if not commit_shas:
+            return []
+        output = self._git.execute(
+            ["log", "--no-walk=unsorted", "--stdin", f"--format={COMMIT_LOG_FORMAT}"],
+            input="".join(f"{sha}\n" for sha in commit_shas).encode("utf-8"))
+        return [self.__commit_from_record(record) for record in iter_records(output)]
+
+    def __find_version_commit(self, version: str) -> Optional[str]:
+        """Get the commit of a version from the version table, falling back to a git grep."""
+        try:
+            entry = self.get_version_table().get(version)
+        except ValueError:
+            entry = None
+        if entry is not None:
+            return entry.sha
+        commits = self.find_commit_by_version(version)
+        return commits[0] if commits else None
+
     def get_submodule_commit_hash(self, commit: str, submodule: str) -> Optional[str]:
         """
         Get the submodule pointer from a commit.
@@ -1042,16 +2090,60 @@ class VersionFinder:
         if not self.is_task_ready:
             raise RepositoryNotTaskReady()
 
-        start_commits = self.find_commit_by_version(start_version)
-        if not start_commits:
+        commit_shas = self.__changelog_commits_between(start_version, end_version, submodule)
+        if commit_shas is not None:
+            return self.get_commits_info(commit_shas)
+
+        git_command = self.__versions_log_command(start_version, end_version, submodule)
+        try:
+            return self.__log_commits(git_command)
+        except GitCommandError as e:
+            logger.error(f"Failed to get commits between versions: {e}")
+            raise e
+
+    def iter_commits_between_versions(self, start_version: str, end_version: str, submodule: Optional[str] = None,
+                                      fields: Sequence[str] = DEFAULT_COMMIT_FIELDS) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the commits between two versions.
+
+        Args:
+            start_version: The first version of the range
+            end_version: The last version of the range
+            submodule: Optional submodule, whose commits between the pointers of the versions are listed
+            fields: Fields of every commit, out of COMMIT_FIELDS. Only these are read from git.
+
+        Yields:
+            Dict[str, Any]: The selected fields of every commit, newest first, as soon as git reports it
+
+        Raises:
+            VersionNotFoundError: If a version does not exist
+        """
+        if not self.is_task_ready:
+            raise RepositoryNotTaskReady()
+
+        commit_shas = self.__changelog_commits_between(start_version, end_version, submodule)
+        if commit_shas is not None:
+            yield from self.__iter_commit_rows(["log", "--no-walk=unsorted", "--stdin"], fields,
+                                               input="".join(f"{sha}\n" for sha in commit_shas).encode("utf-8"))
+            return
+
+        git_command = self.__versions_log_command(start_version, end_version, submodule)
+        try:
+            yield from self.__iter_commit_rows(git_command, fields)
+        except GitCommandError as e:
+            logger.error(f"Failed to get commits between versions: {e}")
+            raise e
+
+    def __versions_log_command(self, start_version: str, end_version: str, submodule: Optional[str]) -> List[str]:
+        """Build the git log command listing the commits between two versions."""
+        start_commit = self.__find_version_commit(start_version)
+        if not start_commit:
             raise VersionNotFoundError(f"Version: {start_version} was not found in the repository.")
-        start_commit = start_commits[0]
         logger.debug(f"The commit SHA of version: {start_version} is {start_commit}")
 
-        end_commits = self.find_commit_by_version(end_version)
-        if not end_commits:
+        end_commit = self.__find_version_commit(end_version)
+        if not end_commit:
             raise VersionNotFoundError(f"Version: {end_version} was not found in the repository.")
-        end_commit = end_commits[0]
         logger.debug(f"The commit SHA of version: {end_version} is {end_commit}")
 
         if submodule:
@@ -1065,21 +2157,13 @@ class VersionFinder:
                 raise GitError(f"startversion:end_commit: Couldn't find the pointer to submodule: {submodule}")
 
         lower_bound_commit = self.get_parent_commit(start_commit, submodule)
-        git_command = ["log", "--format=%H", f"{lower_bound_commit}..{end_commit}"]
+        git_command = self.__log_command(f"{lower_bound_commit}..{end_commit}")
         if submodule:
             git_command.insert(0, "-C")
             git_command.insert(1, submodule)
+        return git_command
 
-        try:
-            commit_sha_list = self._git.execute(
-                git_command).decode("utf-8").strip().split("\n")
-        except GitCommandError as e:
-            logger.error(f"Failed to get commits between versions: {e}")
-            raise e
-
-        return [self.get_commit_info(commit, submodule=submodule) for commit in commit_sha_list]
-
-    def get_parent_commit(self, commit: str, submodule=None) -> str:
+    def get_parent_commit(self, commit: CommitRef, submodule=None) -> str:
         """
         Get the parent commit of a given commit hash.
 
@@ -1095,15 +2179,13 @@ class VersionFinder:
         """
         if not self.is_task_ready:
             raise RepositoryNotTaskReady()
-        if submodule:
-            if self.submodule_has_commit(submodule, f"{commit}^"):
-                return f"{commit}^"
-            return commit
-        if self.has_commit(f"{commit}^"):
-            return f"{commit}^"
+        commit = _sha_of(commit)
+        parent = f"{commit}^"
+        if self.resolve_many([parent], submodule=submodule or '')[parent]:
+            return parent
         return commit
 
-    def find_first_version_containing_commit(self, commit_sha: str, submodule=None) -> Optional[str]:
+    def find_first_version_containing_commit(self, commit_sha: CommitRef, submodule=None) -> Optional[str]:
         """
         Get the first version which includes the given commit.
         If submodule is provided, get the first version which includes the given commit in the submodule.
@@ -1114,8 +2196,10 @@ class VersionFinder:
             raise RepositoryNotTaskReady()
 
         if submodule:
-            # Get the first commit that includes changes in the submodule
-            commit_sha = self.get_first_commit_including_submodule_changes(submodule, commit_sha)
+            # Get the first commit that includes changes in the submodule.
+            # It comes straight from git log, so it needs no further validation.
+            superproject_commit = self.get_first_commit_including_submodule_changes(submodule, commit_sha)
+            commit_sha = ResolvedCommit(rev=superproject_commit, sha=superproject_commit)
 
         if not self.has_commit(commit_sha):
             logger.error(f"Commit {commit_sha} does not exist")
@@ -1127,6 +2211,174 @@ class VersionFinder:
 
         return self.get_version_from_commit(versions_commits[1])
 
+    def find_versions_across_branches(self, commit_sha: CommitRef,
+                                      branch_glob: str = "*") -> Dict[str, Optional[str]]:
+        """
+        Find the first version containing a commit on every branch that contains it.
+
+        A single reachability pass finds the branches that contain the commit, then the
+        descendants of the commit on all of them are walked once and every branch picks its
+        first version out of that walk. No branch is checked out.
+
+        Args:
+            commit_sha: The commit to look for
+            branch_glob: Only consider branches whose name matches this glob, e.g. "release/*"
+
+        Returns:
+            Dict[str, Optional[str]]: Branch name -> first version containing the commit, or None
+            if the branch contains the commit but has no version after it. Branches that do not
+            contain the commit are left out.
+
+        Raises:
+            InvalidCommitError: If the commit does not exist
+        """
+        commit = self.resolve_commit(commit_sha)
+        branch_tips = self.__list_branch_tips(branch_glob, contains=commit.sha)
+        logger.debug(f"{len(branch_tips)} branches matching {branch_glob} contain commit {commit.sha}")
+        if not branch_tips:
+            return {}
+
+        # Branches often share their tips, each distinct tip is resolved once
+        versions_by_tip = self.__find_first_versions_on_tips(commit.sha, sorted(set(branch_tips.values())))
+        return {name: versions_by_tip[tip] for name, tip in sorted(branch_tips.items())}
+
+    def find_versions_containing_patch(self, commit_sha: CommitRef, branch_glob: str = "*",
+                                       max_workers: int = 8) -> Dict[str, Optional[str]]:
+        """
+        Find the first version containing a commit or any patch-equivalent commit, such as
+        a cherry-pick, on every matching branch.
+
+        Commits are matched by their stable patch-id. Patch-ids are computed once per commit
+        and persisted, so later queries are dictionary lookups.
+
+        Args:
+            commit_sha: The commit to look for
+            branch_glob: Only consider branches whose name matches this glob, e.g. "release/*"
+            max_workers: Number of patch-equivalent commits searched in parallel
+
+        Returns:
+            Dict[str, Optional[str]]: Branch name -> first version containing the patch, or None
+            if the branch contains the patch but has no version after it. Branches that do not
+            contain the patch are left out.
+
+        Raises:
+            InvalidCommitError: If the commit does not exist
+        """
+        commit = self.resolve_commit(commit_sha)
+        branch_tips = self.__list_branch_tips(branch_glob)
+        if not branch_tips:
+            return {}
+
+        patch_index = self.__get_patch_index()
+        commits_by_tip = patch_index.index_branches(sorted(set(branch_tips.values())))
+        equivalents = patch_index.equivalents(commit.sha)
+        patch_index.save()
+        logger.debug(f"Commits with the patch of {commit.sha}: {equivalents}")
+
+        # Each equivalent commit is searched once, on all the tips that contain it
+        tips_by_commit = {sha: sorted(tip for tip, commits in commits_by_tip.items() if sha in commits)
+                          for sha in sorted(equivalents)}
+        tips_by_commit = {sha: tips for sha, tips in tips_by_commit.items() if tips}
+        if not tips_by_commit:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tips_by_commit)))) as executor:
+            results = list(executor.map(lambda item: self.__find_first_versions_on_tips(*item),
+                                        tips_by_commit.items()))
+
+        versions_by_tip: Dict[str, List[str]] = {}
+        for result in results:
+            for tip, version in result.items():
+                versions_by_tip.setdefault(tip, [])
+                if version:
+                    versions_by_tip[tip].append(version)
+        return {name: min(versions_by_tip[tip], key=parse_version_key) if versions_by_tip[tip] else None
+                for name, tip in sorted(branch_tips.items()) if tip in versions_by_tip}
+
+    def __get_patch_index(self) -> PatchIdIndex:
+        """Get the patch-id index, persisted under the git directory."""
+        if self._patch_index is None:
+            self._patch_index = PatchIdIndex(self._repo_git, self.__get_data_dir() / "patch-ids.json")
+        return self._patch_index
+
+    def __list_branch_tips(self, branch_glob: str = "*", contains: Optional[str] = None) -> Dict[str, str]:
+        """
+        Get the tips of the local and origin branches matching a glob.
+
+        Branch names match list_branches(). Local branches take precedence over their
+        remote-tracking counterparts.
+
+        Args:
+            branch_glob: Glob the branch names must match
+            contains: Optional commit SHA the branches must contain
+
+        Returns:
+            Dict[str, str]: Branch name -> commit SHA of its tip
+        """
+        command = ["for-each-ref", "--format=%(refname)%00%(objectname)", "refs/heads", "refs/remotes/origin"]
+        if contains:
+            command[1:1] = ["--contains", contains]
+        output = self._repo_git.execute(command).decode("utf-8")
+
+        branch_tips: Dict[str, str] = {}
+        for line in sorted(output.splitlines(), key=lambda line: line.startswith("refs/heads/")):
+            refname, _, tip = line.partition("\0")
+            name = re.sub(r"^refs/(?:heads|remotes/origin)/", "", refname)
+            if name != "HEAD" and fnmatch.fnmatchcase(name, branch_glob):
+                branch_tips[name] = tip
+        return branch_tips
+
+    def __find_first_versions_on_tips(self, commit_sha: str, tips: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Get the first version containing a commit on the history of every branch tip.
+
+        The descendants of the commit on all tips are walked once, and the version commits
+        among them are read with a single grep over the same walk. Every tip then picks the
+        oldest version commit among its own ancestors, without further git calls.
+
+        Args:
+            commit_sha: Full SHA of a commit reachable from every tip
+            tips: Commit SHAs of the branch tips
+
+        Returns:
+            Dict[str, Optional[str]]: Tip -> the version, or None if no version follows the commit
+        """
+        # The commit itself may be the version commit
+        message = self._repo_git.execute(["show", "-s", "--format=%B", commit_sha]).decode("utf-8", "replace")
+        own_match = self.version_matcher.prefixed_regex.search(message)
+        if own_match:
+            return {tip: own_match.group(1) for tip in tips}
+
+        walk = ["--ancestry-path", f"^{commit_sha}"] + tips
+        parents: Dict[str, List[str]] = {}
+        order: Dict[str, int] = {}
+        for record in iter_records(self._repo_git.execute(self.__log_command(f"--format={log_format('%H', '%P')}",
+                                                                             *walk))):
+            sha = record[0]
+            parents[sha] = record[1].split()[:1 if self.first_parent else None]
+            order[sha] = len(order)
+        versions: Dict[str, str] = {}
+        for record in iter_records(self._repo_git.execute(self.__log_command(
+                f"--grep={self.git_regex_pattern_for_version}", "--extended-regexp",
+                f"--format={log_format('%H', '%B')}", *walk))):
+            version = self.__extract_version_from_message(record[1])
+            if version:
+                versions[record[0]] = version
+
+        result: Dict[str, Optional[str]] = {}
+        for tip in tips:
+            # Ancestors of the tip that descend from the commit, i.e. its part of the walk
+            reachable, pending = set(), [tip]
+            while pending:
+                sha = pending.pop()
+                if sha in reachable or sha not in parents:
+                    continue
+                reachable.add(sha)
+                pending.extend(parents[sha])
+            version_commits = [sha for sha in reachable if sha in versions]
+            # The walk lists the newest commit first, the first version is the last one listed
+            result[tip] = versions[max(version_commits, key=order.__getitem__)] if version_commits else None
+        return result
+
     def get_commit_sha_from_relative_string(self, relative_string: str, submodule: str = '') -> Optional[str]:
         """
         Get the commit SHA from a relative string.
@@ -1137,12 +2389,10 @@ class VersionFinder:
 
         # Get the commit SHA from the relative string
         try:
-            commit_sha = self._git.execute(
-                ["rev-parse", relative_string]).decode("utf-8").strip()
-        except GitCommandError as e:
+            return self.resolve_commit(relative_string, submodule=submodule).sha
+        except InvalidCommitError as e:
             logger.error(f"Error while getting commit SHA from relative string: {e}")
             raise InvalidCommitError(f"Invalid commit SHA: {e}")
-        return commit_sha
 
     def get_task_api_functions(self) -> Dict[int, Callable]:
         """
@@ -1167,7 +2417,7 @@ class VersionFinder:
     def is_valid_submodule(self, submodule: str = ''):
         if not isinstance(submodule, str):
             raise TypeError("submodule only accepts string or empty string")
-        if submodule in self.submodules or submodule == '':
+        if submodule in self.submodules or submodule == '' or submodule in self.__list_nested_submodules():
             return True
         raise InvalidSubmoduleError()
 
@@ -1196,9 +2446,9 @@ class VersionFinder:
             diff_output = self._git.execute(["diff", "--name-only", empty_tree, commit_hash])
         return diff_output.decode().splitlines()
 
-    def is_valid_commit(self, commit_hash: str, submodule: str = ''):
+    def is_valid_commit(self, commit_hash: CommitRef, submodule: str = ''):
         valid_commit = False
-        if not commit_hash or not isinstance(commit_hash, str):
+        if not commit_hash or not isinstance(commit_hash, (str, ResolvedCommit)):
             raise TypeError("commit_hash only accepts string")
         if not isinstance(submodule, str):
             raise TypeError("submodule only accepts string or empty string")
@@ -1298,13 +2548,17 @@ class VersionFinder:
             f"{'submodule ' + submodule if submodule else 'main repository'}")
 
         try:
-            # Validate commit
-            if not self.is_valid_commit(commit_sha, submodule):
+            # Validate the commit once, the resolved handle is trusted by the rest of the query
+            if not isinstance(commit_sha, (str, ResolvedCommit)) or not commit_sha:
+                raise TypeError("commit_sha only accepts string")
+            try:
+                commit = self.resolve_commit(commit_sha, submodule or '')
+            except InvalidCommitError:
                 logger.error(f"Invalid commit: {commit_sha}")
                 raise InvalidCommitError(f"Invalid commit: {commit_sha}")
 
             # Find the version
-            version = self.find_first_version_containing_commit(commit_sha, submodule)
+            version = self.find_first_version_containing_commit(commit, submodule)
 
             if version:
                 logger.info(f"Found version {version} for commit {commit_sha}")
@@ -1336,7 +2590,7 @@ class VersionFinder:
 
         try:
             # Check if directory is a git repository
-            self._git.execute(["status"])
+            self._repo_git.execute(["status"])
         except GitCommandError as e:
             state["is_valid"] = False
             state["error"] = f"Not a valid git repository: {str(e)}"
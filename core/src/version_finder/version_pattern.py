@@ -0,0 +1,142 @@
+"""
+version_pattern.py
+====================================
+Module for matching version strings in commit messages.
+A VersionPattern is the single definition of what a version commit looks like.
+The Python regex used to extract versions and the extended regex passed to
+`git log --grep` are both generated from it, so git and Python agree on which
+commits carry a version and what that version is.
+"""
+import re
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+# Prefixes that mark a commit message as a version commit
+DEFAULT_VERSION_PREFIXES = ("Version", "VERSION", "Updated version")
+# Optional marker between the prefix and the version number
+DEFAULT_VERSION_NUMBER_PREFIX = "XX_"
+
+# Characters with a special meaning in POSIX extended regular expressions
+_ERE_SPECIAL_CHARACTERS = set("\\.[](){}*+?|^$")
+
+
+def escape_ere(text: str) -> str:
+    """
+    Escape a string for use as a literal in a POSIX extended regular expression.
+
+    Args:
+        text: The literal text
+
+    Returns:
+        str: The escaped text
+    """
+    return "".join(f"\\{c}" if c in _ERE_SPECIAL_CHARACTERS else c for c in text)
+
+
+def _minimal_literals(prefixes: Sequence[str]) -> Tuple[str, ...]:
+    """Drop prefixes that contain another prefix, a message holding them holds the shorter one too."""
+    return tuple(p for p in prefixes if not any(q != p and q in p for q in prefixes))
+
+
+class VersionPattern:
+    """
+    Compiled matcher for version commits.
+
+    A version is one to four digits followed by one or more numeric components,
+    separated by '.', '_' or '-' (e.g. 1.2.3, 2024_01_15, 4.5-2). In a version
+    commit it follows one of the prefixes, an optional colon and an optional
+    number prefix (e.g. "Version: XX_2024_01").
+    """
+
+    def __init__(self,
+                 prefixes: Optional[Sequence[str]] = None,
+                 number_prefix: str = DEFAULT_VERSION_NUMBER_PREFIX,
+                 require_prefix: bool = False):
+        """
+        Initialize the version pattern.
+
+        Args:
+            prefixes: Prefixes that mark a version commit. Defaults to DEFAULT_VERSION_PREFIXES.
+            number_prefix: Optional literal between the prefix and the version number
+            require_prefix: If True, extract() only accepts prefixed versions. Otherwise a bare
+                version number is accepted when the message holds no prefixed one.
+
+        Raises:
+            ValueError: If no prefixes are given
+        """
+        self.prefixes = tuple(prefixes) if prefixes is not None else DEFAULT_VERSION_PREFIXES
+        if not self.prefixes or not all(self.prefixes):
+            raise ValueError("At least one non-empty version prefix is required")
+        self.number_prefix = number_prefix
+        self.require_prefix = require_prefix
+
+        python_prefixes = "|".join(re.escape(p) for p in self.prefixes)
+        python_number_prefix = f"(?:{re.escape(number_prefix)})?" if number_prefix else ""
+        python_number = r"(\d{1,4}(?:[._-]\d+)+)"
+        self.prefixed_regex = re.compile(
+            rf"(?:{python_prefixes})[ \t]*:?[ \t]*{python_number_prefix}{python_number}")
+        self.regex = re.compile(
+            rf"(?:(?:{python_prefixes})[ \t]*:?[ \t]*|[^a-zA-Z0-9][^0-9\s]*)?{python_number_prefix}{python_number}")
+        self._literals = _minimal_literals(self.prefixes)
+
+        self._git_prefix = ("(" + "|".join(escape_ere(p) for p in self.prefixes) + ")[ \t]*:?[ \t]*" +
+                            (f"({escape_ere(number_prefix)})?" if number_prefix else ""))
+        self.git_pattern = self._git_prefix + "[0-9]{1,4}([._-][0-9]+)+"
+
+    def __repr__(self):
+        return f"VersionPattern(prefixes={self.prefixes!r}, number_prefix={self.number_prefix!r})"
+
+    def has_prefix(self, message: str) -> bool:
+        """Cheap literal check that must pass before a message can hold a prefixed version."""
+        return any(literal in message for literal in self._literals)
+
+    def extract(self, message: str) -> Optional[str]:
+        """
+        Extract the version from a commit message.
+
+        The version following a prefix wins over bare version numbers that appear earlier.
+
+        Args:
+            message: The commit message
+
+        Returns:
+            Optional[str]: The version, or None if the message holds no version
+        """
+        if self.has_prefix(message):
+            match = self.prefixed_regex.search(message)
+            if match:
+                return match.group(1)
+        if self.require_prefix:
+            return None
+        match = self.regex.search(message)
+        return match.group(1) if match else None
+
+    def extract_many(self, messages: Iterable[str]) -> Iterator[Optional[str]]:
+        """
+        Extract the versions from a stream of commit messages.
+
+        Args:
+            messages: Commit messages
+
+        Returns:
+            Iterator[Optional[str]]: The version of each message, in order
+        """
+        extract = self.extract
+        for message in messages:
+            yield extract(message)
+
+    def git_pattern_for(self, version: str) -> str:
+        """
+        Get the extended regex that matches the commit of a specific version.
+
+        The version is matched literally, and not as the start of a longer version.
+
+        Args:
+            version: The version string, as returned by extract()
+
+        Returns:
+            str: Pattern for `git log --extended-regexp --grep`
+        """
+        return f"{self._git_prefix}{escape_ere(version)}([^0-9._-]|[._-]([^0-9]|$)|$)"
+
+
+DEFAULT_VERSION_PATTERN = VersionPattern()
@@ -0,0 +1,146 @@
+"""
+version_table.py
+====================================
+Module for ordering versions.
+Versions such as XX_2023_01_15, 1.2.3 or 4.5-2 are parsed into comparable keys
+and kept in a sorted table with their commits, so range queries are answered
+by binary search without calling git.
+"""
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+_VERSION_COMPONENT = re.compile(r"\d+")
+
+
+def parse_version_key(version: str) -> Tuple[int, ...]:
+    """
+    Parse a version into a key that sorts versions in release order.
+
+    Any non-numeric prefix (e.g. "XX_") is ignored and the numeric components are
+    compared as numbers, so 1.10 sorts after 1.9 and 1.2 before 1.2.1.
+
+    Args:
+        version: The version string
+
+    Returns:
+        Tuple[int, ...]: The numeric components of the version
+
+    Raises:
+        ValueError: If the version has no numeric component
+    """
+    key = tuple(int(component) for component in _VERSION_COMPONENT.findall(version))
+    if not key:
+        raise ValueError(f"Not a version: {version}")
+    return key
+
+
+@dataclass(frozen=True)
+class VersionEntry:
+    """A version and the commit that introduced it."""
+    version: str
+    sha: str
+    timestamp: int = 0
+    key: Tuple[int, ...] = field(default=(), compare=False, repr=False)
+
+    def __post_init__(self):
+        if not self.key:
+            object.__setattr__(self, "key", parse_version_key(self.version))
+
+
+class VersionTable:
+    """Versions sorted by their version key."""
+
+    def __init__(self, entries: Iterable[VersionEntry] = ()):
+        """
+        Initialize the table.
+
+        Versions are looked up by their exact string. The version key only orders them,
+        as spellings such as 1.2.3 and 1.2-3 share a key but name different commits.
+
+        Args:
+            entries: Versions to hold. If the same version appears more than once,
+                the first entry is kept (git log lists the newest commit first).
+        """
+        self._by_version: Dict[str, VersionEntry] = {}
+        for entry in entries:
+            self._by_version.setdefault(entry.version, entry)
+        self._entries: List[VersionEntry] = sorted(self._by_version.values(),
+                                                   key=lambda entry: (entry.key, entry.version))
+        self._keys: List[Tuple[int, ...]] = [entry.key for entry in self._entries]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[VersionEntry]:
+        return iter(self._entries)
+
+    def __contains__(self, version: str) -> bool:
+        return self.get(version) is not None
+
+    def __repr__(self):
+        return f"VersionTable({len(self)} versions)"
+
+    def get(self, version: str) -> Optional[VersionEntry]:
+        """
+        Get the entry of a version.
+
+        Args:
+            version: The version string
+
+        Returns:
+            Optional[VersionEntry]: The entry, or None if the version is not in the table
+        """
+        return self._by_version.get(version)
+
+    def between(self, start: str, end: str, inclusive: bool = True) -> List[VersionEntry]:
+        """
+        Get all versions between two versions, in ascending order.
+
+        The bounds do not need to be versions of the table.
+
+        Args:
+            start: Lower bound version
+            end: Upper bound version
+            inclusive: If True, the bounds themselves are included
+
+        Returns:
+            List[VersionEntry]: The versions in the range
+        """
+        start_key, end_key = parse_version_key(start), parse_version_key(end)
+        if inclusive:
+            low, high = bisect_left(self._keys, start_key), bisect_right(self._keys, end_key)
+        else:
+            low, high = bisect_right(self._keys, start_key), bisect_left(self._keys, end_key)
+        return self._entries[low:high]
+
+    def latest_at_most(self, version: str) -> Optional[VersionEntry]:
+        """
+        Get the latest version that is lower than or equal to a version.
+
+        Args:
+            version: Upper bound version
+
+        Returns:
+            Optional[VersionEntry]: The version, or None if all versions are higher
+        """
+        index = bisect_right(self._keys, parse_version_key(version))
+        return self._entries[index - 1] if index else None
+
+    def earliest_at_least(self, version: str) -> Optional[VersionEntry]:
+        """
+        Get the earliest version that is higher than or equal to a version.
+
+        Args:
+            version: Lower bound version
+
+        Returns:
+            Optional[VersionEntry]: The version, or None if all versions are lower
+        """
+        index = bisect_left(self._keys, parse_version_key(version))
+        return self._entries[index] if index < len(self._entries) else None
+
+    def latest(self) -> Optional[VersionEntry]:
+        """Get the highest version."""
+        return self._entries[-1] if self._entries else None
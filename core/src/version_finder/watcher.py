@@ -0,0 +1,195 @@
+"""
+watcher.py
+====================================
+Module for waiting on ref updates of a repository.
+On Linux the ref directories, packed-refs and HEAD are watched with inotify
+(through ctypes, no extra dependency), so a waiting process wakes up as soon as
+git renames a ref into place. Elsewhere, or when inotify is unavailable, the
+file fingerprints of the session snapshot are polled instead.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Dict, Optional, Tuple
+from version_finder.common import DEFAULT_WATCH_POLL_INTERVAL
+from version_finder.logger import get_logger
+from version_finder.session import SessionSnapshot
+
+logger = get_logger()
+
+# inotify(7) constants
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_ISDIR = 0x40000000
+IN_Q_OVERFLOW = 0x00004000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+# Files outside the ref directories whose updates are reported
+WATCHED_FILES = {"HEAD", "packed-refs"}
+# Seconds to keep collecting events after the first one, so that a fetch
+# updating many refs wakes the watcher once
+SETTLE_TIME = 0.05
+
+
+class _Inotify:
+    """Minimal inotify binding."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path: str) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        return wd
+
+    def read_events(self):
+        """Yield (watch descriptor, mask, name) of the queued events."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "replace")
+            offset += length
+            yield wd, mask, name
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class RefWatcher:
+    """Wait for ref updates of a repository."""
+
+    def __init__(self, snapshot: SessionSnapshot, poll_interval: float = DEFAULT_WATCH_POLL_INTERVAL,
+                 use_inotify: bool = True):
+        """
+        Initialize the watcher.
+
+        Args:
+            snapshot: Session snapshot of the repository, locating its git directories
+            poll_interval: Seconds between fingerprint checks when polling
+            use_inotify: If False, always poll
+        """
+        self.snapshot = snapshot
+        self.poll_interval = poll_interval
+        self._inotify: Optional[_Inotify] = None
+        # Watch descriptor -> (directory, True if any entry counts as a ref update)
+        self._watches: Dict[int, Tuple[str, bool]] = {}
+        self._fingerprint = snapshot.fingerprint()
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+                self.__add_watch(str(snapshot.git_dir), False)
+                if snapshot.common_dir != snapshot.git_dir:
+                    self.__add_watch(str(snapshot.common_dir), False)
+                for root in (snapshot.common_dir / "refs" / "heads", snapshot.common_dir / "refs" / "remotes"):
+                    for directory, _, _ in os.walk(root):
+                        self.__add_watch(directory, True)
+            except (OSError, AttributeError) as e:
+                logger.info(f"inotify unavailable, polling for ref updates every {poll_interval} seconds: {e}")
+                self.close()
+
+    @property
+    def uses_inotify(self) -> bool:
+        """Whether ref updates are detected with inotify rather than polling."""
+        return self._inotify is not None
+
+    def __add_watch(self, directory: str, refs: bool) -> None:
+        self._watches[self._inotify.add_watch(directory)] = (directory, refs)
+
+    def __is_ref_update(self, wd: int, mask: int, name: str) -> bool:
+        if mask & IN_Q_OVERFLOW:
+            return True
+        directory, refs = self._watches.get(wd, ("", False))
+        if mask & IN_ISDIR:
+            if not (refs and mask & (IN_CREATE | IN_MOVED_TO)):
+                return False
+            # Refs with a new prefix, e.g. refs/heads/feature/..., get their own directory. A ref
+            # renamed into it before its watch was added sends no event, so existing refs count.
+            found_ref = False
+            for subdirectory, _, files in os.walk(os.path.join(directory, name)):
+                self.__add_watch(subdirectory, True)
+                found_ref = found_ref or any(not file.endswith(".lock") for file in files)
+            return found_ref
+        if name.endswith(".lock"):
+            return False
+        return refs or name in WATCHED_FILES
+
+    def __wait_inotify(self, timeout: Optional[float]) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([self._inotify.fd], [], [], remaining)
+            if not readable:
+                return False
+            # Every event is inspected, so that new ref directories are always watched
+            if any([self.__is_ref_update(*event) for event in self._inotify.read_events()]):
+                # Collect the rest of a multi-ref update
+                while select.select([self._inotify.fd], [], [], SETTLE_TIME)[0]:
+                    for event in self._inotify.read_events():
+                        self.__is_ref_update(*event)
+                return True
+
+    def __wait_polling(self, timeout: Optional[float]) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            fingerprint = self.snapshot.fingerprint()
+            if fingerprint != self._fingerprint:
+                self._fingerprint = fingerprint
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            sleep_time = self.poll_interval
+            if deadline is not None:
+                sleep_time = min(sleep_time, max(0.0, deadline - time.monotonic()))
+            time.sleep(sleep_time)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for refs, packed-refs or HEAD to change.
+
+        Updates may be reported spuriously (e.g. for a ref that was rewritten with the
+        same value), callers should compare the refs they care about.
+
+        Args:
+            timeout: Seconds to wait at most. Waits indefinitely if None.
+
+        Returns:
+            bool: True if refs changed, False if the timeout expired
+        """
+        if self._inotify is not None:
+            return self.__wait_inotify(timeout)
+        return self.__wait_polling(timeout)
+
+    def close(self) -> None:
+        """Release the inotify instance."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self._watches = {}
+
+    def __enter__(self) -> "RefWatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,154 @@
+"""
+writers.py
+====================================
+Module for writing query results in machine-readable formats.
+Writers consume rows (dicts of field values) one at a time and write each row
+as soon as it arrives, so results piped to another program appear while the
+query still runs. Nothing is written before the first row or close(), so a
+query that fails before producing results leaves the output empty.
+"""
+import csv
+import json
+import sys
+from typing import Any, Dict, IO, Iterable, Optional, Sequence
+from version_finder.common import OUTPUT_FORMATS
+
+
+class RecordWriter:
+    """Base class of the streaming writers."""
+
+    def __init__(self, fields: Sequence[str], output: Optional[IO[str]] = None):
+        """
+        Initialize the writer.
+
+        Args:
+            fields: Fields written for every row, in order
+            output: Stream the rows are written to. Defaults to stdout.
+        """
+        self.fields = list(fields)
+        self.output = output if output is not None else sys.stdout
+        self.count = 0
+        self._started = False
+
+    def _start(self) -> None:
+        """Write what precedes the first row."""
+
+    def _write_row(self, row: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def _finish(self) -> None:
+        """Write what follows the last row."""
+
+    def write(self, row: Dict[str, Any]) -> None:
+        """
+        Write a row and flush it.
+
+        Args:
+            row: Field values, fields missing from the row are written as empty values
+        """
+        if not self._started:
+            self._started = True
+            self._start()
+        self._write_row(row)
+        self.count += 1
+        self.output.flush()
+
+    def close(self) -> None:
+        """Complete the output, e.g. the closing bracket of a JSON array."""
+        if not self._started:
+            self._started = True
+            self._start()
+        self._finish()
+        self.output.flush()
+
+
+class JsonWriter(RecordWriter):
+    """Write the rows as a JSON array, one element per line."""
+
+    def _start(self) -> None:
+        self.output.write("[")
+
+    def _write_row(self, row: Dict[str, Any]) -> None:
+        separator = "\n" if self.count == 0 else ",\n"
+        self.output.write(separator + json.dumps({field: row.get(field) for field in self.fields}))
+
+    def _finish(self) -> None:
+        self.output.write("\n]\n" if self.count else "]\n")
+
+
+class JsonLinesWriter(RecordWriter):
+    """Write one JSON object per line."""
+
+    def _write_row(self, row: Dict[str, Any]) -> None:
+        self.output.write(json.dumps({field: row.get(field) for field in self.fields}) + "\n")
+
+
+class CsvWriter(RecordWriter):
+    """Write the rows as CSV, with a header line."""
+
+    dialect = "excel"
+
+    def _start(self) -> None:
+        self._writer = csv.DictWriter(self.output, fieldnames=self.fields, extrasaction="ignore",
+                                      dialect=self.dialect, lineterminator="\n")
+        self._writer.writeheader()
+
+    def _write_row(self, row: Dict[str, Any]) -> None:
+        self._writer.writerow(row)
+
+
+class TsvWriter(CsvWriter):
+    """Write the rows as tab separated values, with a header line."""
+
+    dialect = "excel-tab"
+
+
+WRITERS = {
+    "json": JsonWriter,
+    "jsonl": JsonLinesWriter,
+    "csv": CsvWriter,
+    "tsv": TsvWriter,
+}
+
+
+def get_writer(output_format: str, fields: Sequence[str], output: Optional[IO[str]] = None) -> RecordWriter:
+    """
+    Create the writer of an output format.
+
+    Args:
+        output_format: One of OUTPUT_FORMATS
+        fields: Fields written for every row, in order
+        output: Stream the rows are written to. Defaults to stdout.
+
+    Returns:
+        RecordWriter: The writer
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if output_format not in WRITERS:
+        raise ValueError(f"Unknown output format: {output_format} (choose from {', '.join(OUTPUT_FORMATS)})")
+    return WRITERS[output_format](fields, output)
+
+
+def write_records(rows: Iterable[Dict[str, Any]], output_format: str, fields: Sequence[str],
+                  output: Optional[IO[str]] = None) -> int:
+    """
+    Write rows as they are produced and complete the output.
+
+    The output is not completed if producing the rows fails.
+
+    Args:
+        rows: Rows to write, e.g. from VersionFinder.iter_commits_between_versions()
+        output_format: One of OUTPUT_FORMATS
+        fields: Fields written for every row, in order
+        output: Stream the rows are written to. Defaults to stdout.
+
+    Returns:
+        int: Number of rows written
+    """
+    writer = get_writer(output_format, fields, output)
+    for row in rows:
+        writer.write(row)
+    writer.close()
+    return writer.count
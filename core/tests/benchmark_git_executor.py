@@ -0,0 +1,57 @@
+"""
+Micro-benchmark of the per-call overhead of GitCommandExecutor.
+
+Compares a plain subprocess call (the way git used to be spawned: looked up on
+PATH, inherited environment, cwd set to the repository, timeout enforced by
+subprocess) with the executor's
+spawn path. The command cache is disabled so every call spawns git.
+
+Usage:
+    python benchmark_git_executor.py [repository_path] [iterations]
+"""
+import subprocess
+import sys
+import time
+from pathlib import Path
+from version_finder.git_executer import GitCommandExecutor, GitConfig
+
+
+def measure(func, iterations):
+    """Return the average duration of a call in milliseconds."""
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start_time) / iterations * 1000
+
+
+def run_benchmark(repository_path: Path, iterations: int = 200):
+    command = ["rev-parse", "HEAD"]
+
+    def baseline():
+        subprocess.check_output(["git"] + command, cwd=repository_path, stderr=subprocess.PIPE,
+                                timeout=GitConfig().timeout)
+
+    def baseline_with_version_check():
+        # Each executor used to run "git --version" when it was created
+        subprocess.check_output(["git", "--version"])
+        baseline()
+
+    executor = GitCommandExecutor(repository_path, GitConfig(cache_size=0))
+
+    def optimized():
+        executor.execute(command)
+
+    results = {
+        "baseline": measure(baseline, iterations),
+        "baseline + version check": measure(baseline_with_version_check, iterations),
+        "executor": measure(optimized, iterations),
+    }
+    for name, duration in results.items():
+        print(f"{name:<26} {duration:.3f} ms/call")
+    return results
+
+
+if __name__ == "__main__":
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else Path.cwd()
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    run_benchmark(path, count)
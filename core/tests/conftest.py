@@ -2,6 +2,7 @@
 Configuration for pytest. This file is automatically loaded by pytest.
 """
 import os
+import subprocess
 import sys
 import logging
 import tempfile
@@ -41,4 +42,22 @@ def clean_logger_state():
     os.environ.clear()
     os.environ.update(original_environ)
     logging.Logger.manager = original_manager
-    logging.root.handlers = original_root_handlers 
\ No newline at end of file
+    logging.root.handlers = original_root_handlers 
+
+
+@pytest.fixture
+def import_profile():
+    """Run code with -X importtime and return the imported modules and their cumulative import times."""
+    def profile(code):
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                                capture_output=True, text=True, env=env, timeout=60, cwd=os.path.dirname(__file__))
+        assert result.returncode == 0, result.stderr
+        modules = {}
+        for line in result.stderr.splitlines():
+            if line.startswith("import time:") and "|" in line:
+                _, cumulative, name = line[len("import time:"):].split("|")
+                if cumulative.strip().isdigit():
+                    modules[name.strip()] = int(cumulative) / 1e6
+        return modules
+    return profile
@@ -0,0 +1,48 @@
+import pytest
+from version_finder.changelog import Changelog, build_changelog
+
+
+class TestBuildChangelog:
+    @pytest.fixture
+    def changelog(self):
+        # a - b(v1) - c - e(v2) - f
+        #      \- d -/
+        walk_output = b"a\nb a\nc b\nd b\ne c d\nf e\n"
+        return build_changelog(walk_output, {"b": "1.0", "e": "2.0"}, head="f", pattern="p")
+
+    def test_buckets(self, changelog):
+        assert changelog.versions == [("1.0", "b"), ("2.0", "e")]
+        assert changelog.commits_for("1.0") == ["b", "a"]
+        assert sorted(changelog.commits_for("2.0")) == ["c", "d", "e"]
+        assert changelog.commits_for("2.0")[0] == "e"
+        assert changelog.unreleased == ["f"]
+
+    def test_commits_between(self, changelog):
+        assert changelog.commits_between("1.0", "2.0") == changelog.commits_for("2.0")
+        assert changelog.commits_between("2.0", "2.0") == []
+
+    def test_version_of(self, changelog):
+        assert changelog.version_of("a") == "1.0"
+        assert changelog.version_of("d") == "2.0"
+        assert changelog.version_of("f") is None
+        with pytest.raises(KeyError):
+            changelog.version_of("x")
+
+    def test_unknown_version(self, changelog):
+        with pytest.raises(KeyError):
+            changelog.commits_for("3.0")
+        # Versions are looked up by their exact spelling
+        with pytest.raises(KeyError):
+            changelog.commits_for("2_0")
+
+    def test_commit_of(self, changelog):
+        assert changelog.commit_of("2.0") == "e"
+
+    def test_save_and_load(self, changelog, tmp_path):
+        path = tmp_path / "changelog.json"
+        changelog.save(path)
+        loaded = Changelog.load(path)
+        assert loaded.to_dict() == changelog.to_dict()
+
+    def test_load_missing(self, tmp_path):
+        assert Changelog.load(tmp_path / "missing.json") is None
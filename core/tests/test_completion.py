@@ -0,0 +1,53 @@
+import os
+import shutil
+import tempfile
+import time
+import pytest
+from version_finder.completion import complete, run_completion, write_index
+from version_finder.version_finder import VersionFinder
+
+
+class TestCompletion:
+    @pytest.fixture
+    def test_repo(self):
+        """Creates a repository with two versions and a feature branch"""
+        temp_dir = tempfile.mkdtemp()
+        os.chdir(temp_dir)
+        os.system('git init')
+        os.system('git config user.email "test@example.com"')
+        os.system('git config user.name "Test User"')
+        os.system('git commit -m "Initial commit" --allow-empty')
+        os.system('git commit -m "Version: 1.0" --allow-empty')
+        os.system('git commit -m "Version: 1.1" --allow-empty')
+        os.system('git branch feature/login')
+        os.system('git branch fix')
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_index_is_written_by_version_finder(self, test_repo):
+        assert complete(test_repo, "branch", "f") == []
+        finder = VersionFinder(path=test_repo)
+        assert complete(test_repo, "branch", "f") == ["feature/login", "fix"]
+        assert complete(test_repo, "branch", "feature/") == ["feature/login"]
+        assert complete(test_repo, "branch", "nothing") == []
+        assert complete(test_repo, "submodule", "") == []
+
+        finder.update_repository(finder.get_current_branch())
+        finder.get_version_table()
+        assert complete(os.path.join(test_repo, ".git"), "version", "1.") == ["1.0", "1.1"]
+
+    def test_run_completion(self, test_repo, capsys):
+        VersionFinder(path=test_repo)
+        assert run_completion(["--complete", "branch", "fi", "--path", test_repo]) == 0
+        assert capsys.readouterr().out == "fix\n"
+        assert run_completion(["--complete"]) == 2
+        assert run_completion(["--complete", "unknown", "x"]) == 0
+
+    def test_large_index(self, tmp_path):
+        os.makedirs(tmp_path / ".git")
+        write_index(tmp_path / ".git" / "version_finder", "branch", (f"team{i % 40}/feature-{i}" for i in range(40000)))
+        start_time = time.time()
+        matches = complete(str(tmp_path), "branch", "team7/feature-3967")
+        assert time.time() - start_time < 0.05
+        assert matches == ["team7/feature-3967"]
+        assert len(complete(str(tmp_path), "branch", "team7/")) == 1000
@@ -0,0 +1,133 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import pytest
+from version_finder.daemon import (
+    DaemonClient,
+    DaemonError,
+    FinderPool,
+    INTERNAL_ERROR,
+    INVALID_PARAMS,
+    METHOD_NOT_FOUND,
+    QUERY_ERROR,
+    VersionFinderDaemon,
+)
+
+
+def create_repo():
+    temp_dir = tempfile.mkdtemp()
+    os.chdir(temp_dir)
+    os.system('git init')
+    os.system('git config user.email "test@example.com"')
+    os.system('git config user.name "Test User"')
+    os.system('git commit -m "Initial commit" --allow-empty')
+    os.system('git commit -m "Fix bug" --allow-empty')
+    commit = os.popen('git rev-parse HEAD').read().strip()
+    os.system('git commit -m "Version: 1.0" --allow-empty')
+    branch = os.popen("git branch --show-current").read().strip()
+    return temp_dir, branch, commit
+
+
+class TestDaemon:
+    @pytest.fixture
+    def test_repo(self):
+        """Creates a repository with a commit released in version 1.0"""
+        temp_dir, branch, commit = create_repo()
+        yield temp_dir, branch, commit
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def daemon(self):
+        """Runs a daemon on a temporary socket"""
+        socket_dir = tempfile.mkdtemp()
+        daemon = VersionFinderDaemon(os.path.join(socket_dir, "daemon.sock"), FinderPool(max_repos=1))
+        thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+        thread.start()
+        client = DaemonClient(daemon.socket_path, timeout=30)
+        for _ in range(100):
+            if client.is_running():
+                break
+            threading.Event().wait(0.05)
+        yield daemon, client
+        daemon.shutdown()
+        thread.join(timeout=5)
+        shutil.rmtree(socket_dir, ignore_errors=True)
+
+    def test_find_version_warm(self, test_repo, daemon):
+        repo, branch, commit = test_repo
+        _, client = daemon
+        assert client.call("find_version", path=repo, branch=branch, commit=commit) == "1.0"
+        assert client.call("find_version", path=repo, branch=branch, commit=commit) == "1.0"
+        stats = client.call("stats")
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+        assert stats["repositories"][0]["queries"] == 2
+
+    def test_commits_are_serialized(self, test_repo, daemon):
+        repo, branch, _ = test_repo
+        _, client = daemon
+        commits = client.call("find_commits_by_text", path=repo, branch=branch, text="fix bug")
+        assert [commit["subject"] for commit in commits] == ["Fix bug"]
+
+    def test_errors(self, test_repo, daemon):
+        repo, branch, _ = test_repo
+        _, client = daemon
+        with pytest.raises(DaemonError) as exc_info:
+            client.call("no_such_method")
+        assert exc_info.value.code == METHOD_NOT_FOUND
+        with pytest.raises(DaemonError) as exc_info:
+            client.call("find_version", path=repo, branch=branch, commit="0" * 40)
+        assert exc_info.value.error_type == "InvalidCommitError"
+
+    def test_invalid_params(self, test_repo):
+        repo, branch, commit = test_repo
+        daemon = VersionFinderDaemon("unused.sock")
+        for params in ({"path": repo, "branch": branch},
+                       {"path": repo, "branch": branch, "commit": commit, "depth": 1},
+                       {"path": repo, "branch": branch, "commit": 1},
+                       {"path": repo, "branch": branch, "commit": commit, "version_prefixes": "Version:"}):
+            request = {"jsonrpc": "2.0", "id": 1, "method": "find_version", "params": params}
+            response = daemon.handle_request(json.dumps(request).encode())
+            assert response["error"]["code"] == INVALID_PARAMS
+        # Validation happens before any repository is loaded
+        assert len(daemon.pool) == 0
+
+    def test_internal_error(self, test_repo, monkeypatch):
+        repo, branch, commit = test_repo
+        daemon = VersionFinderDaemon("unused.sock")
+        request = {"jsonrpc": "2.0", "id": 1, "method": "find_version",
+                   "params": {"path": repo, "branch": branch, "commit": "0" * 40}}
+        response = daemon.handle_request(json.dumps(request).encode())
+        assert response["error"]["code"] == QUERY_ERROR
+
+        def broken_query(*args, **kwargs):
+            raise TypeError("unexpected internal failure")
+        monkeypatch.setattr(daemon.pool, "acquire", broken_query)
+        request["params"]["commit"] = commit
+        response = daemon.handle_request(json.dumps(request).encode())
+        assert response["error"]["code"] == INTERNAL_ERROR
+        assert response["error"]["data"]["type"] == "TypeError"
+
+    def test_lru_eviction(self, test_repo, daemon):
+        repo, branch, commit = test_repo
+        other_repo, other_branch, other_commit = create_repo()
+        try:
+            _, client = daemon
+            assert client.call("find_version", path=repo, branch=branch, commit=commit) == "1.0"
+            assert client.call("find_version", path=other_repo, branch=other_branch, commit=other_commit) == "1.0"
+            stats = client.call("stats")
+            assert stats["evictions"] == 1
+            assert [entry["path"] for entry in stats["repositories"]] == [os.path.realpath(other_repo)]
+        finally:
+            shutil.rmtree(other_repo, ignore_errors=True)
+
+    def test_invalid_request(self):
+        daemon = VersionFinderDaemon("unused.sock")
+        response = daemon.handle_request(b"not json")
+        assert response["error"]["code"] == -32700
+        assert daemon.handle_request(json.dumps({"jsonrpc": "2.0", "method": "ping"}).encode()) is None
+
+    def test_client_without_daemon(self, tmp_path):
+        assert not DaemonClient(str(tmp_path / "missing.sock")).is_running()
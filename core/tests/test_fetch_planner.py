@@ -0,0 +1,129 @@
+import os
+import shutil
+import tempfile
+import time
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from version_finder.fetch_planner import FetchPlanner
+from version_finder.git_executer import GitCommandExecutor
+from version_finder.version_finder import VersionFinder, GitConfig
+
+
+class TestFetchPlanner:
+
+    @pytest.fixture
+    def cloned_repo(self):
+        """Creates an origin repository and a clone of it"""
+        temp_dir = tempfile.mkdtemp()
+        origin = os.path.join(temp_dir, "origin")
+        os.makedirs(origin)
+        os.chdir(origin)
+        os.system('git init')
+        os.system('git config user.email "test@example.com"')
+        os.system('git config user.name "Test User"')
+        os.system('git commit -m "Initial commit" --allow-empty')
+        os.system('git branch dev')
+        default_branch = os.popen("git branch --show-current").read().strip()
+
+        clone = os.path.join(temp_dir, "clone")
+        os.system(f'git clone {origin} {clone}')
+
+        yield clone, origin, default_branch
+
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @staticmethod
+    def count_fetches(mock_execute):
+        return sum(1 for call in mock_execute.call_args_list if call.args[0][0] == "fetch")
+
+    def test_fetch_once_per_session(self, cloned_repo):
+        git = GitCommandExecutor(Path(cloned_repo[0]))
+        planner = FetchPlanner(git)
+        with patch.object(git, 'execute', wraps=git.execute) as mock_execute:
+            assert planner.fetch() is True
+            # Already covered by the fetch of all remotes
+            assert planner.fetch(branch="dev") is False
+            assert planner.fetch() is False
+            assert self.count_fetches(mock_execute) == 1
+
+    def test_fetch_branch_only(self, cloned_repo):
+        git = GitCommandExecutor(Path(cloned_repo[0]))
+        planner = FetchPlanner(git)
+        with patch.object(git, 'execute', wraps=git.execute) as mock_execute:
+            assert planner.fetch(branch="dev") is True
+            assert planner.fetch(branch="dev") is False
+            fetch_calls = [call.args[0] for call in mock_execute.call_args_list if call.args[0][0] == "fetch"]
+            assert fetch_calls == [["fetch", "origin", "dev"]]
+
+    def test_fetch_untracked_branch_fetches_remote(self, cloned_repo):
+        git = GitCommandExecutor(Path(cloned_repo[0]))
+        planner = FetchPlanner(git)
+        with patch.object(git, 'execute', wraps=git.execute) as mock_execute:
+            assert planner.fetch(branch="local-only") is True
+            fetch_calls = [call.args[0] for call in mock_execute.call_args_list if call.args[0][0] == "fetch"]
+            assert fetch_calls == [["fetch", "origin"]]
+
+    def test_fetch_skipped_when_fresh(self, cloned_repo):
+        git = GitCommandExecutor(Path(cloned_repo[0]))
+        FetchPlanner(git).fetch()
+        planner = FetchPlanner(git, ttl=600)
+        assert planner.is_fresh()
+        assert planner.get_data_age() < 600
+        assert planner.fetch(branch="dev") is False
+
+    def test_data_age_never_fetched(self, cloned_repo):
+        fetch_head = Path(cloned_repo[0]) / ".git" / "FETCH_HEAD"
+        if fetch_head.exists():
+            fetch_head.unlink()
+        planner = FetchPlanner(GitCommandExecutor(Path(cloned_repo[0])), ttl=600)
+        assert planner.get_data_age() is None
+        assert not planner.is_fresh()
+
+    def test_background_fetch(self, cloned_repo):
+        os.system(f'git -C {cloned_repo[1]} commit -m "New commit" --allow-empty')
+        git = GitCommandExecutor(Path(cloned_repo[0]))
+        planner = FetchPlanner(git, background=True)
+        assert planner.fetch() is True
+        planner.wait(timeout=30)
+        assert not planner.is_running()
+        remote_head = os.popen(f'git -C {cloned_repo[0]} rev-parse origin/{cloned_repo[2]}').read().strip()
+        assert remote_head == os.popen(f'git -C {cloned_repo[1]} rev-parse HEAD').read().strip()
+
+    def test_version_finder_fetches_once(self, cloned_repo):
+        with patch.object(GitCommandExecutor, 'execute', autospec=True,
+                          side_effect=GitCommandExecutor.execute) as mock_execute:
+            finder = VersionFinder(path=cloned_repo[0])
+            finder.update_repository("dev")
+            fetches = [call.args[1] for call in mock_execute.call_args_list if call.args[1][0] == "fetch"]
+            # Only the queried branch is fetched, nothing at init
+            assert fetches == [["fetch", "origin", "dev"]]
+        assert finder.get_data_age() is not None
+
+    def test_version_finder_finds_branch_created_after_clone(self, cloned_repo):
+        os.system(f'git -C {cloned_repo[1]} branch feature')
+        finder = VersionFinder(path=cloned_repo[0])
+        assert "feature" not in finder.list_branches()
+        finder.update_repository("feature")
+        assert "feature" in finder.list_branches()
+
+    def test_version_finder_local_only_branch(self, cloned_repo):
+        os.system(f'git -C {cloned_repo[0]} branch local-only')
+        finder = VersionFinder(path=cloned_repo[0])
+        finder.update_repository("local-only")
+        assert finder.is_task_ready
+
+    def test_version_finder_fetch_failure_is_not_fatal(self, cloned_repo):
+        shutil.rmtree(cloned_repo[1])
+        finder = VersionFinder(path=cloned_repo[0])
+        finder.update_repository("dev")
+        assert finder.is_task_ready
+
+    def test_version_finder_respects_ttl(self, cloned_repo):
+        VersionFinder(path=cloned_repo[0]).update_repository("dev")
+        time.sleep(0.01)
+        with patch.object(GitCommandExecutor, 'execute', autospec=True,
+                          side_effect=GitCommandExecutor.execute) as mock_execute:
+            finder = VersionFinder(path=cloned_repo[0], config=GitConfig(fetch_ttl=600))
+            finder.update_repository("dev")
+            assert not [call for call in mock_execute.call_args_list if call.args[1][0] == "fetch"]
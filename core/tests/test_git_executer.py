@@ -0,0 +1,208 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from version_finder.git_executer import (
+    GitCommandExecutor,
+    GitCommandCache,
+    GitCommandError,
+    GitConfig,
+    GitTimeoutError,
+    GIT_ENV_OVERRIDES,
+    get_git_binary,
+    is_pure_command,
+)
+
+SHA = "0123456789abcdef0123456789abcdef01234567"
+
+
+class TestIsPureCommand:
+
+    @pytest.mark.parametrize("command", [
+        ["cat-file", "-e", SHA],
+        ["show", "-s", "--format=%H%x1F%s", SHA],
+        ["ls-tree", "-r", "--full-tree", SHA, "sub_repo"],
+        ["diff", "--name-only", f"{SHA}^", SHA],
+        ["diff", "--name-only", f"{SHA}^..{SHA}", "--", "sub_repo"],
+        ["rev-parse", f"{SHA}~2"],
+        ["-C", "sub_repo", "cat-file", "-e", SHA],
+        ["--git-dir", "sub_repo/.git", "show", "-s", "--format=%s", SHA],
+    ])
+    def test_pure_commands(self, command):
+        assert is_pure_command(command)
+
+    @pytest.mark.parametrize("command", [
+        ["cat-file", "-e", "HEAD"],
+        ["show", "-s", "--format=%s", "main"],
+        ["show", "HEAD:file"],
+        ["diff", "--quiet", "HEAD"],
+        ["diff", SHA],
+        ["diff", "--name-only", SHA, "--", "file"],
+        ["diff", "--cached", SHA],
+        ["diff", "--no-index", SHA, SHA],
+        ["diff", f"{SHA}..", "--", "file"],
+        ["cat-file", "-e", SHA[:7]],
+        ["log", "--format=%H", SHA],
+        ["rev-parse", "--abbrev-ref", "HEAD"],
+        ["status"],
+        ["show"],
+    ])
+    def test_ref_dependent_commands(self, command):
+        assert not is_pure_command(command)
+
+
+class TestGitCommandCache:
+
+    def test_hit_and_miss_counters(self):
+        cache = GitCommandCache(max_bytes=100)
+        assert cache.get(("a",)) is None
+        cache.put(("a",), b"value")
+        assert cache.get(("a",)) == b"value"
+        assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1, "bytes": 5}
+
+    def test_lru_eviction_by_size(self):
+        cache = GitCommandCache(max_bytes=10)
+        cache.put(("a",), b"12345")
+        cache.put(("b",), b"12345")
+        # Touch "a" so that "b" is the least recently used entry
+        cache.get(("a",))
+        cache.put(("c",), b"123")
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",)) == b"12345"
+        assert cache.get(("c",)) == b"123"
+        assert cache.size <= 10
+
+    def test_value_larger_than_cap_is_not_cached(self):
+        cache = GitCommandCache(max_bytes=4)
+        cache.put(("a",), b"12345")
+        assert len(cache) == 0
+
+    def test_persistence(self, tmp_path):
+        path = tmp_path / "cache.json"
+        cache = GitCommandCache(max_bytes=100, path=path)
+        cache.put(("repo", "show", SHA), b"\xff\x00binary")
+        cache.save()
+
+        loaded = GitCommandCache(max_bytes=100, path=path)
+        assert loaded.get(("repo", "show", SHA)) == b"\xff\x00binary"
+
+    def test_persisted_impure_entries_are_dropped(self, tmp_path):
+        path = tmp_path / "cache.json"
+        cache = GitCommandCache(max_bytes=100, path=path)
+        cache.put(("repo", "diff", SHA), b"working tree diff")
+        cache.save()
+
+        loaded = GitCommandCache(max_bytes=100, path=path)
+        assert loaded.get(("repo", "diff", SHA)) is None
+
+    def test_corrupt_cache_file_is_ignored(self, tmp_path):
+        path = tmp_path / "cache.json"
+        path.write_text("not json")
+        cache = GitCommandCache(max_bytes=100, path=path)
+        assert len(cache) == 0
+
+
+class TestGitCommandExecutorCache:
+
+    @pytest.fixture
+    def test_repo(self):
+        temp_dir = tempfile.mkdtemp()
+        os.chdir(temp_dir)
+        os.system('git init')
+        os.system('git config user.email "test@example.com"')
+        os.system('git config user.name "Test User"')
+        os.system('git commit -m "Initial commit" --allow-empty')
+        yield Path(temp_dir)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_pure_command_is_served_from_cache(self, test_repo):
+        executor = GitCommandExecutor(test_repo)
+        sha = executor.execute(["rev-parse", "HEAD"]).decode("utf-8").strip()
+
+        with patch("subprocess.Popen", wraps=subprocess.Popen) as mock_run:
+            first = executor.execute(["show", "-s", "--format=%s", sha])
+            second = executor.execute(["show", "-s", "--format=%s", sha])
+            assert first == second == b"Initial commit\n"
+            assert mock_run.call_count == 1
+        assert executor.cache.hits == 1
+
+    def test_ref_command_is_not_cached(self, test_repo):
+        executor = GitCommandExecutor(test_repo)
+        executor.execute(["show", "-s", "--format=%s", "HEAD"])
+        os.system('git commit -m "Second commit" --allow-empty')
+        assert executor.execute(["show", "-s", "--format=%s", "HEAD"]) == b"Second commit\n"
+
+    def test_cache_disabled(self, test_repo):
+        executor = GitCommandExecutor(test_repo, GitConfig(cache_size=0))
+        assert executor.cache is None
+
+
+class TestGitCommandExecutorSpawn:
+
+    @pytest.fixture
+    def test_repo(self):
+        temp_dir = tempfile.mkdtemp()
+        os.chdir(temp_dir)
+        os.system('git init')
+        os.system('git config user.email "test@example.com"')
+        os.system('git config user.name "Test User"')
+        os.system('git commit -m "Initial commit" --allow-empty')
+        yield Path(temp_dir)
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_git_binary_resolved_once(self, test_repo):
+        GitCommandExecutor(test_repo)
+        misses = get_git_binary.cache_info().misses
+        GitCommandExecutor(test_repo)
+        GitCommandExecutor(test_repo)
+        assert get_git_binary.cache_info().misses == misses
+        assert os.path.isabs(get_git_binary()[0])
+
+    def test_spawn_environment(self, test_repo):
+        executor = GitCommandExecutor(test_repo)
+        for key, value in GIT_ENV_OVERRIDES.items():
+            assert executor._env[key] == value
+        output = executor.execute(["config", "--get", "core.fsmonitor"])
+        assert output.strip() == b"false"
+
+    def test_spawn_environment_is_allowlisted(self, test_repo, monkeypatch):
+        monkeypatch.setenv("VERSION_FINDER_TEST_SECRET", "secret")
+        monkeypatch.setenv("GIT_CONFIG_COUNT", "1")
+        monkeypatch.setenv("GIT_CONFIG_KEY_0", "vf.test")
+        monkeypatch.setenv("GIT_CONFIG_VALUE_0", "passed")
+        monkeypatch.setenv("LC_ALL", "C")
+        executor = GitCommandExecutor(test_repo)
+        assert "VERSION_FINDER_TEST_SECRET" not in executor._env
+        assert executor._env["LC_ALL"] == "C"
+        assert executor._env["PATH"] == os.environ["PATH"]
+        assert executor.execute(["config", "--get", "vf.test"]).strip() == b"passed"
+
+    def test_execute_from_another_directory(self, test_repo, tmp_path):
+        os.chdir(tmp_path)
+        executor = GitCommandExecutor(test_repo)
+        assert executor.execute(["log", "-1", "--format=%s"]) == b"Initial commit\n"
+
+    def test_stream(self, test_repo):
+        os.system('git commit -m "Second commit" --allow-empty')
+        executor = GitCommandExecutor(test_repo)
+        assert b"".join(executor.stream(["log", "--format=%s"], chunk_size=4)) == b"Second commit\nInitial commit\n"
+
+    def test_stream_failure(self, test_repo):
+        executor = GitCommandExecutor(test_repo)
+        with pytest.raises(GitCommandError, match="nonexistent"):
+            list(executor.stream(["log", "nonexistent"]))
+
+    def test_stream_closed_early(self, test_repo):
+        executor = GitCommandExecutor(test_repo)
+        stream = executor.stream(["log", "--format=%H"], chunk_size=1)
+        assert len(next(stream)) == 1
+        stream.close()
+
+    def test_timeout(self, test_repo):
+        executor = GitCommandExecutor(test_repo, GitConfig(timeout=1))
+        with patch.object(executor, "_base_command", ["sleep"]):
+            with pytest.raises(GitTimeoutError):
+                executor.execute(["5"])
@@ -0,0 +1,64 @@
+from version_finder.log_parser import iter_records, iter_stream_records, iter_tokens, log_format, parse_hashes
+
+
+class TestLogParser:
+    def test_log_format(self):
+        assert log_format("%H", "%s") == "%x1E%H%x1F%s"
+
+    def test_iter_records(self):
+        output = b"\x1eabc\x1fFirst subject\x1fbody\nwith lines\n\n\x1edef\x1fSecond\x1f\n"
+        records = list(iter_records(output))
+        assert len(records) == 2
+        assert [records[0][i] for i in range(3)] == ["abc", "First subject", "body\nwith lines\n"]
+        assert [records[1][i] for i in range(3)] == ["def", "Second", ""]
+
+    def test_iter_records_fields_share_output_memory(self):
+        output = b"\x1eabc\x1f123\n"
+        record = next(iter_records(output))
+        raw = record.raw(1)
+        assert isinstance(raw, memoryview)
+        assert raw.obj is output
+        assert int(raw) == 123
+
+    def test_iter_records_invalid_utf8(self):
+        record = next(iter_records(b"\x1eabc\x1fbad \xff byte\n"))
+        assert record[1] == "bad � byte"
+
+    def test_iter_records_empty_output(self):
+        assert list(iter_records(b"")) == []
+        assert list(iter_records(b"\n")) == []
+
+    def test_record_get_default(self):
+        record = next(iter_records(b"\x1eabc\n"))
+        assert len(record) == 1
+        assert record.get(0) == "abc"
+        assert record.get(3) == ""
+
+    def test_iter_stream_records(self):
+        output = b"\x1eabc\x1fFirst subject\x1fbody\nwith lines\n\n\x1edef\x1fSecond\x1f\n\x1eghi\x1fThird\x1f\n"
+        expected = [[record[i] for i in range(len(record))] for record in iter_records(output)]
+        for size in (1, 2, 7, len(output)):
+            chunks = [output[i:i + size] for i in range(0, len(output), size)]
+            assert [[record[i] for i in range(len(record))] for record in iter_stream_records(chunks)] == expected
+
+    def test_iter_stream_records_long_record_in_small_chunks(self):
+        # A record spanning many chunks is assembled once, not re-copied for every chunk
+        body = b"x" * 256 * 1024
+        output = b"\x1eabc\x1f" + body + b"\n\x1edef\x1fSecond\n"
+        records = list(iter_stream_records(output[i:i + 1] for i in range(len(output))))
+        assert [record[0] for record in records] == ["abc", "def"]
+        assert records[0].raw(1) == body
+
+    def test_iter_stream_records_yields_complete_records_early(self):
+        def chunks():
+            yield b"\x1eabc\x1fFirst\n\x1ede"
+            raise AssertionError("the first record was not yielded before reading on")
+
+        assert next(iter_stream_records(chunks()))[1] == "First"
+
+    def test_iter_tokens(self):
+        assert list(iter_tokens(b"a\x00bc\x00\x00d")) == ["a", "bc", "d"]
+
+    def test_parse_hashes(self):
+        assert parse_hashes(b"abc\ndef\n") == ["abc", "def"]
+        assert parse_hashes(b"") == []
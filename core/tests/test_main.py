@@ -0,0 +1,24 @@
+import importlib.util
+import subprocess
+import sys
+import pytest
+from version_finder import main as launcher
+from version_finder.main import ExternalInterfaceNotSupportedError, get_interface_main
+
+
+class TestLauncher:
+    def test_missing_interface(self, monkeypatch):
+        monkeypatch.setattr(importlib.util, "find_spec", lambda name, *args: None)
+        with pytest.raises(ExternalInterfaceNotSupportedError):
+            get_interface_main("gui")
+
+    @pytest.mark.skipif(importlib.util.find_spec("version_finder_cli") is None, reason="CLI not installed")
+    def test_cli_runs_in_process(self, monkeypatch, capsys):
+        def no_subprocess(*args, **kwargs):
+            raise AssertionError("The CLI must not be launched in a subprocess")
+        monkeypatch.setattr(subprocess, "run", no_subprocess)
+        monkeypatch.setattr(sys, "argv", ["version-finder", "--cli", "--version"])
+        # --version is handled by the launcher before the interfaces, so check the CLI entry point directly
+        args = launcher.parse_arguments()
+        assert launcher.call_cli_app(args) == 0
+        assert "cli-v" in capsys.readouterr().out
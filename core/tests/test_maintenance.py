@@ -0,0 +1,97 @@
+import argparse
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+from version_finder.common import DEFAULT_GIT_MAINTENANCE_TIMEOUT
+from version_finder.git_executer import GitCommandExecutor, GitConfig
+from version_finder.maintenance import (
+    RepositoryOptimizer,
+    STEP_CURRENT,
+    STEP_WRITTEN,
+    parse_git_version,
+    read_commit_graph,
+)
+from version_finder.main import prepare_repository
+from version_finder.version_finder import VersionFinder
+
+
+class TestRepositoryOptimizer:
+    @pytest.fixture
+    def test_repo(self):
+        """Creates a temporary repository with a few loose commits"""
+        temp_dir = tempfile.mkdtemp()
+        os.chdir(temp_dir)
+        os.system('git init')
+        os.system('git config user.email "test@example.com"')
+        os.system('git config user.name "Test User"')
+        with open(os.path.join(temp_dir, "file1"), "w") as f:
+            f.write("content")
+        os.system('git add file1')
+        os.system('git commit -m "Initial commit"')
+        os.system('git commit -m "Version: 1.0" --allow-empty')
+        os.system('git commit -m "Some commit" --allow-empty')
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_parse_git_version(self):
+        assert parse_git_version("git version 2.39.5") == (2, 39, 5)
+        assert parse_git_version("git version 2.45.1.windows.1") == (2, 45, 1)
+        assert parse_git_version("unknown") == ()
+
+    def test_status_of_unprepared_repository(self, test_repo):
+        optimizer = RepositoryOptimizer(GitCommandExecutor(test_repo))
+        commit_graph = optimizer.commit_graph_status()
+        assert commit_graph["commits"] == 0
+        assert commit_graph["reachable"] == 3
+        assert not commit_graph["current"]
+        midx = optimizer.multi_pack_index_status()
+        assert midx["loose_objects"] > 0
+        assert not midx["current"]
+
+    def test_optimize(self, test_repo):
+        optimizer = RepositoryOptimizer(GitCommandExecutor(test_repo))
+        steps = optimizer.optimize()
+        assert steps["commit-graph"] == STEP_WRITTEN
+        assert steps["multi-pack-index"].startswith(STEP_WRITTEN)
+
+        assert read_commit_graph(Path(test_repo) / ".git" / "objects" / "info" / "commit-graph") == (3, True)
+        assert optimizer.commit_graph_status()["current"]
+        assert optimizer.multi_pack_index_status()["loose_objects"] == 0
+
+        steps = optimizer.optimize()
+        assert steps["commit-graph"] == STEP_CURRENT
+        assert steps["multi-pack-index"] == STEP_CURRENT
+
+        # A new commit makes the commit-graph stale
+        os.system('git commit -m "New commit" --allow-empty')
+        assert not optimizer.commit_graph_status()["current"]
+
+    def test_write_steps_use_the_maintenance_timeout(self, test_repo):
+        optimizer = RepositoryOptimizer(GitCommandExecutor(test_repo, GitConfig(timeout=5)))
+        with patch.object(GitCommandExecutor, "_run", autospec=True, side_effect=GitCommandExecutor._run) as run:
+            optimizer.optimize()
+        timeouts = {call.args[1][0]: call.args[4] for call in run.call_args_list}
+        assert timeouts["commit-graph"] == DEFAULT_GIT_MAINTENANCE_TIMEOUT
+        assert timeouts["multi-pack-index"] == DEFAULT_GIT_MAINTENANCE_TIMEOUT
+        # Status queries keep the configured timeout
+        assert timeouts["rev-list"] is None
+
+    def test_optimize_repository_report(self, test_repo):
+        finder = VersionFinder(path=test_repo)
+        report = finder.optimize_repository()
+        assert report["steps"]["."]["commit-graph"] == STEP_WRITTEN
+        assert set(report["before"]) == set(report["after"])
+        assert "ancestry check" in report["before"]
+        assert report["speedup"] > 0
+
+    def test_prepare_leaves_the_checkout_alone(self, test_repo, capsys):
+        with open(os.path.join(test_repo, "file1"), "w") as f:
+            f.write("uncommitted")
+        assert prepare_repository(argparse.Namespace(path=test_repo, first_parent=False)) == 0
+        assert "Speedup" in capsys.readouterr().out
+        with open(os.path.join(test_repo, "file1")) as f:
+            assert f.read() == "uncommitted"
+        assert os.popen("git stash list").read() == ""
@@ -0,0 +1,79 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import pytest
+from version_finder import multi_repo
+from version_finder.multi_repo import MultiRepoVersionFinder, RepoResult
+
+
+def hanging_query(path, options, method, args):
+    """Stands in for a repository that never answers"""
+    time.sleep(60)
+    return RepoResult(path=path)
+
+
+def slow_query(path, options, method, args):
+    """Stands in for a repository that answers within the timeout, but not twice in a row"""
+    time.sleep(1.2)
+    return RepoResult(path=path)
+
+
+def create_repo(name):
+    temp_dir = tempfile.mkdtemp()
+    os.chdir(temp_dir)
+    os.system('git init')
+    os.system('git config user.email "test@example.com"')
+    os.system('git config user.name "Test User"')
+    os.system('git commit -m "Initial commit" --allow-empty')
+    os.system(f'git commit -m "{name} change" --allow-empty')
+    commit = os.popen('git rev-parse HEAD').read().strip()
+    os.system('git commit -m "Version: 1.0" --allow-empty')
+    return temp_dir, commit
+
+
+class TestMultiRepoVersionFinder:
+    @pytest.fixture
+    def repos(self):
+        """Creates three repositories with different commits"""
+        repos = [create_repo(name) for name in ["a", "b", "c"]]
+        yield repos
+        for path, _ in repos:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def test_find_version(self, repos, tmp_path):
+        paths = [path for path, _ in repos]
+        commit = repos[1][1]
+        scanner = MultiRepoVersionFinder(paths + [str(tmp_path / "missing")], max_workers=2,
+                                         cache_dir=str(tmp_path / "cache"))
+        results = {result.path: result for result in scanner.find_version(commit)}
+
+        assert len(results) == 4
+        assert results[paths[1]].found
+        assert results[paths[1]].result == "1.0"
+        assert not results[paths[0]].found
+        assert results[paths[0]].error is None
+        assert results[str(tmp_path / "missing")].error
+        assert os.listdir(tmp_path / "cache")
+
+    def test_find_commits_by_text(self, repos):
+        scanner = MultiRepoVersionFinder([path for path, _ in repos])
+        results = {result.path: result for result in scanner.find_commits_by_text("b change")}
+        assert [commit["sha"] for commit in results[repos[1][0]].result] == [repos[1][1]]
+        assert not results[repos[0][0]].found
+
+    def test_timed_out_worker_is_terminated(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(multi_repo, "_run_query", hanging_query)
+        start_time = time.time()
+        results = list(MultiRepoVersionFinder([str(tmp_path)], timeout=1).find_version("0" * 40))
+        assert [result.timed_out for result in results] == [True]
+        assert 1 <= results[0].elapsed < 1.5
+        assert time.time() - start_time < 30
+        assert multiprocessing.active_children() == []
+
+    def test_timeout_starts_when_a_worker_picks_the_repository(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(multi_repo, "_run_query", slow_query)
+        paths = [str(tmp_path / "first"), str(tmp_path / "second")]
+        results = list(MultiRepoVersionFinder(paths, max_workers=1, timeout=2).find_version("0" * 40))
+        assert [result.timed_out for result in results] == [False, False]
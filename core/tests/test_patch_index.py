@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+import pytest
+from version_finder.git_executer import GitCommandExecutor
+from version_finder.patch_index import PatchIdIndex
+
+
+def write_and_commit(repo, name, content, message):
+    with open(os.path.join(repo, name), "w") as f:
+        f.write(content)
+    os.system(f'git add {name}')
+    os.system(f'git commit -m "{message}"')
+    return os.popen('git rev-parse HEAD').read().strip()
+
+
+class TestPatchIdIndex:
+    @pytest.fixture
+    def test_repo(self):
+        """Creates a repository with a fix on main cherry-picked to a release branch"""
+        temp_dir = tempfile.mkdtemp()
+        os.chdir(temp_dir)
+        os.system('git init')
+        os.system('git config user.email "test@example.com"')
+        os.system('git config user.name "Test User"')
+        write_and_commit(temp_dir, "file1", "base\n", "Initial commit")
+        os.system('git branch release')
+        write_and_commit(temp_dir, "file2", "unrelated\n", "Unrelated change")
+        fix = write_and_commit(temp_dir, "file1", "base\nfix\n", "Fix bug")
+        os.system('git checkout release')
+        os.system(f'git cherry-pick {fix}')
+        backport = os.popen('git rev-parse HEAD').read().strip()
+        os.system('git commit -m "Version: 1.1" --allow-empty')
+        os.system('git checkout -')
+        yield temp_dir, fix, backport
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_equivalents(self, test_repo):
+        repo, fix, backport = test_repo
+        index = PatchIdIndex(GitCommandExecutor(repo))
+        release_tip = os.popen('git rev-parse release').read().strip()
+        commits = index.index_branches([release_tip])[release_tip]
+        assert backport in commits
+        assert index.equivalents(fix) == {fix, backport}
+        assert index.get_patch_id(fix) == index.get_patch_id(backport)
+
+    def test_commit_without_diff(self, test_repo):
+        repo, _, _ = test_repo
+        version_commit = os.popen('git rev-parse release').read().strip()
+        index = PatchIdIndex(GitCommandExecutor(repo))
+        assert index.get_patch_id(version_commit) is None
+        assert index.equivalents(version_commit) == {version_commit}
+
+    def test_persisted(self, test_repo, tmp_path):
+        repo, fix, backport = test_repo
+        path = tmp_path / "patch-ids.json"
+        index = PatchIdIndex(GitCommandExecutor(repo), path)
+        index.compute([fix, backport])
+        index.save()
+
+        loaded = PatchIdIndex(GitCommandExecutor(repo), path)
+        assert len(loaded) == 2
+        assert loaded.get_patch_id(fix) == index.get_patch_id(fix)
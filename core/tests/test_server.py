@@ -0,0 +1,99 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+from urllib.parse import urlencode
+import pytest
+from version_finder.server import VersionFinderServer
+
+
+async def http_request(port, target, body=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    method = "POST" if body is not None else "GET"
+    data = json.dumps(body).encode() if body is not None else b""
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(data)}\r\n\r\n".encode()
+                 + data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+class TestVersionFinderServer:
+    @pytest.fixture
+    def test_repo(self):
+        """Creates a repository with a commit released in version 1.0"""
+        temp_dir = tempfile.mkdtemp()
+        os.chdir(temp_dir)
+        os.system('git init')
+        os.system('git config user.email "test@example.com"')
+        os.system('git config user.name "Test User"')
+        os.system('git commit -m "Initial commit" --allow-empty')
+        os.system('git commit -m "Fix bug" --allow-empty')
+        commit = os.popen('git rev-parse HEAD').read().strip()
+        os.system('git commit -m "Version: 1.0" --allow-empty')
+        os.system('git commit -m "Version: 1.1" --allow-empty')
+        branch = os.popen("git branch --show-current").read().strip()
+        yield temp_dir, branch, commit
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def run_with_server(self, scenario):
+        async def run():
+            server = VersionFinderServer(port=0, workers_per_repo=2)
+            await server.start()
+            try:
+                return await scenario(server)
+            finally:
+                await server.close()
+        return asyncio.run(run())
+
+    def test_identical_requests_are_coalesced(self, test_repo):
+        repo, branch, commit = test_repo
+        target = "/find_version?" + urlencode({"path": repo, "branch": branch, "commit": commit})
+
+        async def scenario(server):
+            responses = await asyncio.gather(*[http_request(server.port, target) for _ in range(5)])
+            return responses, dict(server.stats)
+
+        responses, stats = self.run_with_server(scenario)
+        assert responses == [(200, {"result": "1.0"})] * 5
+        assert stats["queries"] == 1
+        assert stats["coalesced"] == 4
+
+    def test_endpoints(self, test_repo):
+        repo, branch, commit = test_repo
+
+        async def scenario(server):
+            between = await http_request(server.port, "/find_commits_between_versions", {
+                "path": repo, "branch": branch, "start_version": "1.0", "end_version": "1.1"})
+            by_text = await http_request(server.port, "/find_commits_by_text?" + urlencode(
+                {"path": repo, "branch": branch, "text": "fix"}))
+            health = await http_request(server.port, "/health")
+            return between, by_text, health
+
+        between, by_text, health = self.run_with_server(scenario)
+        assert between[0] == 200
+        assert [commit["subject"] for commit in between[1]["result"]] == ["Version: 1.1", "Version: 1.0"]
+        assert [commit["sha"] for commit in by_text[1]["result"]] == [commit]
+        assert health[0] == 200
+        assert health[1]["status"] == "ok"
+
+    def test_errors(self, test_repo):
+        repo, branch, _ = test_repo
+
+        async def scenario(server):
+            return await asyncio.gather(
+                http_request(server.port, "/find_version?" + urlencode({"path": repo})),
+                http_request(server.port, "/unknown"),
+                http_request(server.port, "/find_version?" + urlencode(
+                    {"path": repo, "branch": branch, "commit": "0" * 40})),
+            )
+
+        missing, unknown, invalid_commit = self.run_with_server(scenario)
+        assert missing[0] == 400
+        assert "branch" in missing[1]["error"]
+        assert unknown[0] == 404
+        assert invalid_commit[0] == 422
+        assert invalid_commit[1]["error"].startswith("InvalidCommitError")
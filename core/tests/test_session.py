@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+import pytest
+from version_finder.git_executer import GitCommandExecutor
+from version_finder.session import SessionSnapshot
+from version_finder.version_finder import VersionFinder
+
+
+class TestSessionSnapshot:
+    @pytest.fixture
+    def test_repo(self):
+        """Creates a repository with a feature branch"""
+        temp_dir = tempfile.mkdtemp()
+        os.chdir(temp_dir)
+        os.system('git init')
+        os.system('git config user.email "test@example.com"')
+        os.system('git config user.name "Test User"')
+        os.system('git commit -m "Initial commit" --allow-empty')
+        os.system('git branch feature')
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def commands(self, monkeypatch):
+        """Records the git commands run"""
+        executed = []
+        execute = GitCommandExecutor.execute
+
+        def recording_execute(self, command, *args, **kwargs):
+            executed.append(command[0])
+            return execute(self, command, *args, **kwargs)
+        monkeypatch.setattr(GitCommandExecutor, "execute", recording_execute)
+        return executed
+
+    def test_second_run_skips_discovery(self, test_repo, commands):
+        first = VersionFinder(path=test_repo)
+        assert {"status", "branch", "submodule"} <= set(commands)
+        assert os.path.exists(os.path.join(test_repo, ".git", "version_finder", "session.json"))
+
+        commands.clear()
+        second = VersionFinder(path=test_repo)
+        assert not {"status", "branch", "submodule"} & set(commands)
+        assert second.list_branches() == first.list_branches()
+        assert second.get_current_branch() == first.updated_branch
+
+    def test_new_branch_invalidates_snapshot(self, test_repo, commands):
+        VersionFinder(path=test_repo)
+        os.system('git branch another')
+        commands.clear()
+        finder = VersionFinder(path=test_repo)
+        assert "branch" in commands
+        assert "another" in finder.list_branches()
+
+    def test_fingerprint_tracks_head_and_gitmodules(self, test_repo):
+        snapshot = SessionSnapshot.for_repository(test_repo)
+        fingerprint = snapshot.fingerprint()
+        os.system('git checkout -q feature')
+        assert snapshot.fingerprint()["head"] != fingerprint["head"]
+        fingerprint = snapshot.fingerprint()
+        with open(os.path.join(test_repo, ".gitmodules"), "w") as gitmodules:
+            gitmodules.write("")
+        assert snapshot.fingerprint() != fingerprint
+
+    def test_refs_validated_once(self, test_repo, monkeypatch):
+        VersionFinder(path=test_repo)
+        snapshot = SessionSnapshot.for_repository(test_repo)
+        assert snapshot.load() is not None
+        sha = os.popen('git rev-parse feature').read().strip()
+        snapshot.record_ref("feature", sha)
+
+        walks = []
+        fingerprint = SessionSnapshot.fingerprint
+        monkeypatch.setattr(SessionSnapshot, "fingerprint", lambda self: walks.append(1) or fingerprint(self))
+        assert snapshot.get_ref("feature") == sha
+        assert snapshot.get_ref("feature") == sha
+        assert not walks
+
+        os.system('git commit -q -m "Moved" --allow-empty')
+        os.system('git branch -f feature HEAD')
+        assert not snapshot.validate_refs()
+        assert snapshot.get_ref("feature") is None
+        assert len(walks) == 1
+
+    def test_session_disabled(self, test_repo):
+        VersionFinder(path=test_repo, session=False)
+        assert not os.path.exists(os.path.join(test_repo, ".git", "version_finder", "session.json"))
+        assert SessionSnapshot.for_repository(os.path.join(test_repo, "missing")) is None
@@ -0,0 +1,30 @@
+import importlib.util
+import pytest
+
+# Generous bound of the cumulative import time, catching heavy modules creeping into startup
+IMPORT_TIME_BUDGET = 1.0  # seconds
+
+
+class TestStartup:
+    def test_version_flag_skips_task_modules(self, import_profile):
+        modules = import_profile(
+            "import sys; from version_finder.main import main; sys.argv = ['version-finder', '--version']; main()")
+        for heavy in ("version_finder.version_finder", "version_finder.daemon", "version_finder.server", "asyncio"):
+            assert heavy not in modules
+        assert modules["version_finder.main"] < IMPORT_TIME_BUDGET
+
+    def test_daemon_client_skips_version_finder(self, import_profile):
+        modules = import_profile("from version_finder.daemon import DaemonClient")
+        assert "version_finder.version_finder" not in modules
+        assert modules["version_finder.daemon"] < IMPORT_TIME_BUDGET
+
+    @pytest.mark.skipif(importlib.util.find_spec("version_finder_cli") is None, reason="CLI not installed")
+    def test_cli_dispatch_skips_pip(self, import_profile):
+        # -X importtime only times the import machinery behind import statements, so the module
+        # loaded by importlib.import_module itself is not listed, only the modules it imports
+        modules = import_profile(
+            "import sys; from version_finder.main import get_interface_main; get_interface_main('cli'); "
+            "assert 'version_finder_cli.cli' in sys.modules")
+        assert "pip" not in modules
+        assert "prompt_toolkit" not in modules
+        assert modules["version_finder.main"] < IMPORT_TIME_BUDGET
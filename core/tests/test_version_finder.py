@@ -15,8 +15,10 @@ from version_finder.version_finder import (
     VersionNotFoundError,
     InvalidFilepathError,
     Commit,
-    GitConfig
+    GitConfig,
+    SubmoduleUpdateOptions
 )
+from version_finder.git_executer import GitCommandExecutor
 from version_finder.logger import (
     get_logger,
 )
@@ -270,6 +272,55 @@ class TestVersionFinder:
         assert finder.get_version_from_commit(prev_version) == '2024_01'
         assert finder.get_version_from_commit(next_version) == '2024_02'
 
+    def test_resolve_many(self, test_repo: tuple[str, str]):
+        os.chdir(test_repo[0])
+        os.system('git commit -m "Second commit" --allow-empty')
+        head = os.popen('git rev-parse HEAD').read().strip()
+        parent = os.popen('git rev-parse HEAD~1').read().strip()
+        tree = os.popen('git rev-parse HEAD^{tree}').read().strip()
+
+        finder = VersionFinder(path=test_repo[0])
+        resolved = finder.resolve_many([head[:8], "HEAD~1", "nonexistent-commit", "", "HEAD 1", tree])
+        assert resolved == {
+            head[:8]: head,
+            "HEAD~1": parent,
+            "nonexistent-commit": None,
+            "": None,
+            "HEAD 1": None,
+            tree: None,
+        }
+
+    def test_resolve_commit(self, test_repo: tuple[str, str]):
+        finder = VersionFinder(path=test_repo[0])
+        head = os.popen('git rev-parse HEAD').read().strip()
+        commit = finder.resolve_commit("HEAD")
+        assert commit.sha == head
+        assert str(commit) == head
+        assert finder.resolve_commit(commit) is commit
+        with pytest.raises(InvalidCommitError, match="Commit nonexistent-commit does not exist"):
+            finder.resolve_commit("nonexistent-commit")
+
+    def test_find_version_validates_commit_once(self, test_repo: tuple[str, str], monkeypatch):
+        os.chdir(test_repo[0])
+        os.system('git commit -m "Some commit" --allow-empty')
+        commit_to_find = os.popen('git rev-parse HEAD').read().strip()
+        os.system('git commit -m "Version: 2024_01" --allow-empty')
+
+        finder = VersionFinder(path=test_repo[0])
+        finder.update_repository(test_repo[1])
+        commands = []
+        original_execute = finder._git.execute
+
+        def recording_execute(command, *args, **kwargs):
+            commands.append(command)
+            return original_execute(command, *args, **kwargs)
+
+        monkeypatch.setattr(finder._git, 'execute', recording_execute)
+        assert finder.find_version(commit_to_find[:10]) == '2024_01'
+        validations = [c for c in commands if c[0] in ("cat-file", "rev-parse", "merge-base")]
+        assert len(validations) == 1
+        assert validations[0][0] == "cat-file"
+
     def test_repository_not_clean(self, test_repo: tuple[str, str]):
         # Create uncommitted changes
         with open(f"{test_repo[0]}/file1", "w") as f:
@@ -483,6 +534,193 @@ class TestVersionFinder:
             message = os.popen(f'git log -1 --format=%s {commit}').read().strip()
             assert message in ['Version: 2024_01', 'Intermediate commit 1', 'Intermediate commit 2', 'Version: 2024_02']
 
+    def test_iter_commits_between_versions(self, test_repo: tuple[str, str]):
+        os.chdir(test_repo[0])
+        os.system('git commit -m "Version: 2024_01" --allow-empty')
+        os.system('git commit -m "Intermediate commit" --allow-empty')
+        os.system('git commit -m "Version: 2024_02" --allow-empty')
+
+        finder = VersionFinder(path=test_repo[0])
+        finder.update_repository(test_repo[1])
+        commits = finder.find_commits_between_versions('2024_01', '2024_02')
+        rows = list(finder.iter_commits_between_versions('2024_01', '2024_02'))
+        assert rows == [{"sha": commit.sha, "subject": commit.subject, "author": commit.author,
+                         "timestamp": commit.timestamp, "version": commit.version} for commit in commits]
+        assert [row["version"] for row in rows] == ["2024_02", None, "2024_01"]
+
+    def test_commits_between_versions_from_changelog(self, test_repo: tuple[str, str]):
+        os.chdir(test_repo[0])
+        os.system('git commit -m "Version: 2024_01" --allow-empty')
+        os.system('git commit -m "Intermediate commit" --allow-empty')
+        os.system('git commit -m "Version: 2024_02" --allow-empty')
+        os.system('git commit -m "Version: 2024_03" --allow-empty')
+
+        finder = VersionFinder(path=test_repo[0])
+        finder.update_repository(test_repo[1])
+        expected = [commit.sha for commit in finder.find_commits_between_versions('2024_01', '2024_02')]
+        finder.materialize_changelog()
+
+        with patch.object(finder._git, "execute", wraps=finder._git.execute) as execute, \
+                patch.object(finder._git, "stream", wraps=finder._git.stream) as stream:
+            commits = finder.find_commits_between_versions('2024_01', '2024_02')
+            rows = list(finder.iter_commits_between_versions('2024_01', '2024_02', fields=["sha"]))
+        assert [commit.sha for commit in commits] == expected
+        assert [row["sha"] for row in rows] == expected
+        # No range walk, only the details of the listed commits are read
+        commands = [call[0][0] for call in execute.call_args_list + stream.call_args_list]
+        assert not any(".." in arg for command in commands for arg in command)
+
+        # A new instance uses the persisted changelog
+        other_finder = VersionFinder(path=test_repo[0])
+        other_finder.update_repository(test_repo[1])
+        with patch.object(other_finder._git, "stream", wraps=other_finder._git.stream) as stream:
+            rows = list(other_finder.iter_commits_between_versions('2024_02', '2024_03', fields=["subject"]))
+        assert rows == [{"subject": "Version: 2024_03"}, {"subject": "Version: 2024_02"}]
+        assert "--stdin" in stream.call_args[0][0]
+
+    def test_iter_commits_fields_are_pushed_down(self, test_repo: tuple[str, str]):
+        os.chdir(test_repo[0])
+        os.system('git commit -m "Version: 2024_01" --allow-empty')
+        os.system('git commit -m "Version: 2024_02" --allow-empty')
+
+        finder = VersionFinder(path=test_repo[0])
+        finder.update_repository(test_repo[1])
+        with patch.object(finder._git, "stream", wraps=finder._git.stream) as stream:
+            rows = list(finder.iter_commits_between_versions('2024_01', '2024_02', fields=["subject", "sha"]))
+        assert [list(row) for row in rows] == [["subject", "sha"]] * 2
+        assert stream.call_args[0][0][-1] == "--format=%x1E%s%x1F%H"
+
+        with patch.object(finder._git, "stream", wraps=finder._git.stream) as stream:
+            rows = list(finder.iter_commits_by_text("2024_02", fields=["sha"]))
+        assert rows == [{"sha": os.popen('git rev-parse HEAD').read().strip()}]
+        # The filter reads subject and body on top of the selected fields
+        assert stream.call_args[0][0][-1] == "--format=%x1E%H%x1F%s%x1F%b"
+
+        with pytest.raises(ValueError):
+            list(finder.iter_commits_by_text("2024", fields=["sha", "tree"]))
+
+    def test_iter_commits_between_versions_invalid_version(self, test_repo: tuple[str, str]):
+        finder = VersionFinder(path=test_repo[0])
+        finder.update_repository(test_repo[1])
+        with pytest.raises(VersionNotFoundError):
+            list(finder.iter_commits_between_versions('nonexistent_version1', 'nonexistent_version2'))
+
+    def test_get_version_table(self, test_repo: tuple[str, str]):
+        os.chdir(test_repo[0])
+        os.system('git commit -m "Version: 1.10" --allow-empty')
+        os.system('git commit -m "Some commit" --allow-empty')
+        os.system('git commit -m "Version: 1.9" --allow-empty')
+        version_1_9 = os.popen('git rev-parse HEAD').read().strip()
+        os.system('git commit -m "Updated version 2.0" --allow-empty')
+
+        finder = VersionFinder(path=test_repo[0])
+        finder.update_repository(test_repo[1])
+        table = finder.get_version_table()
+        assert [entry.version for entry in table] == ["1.9", "1.10", "2.0"]
+        assert table.latest_at_most("1.95").version == "1.10"
+        assert table.get("1.9").sha == version_1_9
+        assert finder.get_version_table() is table
+
+        finder.update_repository(test_repo[1])
+        assert finder.get_version_table() is not table
+
+    def test_materialize_changelog(self, test_repo: tuple[str, str]):
+        os.chdir(test_repo[0])
+        os.system('git commit -m "Version: 2024_01" --allow-empty')
+        os.system('git commit -m "Intermediate commit 1" --allow-empty')
+        os.system('git commit -m "Intermediate commit 2" --allow-empty')
+        os.system('git commit -m "Version: 2024_02" --allow-empty')
+        os.system('git commit -m "Unreleased commit" --allow-empty')
+
+        finder = VersionFinder(path=test_repo[0])
+        finder.update_repository(test_repo[1])
+        changelog = finder.materialize_changelog()
+        commits = finder.get_commits_info(changelog.commits_between('2024_01', '2024_02'))
+        assert [commit.subject for commit in commits] == [
+            'Version: 2024_02', 'Intermediate commit 2', 'Intermediate commit 1']
+        assert [commit.subject for commit in finder.get_commits_info(changelog.unreleased)] == ['Unreleased commit']
+
+        # A new instance loads the persisted changelog
+        other_finder = VersionFinder(path=test_repo[0])
+        other_finder.update_repository(test_repo[1])
+        assert other_finder.materialize_changelog().to_dict() == changelog.to_dict()
+
+    def test_first_parent(self, test_repo: tuple[str, str]):
+        os.chdir(test_repo[0])
+        os.system('git checkout -b side')
+        os.system('git commit -m "Side change" --allow-empty')
+        side_commit = os.popen('git rev-parse HEAD').read().strip()
+        os.system(f'git checkout {test_repo[1]}')
+        os.system('git commit -m "Mainline change" --allow-empty')
+        os.system('git merge --no-ff -m "Merge side change" side')
+        merge_commit = os.popen('git rev-parse HEAD').read().strip()
+        os.system('git commit -m "Version: 1.0" --allow-empty')
+
+        finder = VersionFinder(path=test_repo[0])
+        finder.update_repository(test_repo[1])
+        assert side_commit in [c.sha for c in finder.find_commits_by_text("change")]
+
+        mainline_finder = VersionFinder(path=test_repo[0], first_parent=True)
+        mainline_finder.update_repository(test_repo[1])
+        commits = mainline_finder.find_commits_by_text("change")
+        assert [c.subject for c in commits] == ["Merge side change", "Mainline change"]
+        assert mainline_finder.find_version(merge_commit) == "1.0"
+        changelog = mainline_finder.materialize_changelog()
+        assert side_commit not in changelog.commits_for("1.0")
+        assert merge_commit in changelog.commits_for("1.0")
+        assert side_commit in finder.materialize_changelog().commits_for("1.0")
+
+    def test_find_versions_across_branches(self, test_repo: tuple[str, str]):
+        os.chdir(test_repo[0])
+        os.system('git commit -m "Fix bug" --allow-empty')
+        fix_commit = os.popen('git rev-parse HEAD').read().strip()
+        os.system('git checkout -b release/1')
+        os.system('git commit -m "Version: 1.0" --allow-empty')
+        os.system('git commit -m "Version: 1.1" --allow-empty')
+        os.system(f'git checkout -b release/2 {test_repo[1]}')
+        os.system('git commit -m "Unreleased change" --allow-empty')
+        os.system(f'git checkout -b release/0 {fix_commit}~1')
+        os.system('git commit -m "Version: 0.9" --allow-empty')
+        os.system(f'git checkout {test_repo[1]}')
+
+        os.system(f'git checkout -b release/3 {fix_commit}')
+        os.system('git commit -m "Version: 1.0.1" --allow-empty')
+        os.system(f'git checkout {test_repo[1]}')
+
+        finder = VersionFinder(path=test_repo[0])
+        with patch.object(finder._repo_git, "execute", wraps=finder._repo_git.execute) as execute:
+            assert finder.find_versions_across_branches(fix_commit, "release/*") == {
+                "release/1": "1.0",
+                "release/2": None,
+                "release/3": "1.0.1",
+            }
+        # The branches share a single walk instead of a walk per branch
+        walks = [call[0][0] for call in execute.call_args_list if "--ancestry-path" in call[0][0]]
+        assert len(walks) == 2
+        assert test_repo[1] in finder.find_versions_across_branches(fix_commit)
+        with pytest.raises(InvalidCommitError):
+            finder.find_versions_across_branches("nonexistent-commit")
+
+    def test_find_versions_containing_patch(self, test_repo: tuple[str, str]):
+        os.chdir(test_repo[0])
+        os.system('git checkout -b release/1')
+        os.system('git commit -m "Version: 1.0" --allow-empty')
+        os.system(f'git checkout {test_repo[1]}')
+        with open(os.path.join(test_repo[0], "file1"), "w") as f:
+            f.write("fix\n")
+        os.system('git commit -am "Fix bug"')
+        fix_commit = os.popen('git rev-parse HEAD').read().strip()
+        os.system('git commit -m "Version: 2.0" --allow-empty')
+        os.system('git checkout release/1')
+        os.system(f'git cherry-pick {fix_commit}')
+        os.system('git commit -m "Version: 1.1" --allow-empty')
+        os.system(f'git checkout {test_repo[1]}')
+
+        finder = VersionFinder(path=test_repo[0])
+        assert finder.find_versions_across_branches(fix_commit, "release/*") == {}
+        assert finder.find_versions_containing_patch(fix_commit, "release/*") == {"release/1": "1.1"}
+        assert finder.find_versions_containing_patch(fix_commit)[test_repo[1]] == "2.0"
+
     def test_get_commits_between_versions_with_submodule(self, repo_with_submodule: tuple[str, str]):
         # Setup submodule with initial commit
         os.chdir(os.path.join(repo_with_submodule[0], 'sub_repo'))
@@ -988,3 +1226,241 @@ class TestVersionFinderDirtyRepo:
         # Check that the destructor restored the repository state
         with pytest.raises(GitRepositoryNotClean):
             VersionFinder(path=dirty_repo[0])
+
+
+class TestVersionFinderWorktree:
+
+    @pytest.fixture
+    def test_repo(self):
+        """Creates a temporary test repository with a version commit on a dev branch"""
+        temp_dir = tempfile.mkdtemp()
+        os.chdir(temp_dir)
+
+        os.system('git init')
+        os.system('git config user.email "test@example.com"')
+        os.system('git config user.name "Test User"')
+        with open(os.path.join(temp_dir, "file1"), "w") as f:
+            pass
+        os.system('git add file1')
+        os.system('git commit -m "Initial commit"')
+
+        default_branch = os.popen("git branch --show-current").read().strip()
+
+        os.system('git checkout -b dev')
+        os.system('git commit -m "Dev commit" --allow-empty')
+        os.system('git commit -m "Version: 2024_01" --allow-empty')
+        os.system(f'git checkout {default_branch}')
+
+        yield temp_dir, default_branch
+
+        import shutil
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_update_repository_does_not_touch_user_tree(self, test_repo: tuple[str, str]):
+        # Dirty the user's tree, worktree mode must neither stash nor checkout
+        with open(os.path.join(test_repo[0], "file1"), "w") as f:
+            f.write("modified content")
+
+        finder = VersionFinder(path=test_repo[0], use_worktree=True)
+        finder.update_repository('dev')
+
+        assert os.popen(f'git -C {test_repo[0]} branch --show-current').read().strip() == test_repo[1]
+        assert finder.has_uncommitted_changes() is True
+        assert finder.has_saved_state() is False
+        assert finder.worktree_path is not None
+        assert finder.worktree_path.exists()
+
+        commit_sha = os.popen(f'git -C {test_repo[0]} rev-parse dev~1').read().strip()
+        assert finder.find_first_version_containing_commit(commit_sha) == '2024_01'
+
+    def test_warm_worktree_is_reused(self, test_repo: tuple[str, str]):
+        finder = VersionFinder(path=test_repo[0], use_worktree=True)
+        finder.update_repository('dev')
+        worktree_path = finder.worktree_path
+        marker = worktree_path / "untracked_marker"
+        marker.write_text("kept")
+
+        finder = VersionFinder(path=test_repo[0], use_worktree=True)
+        finder.update_repository('dev')
+        assert finder.worktree_path == worktree_path
+        # A warm worktree at the branch tip is not reset
+        assert marker.exists()
+
+    def test_finders_on_same_branch_own_their_worktrees(self, test_repo: tuple[str, str]):
+        mainline = VersionFinder(path=test_repo[0], use_worktree=True, first_parent=True)
+        mainline.update_repository('dev')
+        finder = VersionFinder(path=test_repo[0], use_worktree=True)
+        finder.update_repository('dev')
+        assert finder.worktree_path != mainline.worktree_path
+        assert finder.worktree_path.parent == mainline.worktree_path.parent
+
+        # Moving one finder's worktree leaves the other's checkout where it was
+        tip = mainline.get_commit_sha_from_relative_string('HEAD')
+        os.system(f'git -C {test_repo[0]} branch -f dev {test_repo[1]}')
+        finder.update_repository('dev')
+        assert mainline.get_commit_sha_from_relative_string('HEAD') == tip
+        assert finder.get_commit_sha_from_relative_string('HEAD') != tip
+
+        # The worktree of a released instance is reused by the next one
+        worktree_path = finder.worktree_path
+        del finder
+        finder = VersionFinder(path=test_repo[0], use_worktree=True)
+        finder.update_repository('dev')
+        assert finder.worktree_path == worktree_path
+
+    def test_worktree_follows_branch_updates(self, test_repo: tuple[str, str]):
+        finder = VersionFinder(path=test_repo[0], use_worktree=True)
+        finder.update_repository('dev')
+
+        os.system(f'git -C {test_repo[0]} branch -f dev {test_repo[1]}')
+        finder.update_repository('dev')
+        head = finder.get_commit_sha_from_relative_string('HEAD')
+        assert head == os.popen(f'git -C {test_repo[0]} rev-parse {test_repo[1]}').read().strip()
+
+    def test_custom_worktree_dir_with_sparse_paths(self, test_repo: tuple[str, str]):
+        os.chdir(test_repo[0])
+        os.makedirs("docs")
+        with open(os.path.join("docs", "readme"), "w") as f:
+            f.write("docs")
+        os.system('git add docs')
+        os.system('git commit -m "Add docs"')
+
+        cache_dir = tempfile.mkdtemp()
+        try:
+            finder = VersionFinder(path=test_repo[0], use_worktree=True, worktree_dir=cache_dir,
+                                   sparse_paths=["docs"])
+            finder.update_repository(test_repo[1])
+            assert finder.worktree_path.parent == Path(cache_dir).resolve()
+            assert (finder.worktree_path / "docs" / "readme").exists()
+        finally:
+            import shutil
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def repo_with_submodules(self, test_repo: tuple[str, str], monkeypatch):
+        """Adds two submodules cloned from sibling repositories"""
+        # Allow cloning submodules from local paths
+        monkeypatch.setenv("GIT_CONFIG_COUNT", "1")
+        monkeypatch.setenv("GIT_CONFIG_KEY_0", "protocol.file.allow")
+        monkeypatch.setenv("GIT_CONFIG_VALUE_0", "always")
+
+        sources_dir = tempfile.mkdtemp()
+        for name in ["sub_a", "sub_b"]:
+            sub_dir = os.path.join(sources_dir, name)
+            os.makedirs(sub_dir)
+            os.chdir(sub_dir)
+            os.system('git init')
+            os.system('git config user.email "test@example.com"')
+            os.system('git config user.name "Test User"')
+            os.system(f'git commit -m "{name} initial commit" --allow-empty')
+            os.chdir(test_repo[0])
+            os.system(f'git submodule add {sub_dir} {name}')
+        os.system('git commit -m "Add submodules"')
+
+        yield test_repo
+
+        import shutil
+        shutil.rmtree(sources_dir, ignore_errors=True)
+
+    def test_skip_submodule_update(self, repo_with_submodules: tuple[str, str]):
+        finder = VersionFinder(path=repo_with_submodules[0], use_worktree=True)
+        finder.update_repository(repo_with_submodules[1], submodule_options=SubmoduleUpdateOptions(skip=True))
+        assert finder.is_task_ready
+        assert not (finder.worktree_path / "sub_a" / ".git").exists()
+
+    def test_parallel_selected_submodule_update(self, repo_with_submodules: tuple[str, str]):
+        finder = VersionFinder(path=repo_with_submodules[0], use_worktree=True)
+        options = SubmoduleUpdateOptions(paths=["sub_b"], jobs=2, depth=1)
+        finder.update_repository(repo_with_submodules[1], submodule_options=options)
+        assert (finder.worktree_path / "sub_b" / ".git").exists()
+        assert not (finder.worktree_path / "sub_a" / ".git").exists()
+
+    def test_parallel_submodule_update_all(self, repo_with_submodules: tuple[str, str]):
+        finder = VersionFinder(path=repo_with_submodules[0], use_worktree=True)
+        finder.update_repository(repo_with_submodules[1], submodule_options=SubmoduleUpdateOptions(jobs=2))
+        assert (finder.worktree_path / "sub_a" / ".git").exists()
+        assert (finder.worktree_path / "sub_b" / ".git").exists()
+
+        # Git runs the parallel updates, one command updates all submodules
+        other_finder = VersionFinder(path=repo_with_submodules[0], use_worktree=True)
+        with patch.object(GitCommandExecutor, "execute", autospec=True,
+                          side_effect=GitCommandExecutor.execute) as execute:
+            other_finder.update_repository(repo_with_submodules[1],
+                                           submodule_options=SubmoduleUpdateOptions(jobs=2))
+        updates = [call[0][1] for call in execute.call_args_list if call[0][1][:2] == ["submodule", "update"]]
+        assert updates == [["submodule", "update", "--init", "--recursive", "--jobs", "2", "--", "sub_a", "sub_b"]]
+
+    def test_submodule_update_times_each_submodule(self, repo_with_submodules: tuple[str, str]):
+        finder = VersionFinder(path=repo_with_submodules[0], use_worktree=True)
+        with patch("version_finder.version_finder.logger") as mock_logger:
+            finder.update_repository(repo_with_submodules[1], submodule_options=SubmoduleUpdateOptions(jobs=2))
+        messages = [call[0][0] for call in mock_logger.info.call_args_list]
+        for path in ("sub_a", "sub_b"):
+            assert any(message.startswith(f"Updated submodule {path} in ") for message in messages)
+
+    def test_submodule_update_invalid_path(self, repo_with_submodules: tuple[str, str]):
+        finder = VersionFinder(path=repo_with_submodules[0], use_worktree=True)
+        with pytest.raises(InvalidSubmoduleError):
+            finder.update_repository(repo_with_submodules[1],
+                                     submodule_options=SubmoduleUpdateOptions(paths=["nonexistent"]))
+
+    def test_submodule_update_options_validation(self):
+        with pytest.raises(ValueError):
+            SubmoduleUpdateOptions(jobs=0)
+        with pytest.raises(ValueError):
+            SubmoduleUpdateOptions(depth=0)
+
+    def test_find_version_in_nested_submodule(self, test_repo: tuple[str, str], monkeypatch):
+        # Allow cloning submodules from local paths
+        monkeypatch.setenv("GIT_CONFIG_COUNT", "1")
+        monkeypatch.setenv("GIT_CONFIG_KEY_0", "protocol.file.allow")
+        monkeypatch.setenv("GIT_CONFIG_VALUE_0", "always")
+
+        # superproject -> platform -> vendor/lib
+        sources_dir = tempfile.mkdtemp()
+        lib_dir = os.path.join(sources_dir, "lib")
+        platform_dir = os.path.join(sources_dir, "platform")
+        for source in [lib_dir, platform_dir]:
+            os.makedirs(source)
+            os.chdir(source)
+            os.system('git init')
+            os.system('git config user.email "test@example.com"')
+            os.system('git config user.name "Test User"')
+        os.chdir(lib_dir)
+        os.system('git commit -m "Lib commit 1" --allow-empty')
+        lib_commit_1 = os.popen('git rev-parse HEAD').read().strip()
+        os.chdir(platform_dir)
+        os.system(f'git submodule add {lib_dir} vendor/lib')
+        os.system('git commit -m "Add lib"')
+
+        os.chdir(test_repo[0])
+        os.system(f'git submodule add {platform_dir} platform')
+        os.system('git submodule update --init --recursive')
+        os.system('git commit -m "Version: 2024_01"')
+
+        # Move the lib forward and propagate the pointer through both levels
+        os.chdir(lib_dir)
+        os.system('git commit -m "Lib commit 2" --allow-empty')
+        lib_commit_2 = os.popen('git rev-parse HEAD').read().strip()
+        os.chdir(os.path.join(platform_dir, "vendor", "lib"))
+        os.system(f'git fetch && git checkout {lib_commit_2}')
+        os.chdir(platform_dir)
+        os.system('git commit -am "Update lib"')
+        platform_commit = os.popen('git rev-parse HEAD').read().strip()
+        os.chdir(os.path.join(test_repo[0], "platform"))
+        os.system(f'git fetch && git checkout {platform_commit}')
+        os.system('git submodule update --init --recursive')
+        os.chdir(test_repo[0])
+        os.system('git commit -am "Update platform"')
+        os.system('git commit -m "Version: 2024_02" --allow-empty')
+
+        finder = VersionFinder(path=test_repo[0])
+        finder.update_repository(test_repo[1])
+        assert finder.is_valid_submodule("platform/vendor/lib")
+        assert finder.find_version(lib_commit_1, submodule="platform/vendor/lib") == "2024_01"
+        assert finder.find_version(lib_commit_2, submodule="platform/vendor/lib") == "2024_02"
+        with pytest.raises(InvalidSubmoduleError):
+            finder.is_valid_submodule("platform/vendor/missing")
+
+        import shutil
+        shutil.rmtree(sources_dir, ignore_errors=True)
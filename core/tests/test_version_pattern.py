@@ -0,0 +1,86 @@
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import pytest
+from version_finder.version_pattern import DEFAULT_VERSION_PATTERN, VersionPattern, escape_ere
+
+
+class TestVersionPattern:
+    @pytest.fixture
+    def test_repo(self):
+        """Creates a temporary repository with a commit per message"""
+        temp_dir = tempfile.mkdtemp()
+        os.chdir(temp_dir)
+        os.system('git init')
+        os.system('git config user.email "test@example.com"')
+        os.system('git config user.name "Test User"')
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_extract(self):
+        test_cases = [
+            ("Version: 2024_01", "2024_01"),
+            ("VERSION: XX_2024_01_15", "2024_01_15"),
+            ("Updated version 4.5-2", "4.5-2"),
+            ("2023.01.15", "2023.01.15"),
+            ("No version here", None),
+            # The prefixed version wins over an earlier bare number
+            ("Merge 1.2 into Version: 2.0", "2.0"),
+        ]
+        for message, expected in test_cases:
+            assert DEFAULT_VERSION_PATTERN.extract(message) == expected, message
+
+    def test_extract_require_prefix(self):
+        pattern = VersionPattern(require_prefix=True)
+        assert pattern.extract("2023.01.15") is None
+        assert pattern.extract("Version: 2023.01.15") == "2023.01.15"
+
+    def test_extract_many(self):
+        messages = ["Version: 1.0", "Fix bug", "Release 2.0"]
+        assert list(VersionPattern(["Release"]).extract_many(messages)) == ["1.0", None, "2.0"]
+
+    def test_custom_prefixes(self):
+        pattern = VersionPattern(["Release", "Rel"], number_prefix="")
+        assert pattern.extract("Release: 3.1") == "3.1"
+        assert re.search(pattern.git_pattern, "Rel 3.1")
+        assert not re.search(pattern.git_pattern, "Version: 3.1")
+
+    def test_empty_prefixes(self):
+        with pytest.raises(ValueError):
+            VersionPattern([])
+
+    def test_escape_ere(self):
+        assert escape_ere("1.2(3)") == r"1\.2\(3\)"
+        assert escape_ere("1_2-3") == "1_2-3"
+
+    def test_git_and_python_agree(self, test_repo):
+        messages = [
+            "Version: 2024_01",
+            "VERSION:XX_2024_02",
+            "Updated version 1.1.1",
+            "Release 2.0",
+            "2023.01.15",
+            "Version: 1x2",
+            "Fix version handling",
+        ]
+        for message in messages:
+            os.system(f'git commit --allow-empty -m "{message}"')
+
+        output = subprocess.check_output(
+            ["git", "log", "--extended-regexp", f"--grep={DEFAULT_VERSION_PATTERN.git_pattern}", "--format=%s"])
+        selected = output.decode().splitlines()
+        assert sorted(selected) == sorted(["Version: 2024_01", "VERSION:XX_2024_02", "Updated version 1.1.1"])
+        for message in messages:
+            has_prefixed_version = VersionPattern(require_prefix=True).extract(message) is not None
+            assert has_prefixed_version == (message in selected), message
+
+    def test_git_pattern_for_version(self, test_repo):
+        for message in ["Version: 1.2", "Version: 1x2", "Version: 1.2.3", "Version: 1.23", "Version: 1.2-rc"]:
+            os.system(f'git commit --allow-empty -m "{message}"')
+
+        output = subprocess.check_output(
+            ["git", "log", "--extended-regexp", f"--grep={DEFAULT_VERSION_PATTERN.git_pattern_for('1.2')}",
+             "--format=%s"])
+        assert sorted(output.decode().splitlines()) == ["Version: 1.2", "Version: 1.2-rc"]
@@ -0,0 +1,68 @@
+import pytest
+from version_finder.version_table import VersionEntry, VersionTable, parse_version_key
+
+
+class TestParseVersionKey:
+    def test_formats(self):
+        assert parse_version_key("XX_2023_01_15") == (2023, 1, 15)
+        assert parse_version_key("1.2.3") == (1, 2, 3)
+        assert parse_version_key("4.5-2") == (4, 5, 2)
+
+    def test_numeric_order(self):
+        assert parse_version_key("1.10") > parse_version_key("1.9")
+        assert parse_version_key("1.2") < parse_version_key("1.2.1")
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            parse_version_key("nonexistent_version")
+
+
+class TestVersionTable:
+    @pytest.fixture
+    def table(self):
+        return VersionTable([
+            VersionEntry("1.10", "sha110"),
+            VersionEntry("1.2", "sha12"),
+            VersionEntry("1.9", "sha19"),
+            VersionEntry("1.2", "sha12_old"),
+            VersionEntry("2.0", "sha20"),
+        ])
+
+    def test_sorted_and_deduplicated(self, table):
+        assert [entry.version for entry in table] == ["1.2", "1.9", "1.10", "2.0"]
+        assert table.get("1.2").sha == "sha12"
+        assert len(table) == 4
+
+    def test_get(self, table):
+        assert table.get("1.9").sha == "sha19"
+        # Versions are looked up by their exact spelling
+        assert table.get("1_9") is None
+        assert table.get("1.3") is None
+        assert "2.0" in table
+        assert "3.0" not in table
+
+    def test_spellings_sharing_a_key_are_kept_apart(self):
+        table = VersionTable([VersionEntry("1.2.3", "dotted"), VersionEntry("1-2-3", "dashed"),
+                              VersionEntry("1.2-3", "mixed")])
+        assert len(table) == 3
+        assert [table.get(version).sha for version in ("1.2.3", "1-2-3", "1.2-3")] == ["dotted", "dashed", "mixed"]
+        assert len(table.between("1.2.3", "1.2.3")) == 3
+
+    def test_between(self, table):
+        assert [e.version for e in table.between("1.2", "1.10")] == ["1.2", "1.9", "1.10"]
+        assert [e.version for e in table.between("1.2", "1.10", inclusive=False)] == ["1.9"]
+        assert [e.version for e in table.between("1.3", "1.95")] == ["1.9", "1.10"]
+        assert table.between("3.0", "4.0") == []
+
+    def test_latest_at_most(self, table):
+        assert table.latest_at_most("1.9").version == "1.9"
+        assert table.latest_at_most("1.99").version == "1.10"
+        assert table.latest_at_most("1.0") is None
+
+    def test_earliest_at_least(self, table):
+        assert table.earliest_at_least("1.3").version == "1.9"
+        assert table.earliest_at_least("2.1") is None
+
+    def test_latest(self, table):
+        assert table.latest().version == "2.0"
+        assert VersionTable().latest() is None
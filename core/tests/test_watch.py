@@ -0,0 +1,135 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import pytest
+from version_finder.session import SessionSnapshot
+from version_finder.version_finder import (
+    VersionFinder,
+    WATCH_EVENT_LANDED,
+    WATCH_EVENT_RELEASED,
+    WATCH_EVENT_RESET,
+    WATCH_EVENT_VERSION,
+)
+from version_finder.watcher import RefWatcher
+
+
+def git_later(repo, *commands, delay=0.3):
+    """Runs git commands in the repository after a delay, while the test waits for events"""
+    def run():
+        for command in commands:
+            subprocess.run(["git"] + command, cwd=repo, check=True, capture_output=True)
+    timer = threading.Timer(delay, run)
+    timer.start()
+    return timer
+
+
+class TestWatch:
+    @pytest.fixture
+    def test_repo(self):
+        """Creates a repository released in version 1.0"""
+        temp_dir = tempfile.mkdtemp()
+        os.chdir(temp_dir)
+        os.system('git init')
+        os.system('git config user.email "test@example.com"')
+        os.system('git config user.name "Test User"')
+        os.system('git commit -m "Initial commit" --allow-empty')
+        os.system('git commit -m "Version: 1.0" --allow-empty')
+        branch = os.popen("git branch --show-current").read().strip()
+        yield temp_dir, branch
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_new_commits_are_reported(self, test_repo):
+        repo, branch = test_repo
+        finder = VersionFinder(path=repo)
+        finder.update_repository(branch)
+        finder.get_version_table()
+        events = finder.watch(branch, poll_interval=0.05, timeout=30)
+
+        git_later(repo, ["commit", "-m", "Fix bug", "--allow-empty"])
+        landed = next(events)
+        assert landed.kind == WATCH_EVENT_LANDED
+        assert landed.subject == "Fix bug"
+
+        git_later(repo, ["commit", "-m", "Version: 1.1", "--allow-empty"])
+        released, version = next(events), next(events)
+        assert (released.kind, released.commit, released.version) == (WATCH_EVENT_RELEASED, landed.commit, "1.1")
+        assert (version.kind, version.version) == (WATCH_EVENT_VERSION, "1.1")
+        assert str(released).startswith(f"commit {landed.commit[:12]} landed in version 1.1")
+        events.close()
+
+        # The indices were extended in place
+        assert "1.1" in finder.get_version_table()
+        assert finder.materialize_changelog().version_of(landed.commit) == "1.1"
+        assert finder.find_version(landed.commit) == "1.1"
+
+    def test_rewritten_branch(self, test_repo):
+        repo, branch = test_repo
+        finder = VersionFinder(path=repo, use_worktree=True)
+        finder.update_repository(branch)
+        events = finder.watch(branch, poll_interval=0.05, timeout=30)
+        git_later(repo, ["reset", "-q", "--hard", "HEAD~1"], ["commit", "-m", "Version: 2.0", "--allow-empty"])
+        event = next(events)
+        events.close()
+        assert event.kind == WATCH_EVENT_RESET
+        assert "2.0" in finder.get_version_table()
+
+    def test_watch_timeout(self, test_repo):
+        repo, branch = test_repo
+        finder = VersionFinder(path=repo)
+        finder.update_repository(branch)
+        assert list(finder.watch(branch, poll_interval=0.05, timeout=0.2)) == []
+
+    def test_polling_fallback(self, test_repo):
+        repo, _ = test_repo
+        with RefWatcher(SessionSnapshot.for_repository(repo), poll_interval=0.05, use_inotify=False) as watcher:
+            assert not watcher.uses_inotify
+            assert not watcher.wait(0.1)
+            git_later(repo, ["branch", "feature/new"], delay=0.1)
+            assert watcher.wait(10)
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+    def test_inotify_follows_new_ref_directories(self, test_repo):
+        repo, _ = test_repo
+        with RefWatcher(SessionSnapshot.for_repository(repo)) as watcher:
+            assert watcher.uses_inotify
+            git_later(repo, ["branch", "team/feature"], delay=0.1)
+            assert watcher.wait(10)
+            git_later(repo, ["branch", "team/other"], delay=0.1)
+            assert watcher.wait(10)
+            assert not watcher.wait(0.1)
+
+    def test_checkout_is_not_moved(self, test_repo):
+        repo, branch = test_repo
+        finder = VersionFinder(path=repo)
+        finder.update_repository(branch)
+        events = finder.watch(branch, poll_interval=0.05, timeout=30)
+        git_later(repo, ["commit", "-m", "Version: 1.1", "--allow-empty"])
+        assert next(events).version == "1.1"
+        events.close()
+        assert finder.use_worktree
+        # HEAD-based queries run in the worktree, which moved to the new tip
+        head = os.popen("git rev-parse HEAD").read().strip()
+        assert finder.materialize_changelog().head == head
+        assert finder.get_commit_surrounding_versions(head)[1] == head
+
+    def test_fetch_interval_follows_remote_tracking_branch(self, test_repo):
+        upstream, branch = test_repo
+        clone = tempfile.mkdtemp()
+        try:
+            subprocess.run(["git", "clone", "-q", upstream, clone], check=True)
+            finder = VersionFinder(path=clone, use_worktree=True)
+            finder.update_repository(branch)
+            events = finder.watch(branch, poll_interval=0.05, fetch_interval=0.2, timeout=30)
+
+            # The commit only reaches the clone through the periodic fetch, which leaves the local branch alone
+            git_later(upstream, ["commit", "-m", "Version: 1.1", "--allow-empty"])
+            event = next(events)
+            events.close()
+            assert (event.kind, event.version) == (WATCH_EVENT_VERSION, "1.1")
+            assert event.commit == os.popen(f"git -C {upstream} rev-parse HEAD").read().strip()
+            assert "1.1" in finder.get_version_table()
+        finally:
+            shutil.rmtree(clone, ignore_errors=True)
@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+import pytest
+from version_finder.writers import get_writer, write_records
+
+FIELDS = ["sha", "subject", "timestamp", "version"]
+ROWS = [
+    {"sha": "abc", "subject": "Version: 1.1", "timestamp": 1700000100, "version": "1.1"},
+    {"sha": "def", "subject": 'Quote " and, comma\ttab', "timestamp": 1700000000, "version": None},
+]
+
+
+class TestWriters:
+    def test_json(self):
+        output = io.StringIO()
+        assert write_records(iter(ROWS), "json", FIELDS, output) == 2
+        assert json.loads(output.getvalue()) == ROWS
+
+    def test_jsonl(self):
+        output = io.StringIO()
+        write_records(iter(ROWS), "jsonl", FIELDS, output)
+        assert [json.loads(line) for line in output.getvalue().splitlines()] == ROWS
+
+    @pytest.mark.parametrize("output_format, dialect", [("csv", "excel"), ("tsv", "excel-tab")])
+    def test_delimited(self, output_format, dialect):
+        output = io.StringIO()
+        write_records(iter(ROWS), output_format, FIELDS, output)
+        rows = list(csv.DictReader(io.StringIO(output.getvalue()), dialect=dialect))
+        assert rows[0] == {"sha": "abc", "subject": "Version: 1.1", "timestamp": "1700000100", "version": "1.1"}
+        assert rows[1]["subject"] == ROWS[1]["subject"]
+        assert rows[1]["version"] == ""
+
+    def test_field_selection_and_order(self):
+        output = io.StringIO()
+        write_records(iter(ROWS), "jsonl", ["version", "sha"], output)
+        assert output.getvalue().splitlines()[0] == '{"version": "1.1", "sha": "abc"}'
+
+    @pytest.mark.parametrize("output_format, expected", [
+        ("json", "[]\n"), ("jsonl", ""), ("csv", "sha,subject,timestamp,version\n"),
+    ])
+    def test_empty(self, output_format, expected):
+        output = io.StringIO()
+        assert write_records(iter([]), output_format, FIELDS, output) == 0
+        assert output.getvalue() == expected
+
+    def test_rows_are_written_as_they_arrive(self):
+        output = io.StringIO()
+
+        def rows():
+            yield ROWS[0]
+            assert output.getvalue() == '[\n{"sha": "abc", "subject": "Version: 1.1", ' \
+                                        '"timestamp": 1700000100, "version": "1.1"}'
+            raise RuntimeError("query failed")
+
+        with pytest.raises(RuntimeError):
+            write_records(rows(), "json", FIELDS, output)
+
+    def test_nothing_is_written_before_the_first_row(self):
+        output = io.StringIO()
+
+        def rows():
+            raise RuntimeError("query failed")
+            yield
+
+        with pytest.raises(RuntimeError):
+            write_records(rows(), "csv", FIELDS, output)
+        assert output.getvalue() == ""
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            get_writer("xml", FIELDS)